@@ -1,2 +1,4 @@
+# lib first: it binds the builders behind the Node operators on import
+from . import lib
 from .nodes import *
 from .customNodes import *
@@ -0,0 +1,66 @@
+import argparse
+import os
+import sys
+import time
+
+from .build import BuildCache, buildScripts
+
+
+def build(args):
+    cache = BuildCache(args.cache) if args.cache else None
+    start = time.perf_counter()
+    failures = 0
+    totalNodes = 0
+    for result in buildScripts(args.scripts, args.jobs, cache, args.dependency):
+        if result.error is not None:
+            failures += 1
+            print(f"{result.seconds:8.3f}s  FAILED  {result.scriptPath}")
+            print(result.error, file=sys.stderr)
+            continue
+        totalNodes += result.nodes
+        status = "cached" if result.cached else "built"
+        print(
+            f"{result.seconds:8.3f}s  {status:6}  {result.nodes:7} nodes "
+            f"{result.connections:7} connections  {result.scriptPath}"
+        )
+
+    print(
+        f"{len(args.scripts)} scripts, {totalNodes} nodes, {failures} failed "
+        f"in {time.perf_counter() - start:.3f}s"
+    )
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m AIGameLibrary")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    buildParser = commands.add_parser(
+        "build", help="run bot scripts in parallel and save their bots"
+    )
+    buildParser.add_argument("scripts", nargs="+", metavar="script")
+    buildParser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=os.cpu_count(),
+        help="worker processes (default: one per CPU)",
+    )
+    buildParser.add_argument(
+        "--cache", metavar="DIRECTORY", help="restore unchanged scripts from here"
+    )
+    buildParser.add_argument(
+        "--dependency",
+        action="append",
+        default=[],
+        metavar="FILE",
+        help="a file every script reads; changing it rebuilds them with --cache",
+    )
+    buildParser.set_defaults(run=build)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
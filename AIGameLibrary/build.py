@@ -0,0 +1,318 @@
+import functools
+import json
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from hashlib import blake2b
+
+from .graph import Graph
+from .lib import saveLog
+from .profiling import TRACE_VARIABLE
+
+# manifest fields of each file a SaveData call writes: its path and the
+# name of its stored object
+OUTPUT_FILES = (("filePath", "object"), ("traceFilePath", "traceObject"))
+
+
+@functools.cache
+def libraryVersion():
+    """Hash of the library's own source files, so any change to it is a miss."""
+    digest = blake2b(digest_size=16)
+    package = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(package)):
+        if name.endswith(".py"):
+            digest.update(name.encode())
+            with open(os.path.join(package, name), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def fileDigest(filePath):
+    digest = blake2b(digest_size=16)
+    with open(filePath, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def writeAtomically(filePath, write):
+    """Write through a temporary file, so readers never see a partial file."""
+    directory = os.path.dirname(filePath)
+    fd, temporaryPath = tempfile.mkstemp(dir=directory, prefix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(temporaryPath, filePath)
+    except BaseException:
+        os.unlink(temporaryPath)
+        raise
+
+
+class BuildCache:
+    """
+    On-disk cache of saved bots. Every file a script saves, and the trace
+    next to it when tracing, is stored once under the hash of its content;
+    a manifest per script key lists the files the script saved, with their
+    paths and SaveData options.
+
+    The key covers the script source, any extra `dependencies` (modules or
+    data files the script reads) and the library version, so editing any of
+    them rebuilds. It also covers the script's path and the working
+    directory, since relative output paths are resolved against them, and
+    whether AIGAME_TRACE is set. Once the stored files exceed `maxBytes`,
+    the least recently used ones are evicted, along with the manifests that
+    list them. With `link=True`, hits are hard linked instead of copied;
+    SaveData unlinks such a file before writing it again, so the stored
+    copy is never changed.
+    """
+
+    def __init__(self, directory=".aigamecache", maxBytes=256 * 2**20, link=False):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.link = link
+        self.objects = os.path.join(directory, "objects")
+        self.manifests = os.path.join(directory, "manifests")
+        os.makedirs(self.objects, exist_ok=True)
+        os.makedirs(self.manifests, exist_ok=True)
+
+    def __repr__(self):
+        return f"BuildCache({self.directory!r}, maxBytes={self.maxBytes})"
+
+    def scriptKey(self, scriptPath, dependencies=()):
+        digest = blake2b(libraryVersion().encode(), digest_size=16)
+        # the manifest holds absolute output paths, resolved from where and
+        # by which script the bot was built
+        for path in (os.getcwd(), os.path.abspath(scriptPath)):
+            digest.update(path.encode())
+            digest.update(b"\0")
+        digest.update(b"trace" if os.environ.get(TRACE_VARIABLE) else b"")
+        for path in (scriptPath, *dependencies):
+            digest.update(fileDigest(path).encode())
+        return digest.hexdigest()
+
+    def restore(self, key):
+        """
+        Put the files saved by the script back in place. Returns their
+        SaveData records, or None on a miss.
+        """
+        manifestPath = os.path.join(self.manifests, f"{key}.json")
+        try:
+            with open(manifestPath) as f:
+                outputs = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        files = [
+            (os.path.join(self.objects, output[objectField]), output[pathField])
+            for output in outputs
+            for pathField, objectField in OUTPUT_FILES
+            if output.get(objectField)
+        ]
+        if not all(os.path.exists(objectPath) for objectPath, _ in files):
+            # some outputs were evicted
+            os.unlink(manifestPath)
+            return None
+
+        for objectPath, filePath in files:
+            self.place(objectPath, filePath)
+            os.utime(objectPath)
+        return outputs
+
+    def place(self, objectPath, filePath):
+        os.makedirs(os.path.dirname(filePath), exist_ok=True)
+        if self.link:
+            try:
+                if os.path.exists(filePath):
+                    os.unlink(filePath)
+                os.link(objectPath, filePath)
+                return
+            except OSError:
+                # e.g. a different file system
+                pass
+        shutil.copyfile(objectPath, filePath)
+
+    def store(self, key, outputs):
+        """Store the files recorded in `outputs` and the manifest listing them."""
+        stored = []
+        for output in outputs:
+            output = dict(output)
+            for pathField, objectField in OUTPUT_FILES:
+                if output.get(pathField):
+                    output[objectField] = self.storeFile(output[pathField])
+            stored.append(output)
+
+        manifest = json.dumps(stored).encode()
+        writeAtomically(
+            os.path.join(self.manifests, f"{key}.json"), lambda f: f.write(manifest)
+        )
+        self.evict()
+
+    def storeFile(self, filePath):
+        name = fileDigest(filePath)
+        objectPath = os.path.join(self.objects, name)
+        if not os.path.exists(objectPath):
+            with open(filePath, "rb") as source:
+                writeAtomically(objectPath, lambda f: shutil.copyfileobj(source, f))
+        return name
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.objects):
+            if entry.is_file() and not entry.name.startswith(".tmp"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = set()
+        for _, size, path in sorted(entries):
+            if total <= self.maxBytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                # evicted by a build running in parallel
+                pass
+            evicted.add(os.path.basename(path))
+            total -= size
+
+        if evicted:
+            self.evictManifests(evicted)
+
+    def evictManifests(self, evicted):
+        """Remove the manifests listing any of the `evicted` objects."""
+        for entry in os.scandir(self.manifests):
+            if entry.name.startswith(".tmp"):
+                continue
+            try:
+                with open(entry.path) as f:
+                    outputs = json.load(f)
+            except (FileNotFoundError, ValueError):
+                continue
+            if any(
+                output.get(objectField) in evicted
+                for output in outputs
+                for _, objectField in OUTPUT_FILES
+            ):
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def clear(self):
+        shutil.rmtree(self.directory)
+        os.makedirs(self.objects)
+        os.makedirs(self.manifests)
+
+
+class BuildResult:
+    def __init__(self, scriptPath, outputs, cached, seconds, error=None):
+        self.scriptPath = scriptPath
+        # one dict per SaveData call: filePath, options, nodes, connections
+        self.outputs = outputs
+        self.cached = cached
+        self.seconds = seconds
+        # the formatted traceback when the script failed
+        self.error = error
+
+    @property
+    def nodes(self):
+        return sum(output["nodes"] for output in self.outputs)
+
+    @property
+    def connections(self):
+        return sum(output["connections"] for output in self.outputs)
+
+    def __repr__(self):
+        return (
+            f"BuildResult({self.scriptPath!r}, outputs={len(self.outputs)}, "
+            f"cached={self.cached}, seconds={self.seconds:.3f}, "
+            f"failed={self.error is not None})"
+        )
+
+
+def forgetModules(directory, keep):
+    """
+    Unload the modules imported from `directory` since `keep` was taken, so
+    the next script a worker runs imports its own sibling modules.
+    """
+    for name in set(sys.modules) - keep:
+        filePath = getattr(sys.modules[name], "__file__", None)
+        if filePath and os.path.dirname(os.path.abspath(filePath)) == directory:
+            del sys.modules[name]
+
+
+def buildScript(scriptPath, cache: BuildCache = None, dependencies=()) -> BuildResult:
+    """
+    Run a bot script in its own graph, as `python scriptPath` would, and
+    record the files it saves. With a cache, an unchanged script's files
+    are restored from it instead of running the script again.
+    """
+    start = time.perf_counter()
+    key = cache.scriptKey(scriptPath, dependencies) if cache is not None else None
+    if key is not None:
+        outputs = cache.restore(key)
+        if outputs is not None:
+            return BuildResult(scriptPath, outputs, True, time.perf_counter() - start)
+
+    outputs = []
+    token = saveLog.set(outputs)
+    # like `python scriptPath`, let the script import modules next to it
+    directory = os.path.dirname(os.path.abspath(scriptPath))
+    path = sys.path[:]
+    modules = set(sys.modules)
+    sys.path.insert(0, directory)
+    try:
+        with Graph():
+            runpy.run_path(scriptPath, run_name="__main__")
+    except SystemExit as error:
+        if error.code not in (None, 0):
+            raise
+    finally:
+        sys.path[:] = path
+        forgetModules(directory, modules)
+        saveLog.reset(token)
+
+    if key is not None:
+        cache.store(key, outputs)
+    return BuildResult(scriptPath, outputs, False, time.perf_counter() - start)
+
+
+def buildOrReport(scriptPath, cache=None, dependencies=()) -> BuildResult:
+    """buildScript, but a failing script gives a result holding its traceback."""
+    start = time.perf_counter()
+    try:
+        return buildScript(scriptPath, cache, dependencies)
+    except (Exception, SystemExit):
+        return BuildResult(
+            scriptPath, [], False, time.perf_counter() - start, traceback.format_exc()
+        )
+
+
+def buildScripts(scriptPaths, jobs=None, cache: BuildCache = None, dependencies=()):
+    """
+    Build many scripts in a pool of `jobs` worker processes, yielding a
+    BuildResult per script as each finishes. Workers import the library
+    once and then run script after script, each in its own graph.
+    """
+    scriptPaths = list(scriptPaths)
+    jobs = min(jobs or os.cpu_count() or 1, len(scriptPaths))
+    if jobs <= 1:
+        for scriptPath in scriptPaths:
+            yield buildOrReport(scriptPath, cache, dependencies)
+        return
+
+    with ProcessPoolExecutor(jobs) as pool:
+        futures = [
+            pool.submit(buildOrReport, scriptPath, cache, dependencies)
+            for scriptPath in scriptPaths
+        ]
+        for future in as_completed(futures):
+            yield future.result()
@@ -1,5 +1,12 @@
+import math
+
+from .lib import isNumber
 from .nodes import *
 
+# larger exponents use e^(n*ln(x)): their multiplication chains would cost
+# more than its Ln, multiply and Exp (up to 64, at most 10 multiplications)
+MAX_INTEGER_EXPONENT = 64
+
 
 def QuadraticFormula(a: Node, b: Node, c: Node):
     """
@@ -18,6 +25,75 @@ def QuadraticFormula(a: Node, b: Node, c: Node):
 
 def Power(node0: Node, node1: Node):
     """
-    custom x^y node using x^y = e^(y*ln(x))
+    custom x^y node. Constant exponents are lowered to the cheapest exact
+    form: multiplications for integers, one extra division for negative
+    integers and Sqrt for halves, up to MAX_INTEGER_EXPONENT. Anything else
+    uses x^y = e^(y*ln(x)), which is only defined for positive x.
     """
+    exponent = constantValue(node1)
+    if exponent is not None:
+        if isNumber(node0):
+            try:
+                return Float(math.pow(node0, exponent))
+            except (ValueError, OverflowError):
+                pass
+        elif abs(exponent) > MAX_INTEGER_EXPONENT:
+            pass
+        elif exponent.is_integer():
+            return IntegerPower(node0, int(exponent))
+        elif (2 * exponent).is_integer():
+            # x^(n + 0.5) = x^n * sqrt(x)
+            result = Sqrt(node0)
+            whole = int(abs(exponent))
+            if whole:
+                result = IntegerPower(node0, whole) * result
+            return 1 / result if exponent < 0 else result
+
+    return exponential(node0, node1)
+
+
+def exponential(node0, node1):
+    """x^y = e^(y*ln(x)), folding ln(x) for constant x."""
+    if isNumber(node0) and node0 > 0:
+        if node0 == 10:
+            return Pow10(node1)
+        if node0 == math.e:
+            return Exp(node1)
+        return Exp(node1 * math.log(node0))
+
     return Exp(node1 * Ln(node0))
+
+
+def IntegerPower(node: Node, exponent: int):
+    """
+    x^n by repeated squaring: about log2(n) multiplications, and a single
+    division for negative n. Beyond MAX_INTEGER_EXPONENT, x^n = e^(n*ln(x)).
+    """
+    if exponent == 0:
+        return Float(1)
+    if abs(exponent) > MAX_INTEGER_EXPONENT:
+        return exponential(node, exponent)
+    if exponent < 0:
+        return 1 / IntegerPower(node, -exponent)
+
+    result = None
+    square = node
+    while True:
+        if exponent & 1:
+            result = square if result is None else result * square
+        exponent >>= 1
+        if not exponent:
+            return result
+        square = square * square
+
+
+def constantValue(node):
+    """The value of a number or a Float literal node, else None."""
+    if isNumber(node):
+        return float(node)
+    if isinstance(node, Node) and node.record.nodeName == "Float":
+        try:
+            return float(node.record.modifier)
+        except ValueError:
+            return None
+    return None
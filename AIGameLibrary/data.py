@@ -1,3 +1,4 @@
+from collections.abc import Mapping
 from typing import Literal
 
 from .utils import Color, Position2, Position3
@@ -44,1160 +45,1249 @@ outputs = {
     "SubtractVector3": "Vector3",
 }
 
-colors = {
-    "AddVector3": Color(0.22, 0.22, 0.22),
-    "AddFloats": Color(0.22, 0.22, 0.22),
-    "Bool": Color(0.22, 0.22, 0.22),
-    "ClampFloat": Color(0.22, 0.22, 0.22),
-    "Color": Color(0.21, 0.21, 0.21),
-    "ConstructVector3": Color(0.22, 0.22, 0.22),
-    "CompareBool": Color(0.22, 0.22, 0.22),
-    "CompareFloats": Color(0.22, 0.22, 0.22),
-    "ConditionalSetFloatV2": Color(0.22, 0.22, 0.22),
-    "ConditionalSetVector3": Color(0.22, 0.22, 0.22),
-    "ConstructSlimeProperties": Color(0.22, 0.22, 0.22),
-    "SlimeController": Color(0.22, 0.22, 0.22),
-    "Country": Color(0.21, 0.21, 0.21),
-    "CrossProduct": Color(0.22, 0.22, 0.22),
-    "Debug": Color(0.22, 0.22, 0.22),
-    "DebugDrawLine": Color(0.22, 0.22, 0.22),
-    "DebugDrawDisc": Color(0.22, 0.22, 0.22),
-    "Distance": Color(0.22, 0.22, 0.22),
-    "DivideFloats": Color(0.22, 0.22, 0.22),
-    "DotProduct": Color(0.22, 0.22, 0.22),
-    "Float": Color(0.22, 0.22, 0.22),
-    "VolleyballGetBool": Color(0.21, 0.21, 0.21),
-    "VolleyballGetFloat": Color(0.21, 0.21, 0.21),
-    "VolleyballGetTransform": Color(0.21, 0.21, 0.21),
-    "SlimeGetVector3": Color(0.21, 0.21, 0.21),
-    "Magnitude": Color(0.22, 0.22, 0.22),
-    "Modulo": Color(0.22, 0.22, 0.22),
-    "MultiplyFloats": Color(0.22, 0.22, 0.22),
-    "Not": Color(0.22, 0.22, 0.22),
-    "Normalize": Color(0.22, 0.22, 0.22),
-    "Operation": Color(0.22, 0.22, 0.22),
-    "RelativePosition": Color(0.22, 0.22, 0.22),
-    "RandomFloat": Color(0.22, 0.22, 0.22),
-    "ScaleVector3": Color(0.22, 0.22, 0.22),
-    "Vector3Split": Color(0.22, 0.22, 0.22),
-    "Stat": Color(0.21, 0.21, 0.21),
-    "String": Color(0.22, 0.22, 0.22),
-    "SubtractFloats": Color(0.22, 0.22, 0.22),
-    "SubtractVector3": Color(0.22, 0.22, 0.22),
+# node types whose two inputs can be swapped, with the modifiers for which
+# that holds (None: every modifier)
+commutative = {
+    "AddFloats": None,
+    "AddVector3": None,
+    "CompareBool": None,
+    "CompareFloats": {0},
+    "Distance": None,
+    "DotProduct": None,
+    "MultiplyFloats": None,
 }
 
-sizes = {
-    "AddVector3": Position2(250, 155.2),
-    "AddFloats": Position2(250, 155.2),
-    "Bool": Position2(250, 104.7),
-    "ClampFloat": Position2(250, 202.9),
-    "Color": Position2(250, 93.1),
-    "ConstructVector3": Position2(250, 202.9),
-    "CompareBool": Position2(250, 206.9),
-    "CompareFloats": Position2(250, 205.6),
-    "ConditionalSetFloatV2": Position2(250, 310.1),
-    "ConditionalSetVector3": Position2(250, 310.1),
-    "ConstructSlimeProperties": Position2(250, 345),
-    "SlimeController": Position2(250, 152.6),
-    "Country": Position2(250, 93.1),
-    "CrossProduct": Position2(250, 155.2),
-    "Debug": Position2(250, 118.71),
-    "DebugDrawLine": Position2(250, 250),
-    "DebugDrawDisc": Position2(250, 250),
-    "Distance": Position2(250, 180.9),
-    "DivideFloats": Position2(250, 155.2),
-    "DotProduct": Position2(250, 155.2),
-    "Float": Position2(250, 113),
-    "VolleyballGetBool": Position2(300, 93.1),
-    "VolleyballGetFloat": Position2(300, 93.1),
-    "VolleyballGetTransform": Position2(300, 93.1),
-    "SlimeGetVector3": Position2(300, 93.1),
-    "Magnitude": Position2(250, 116.97),
-    "Modulo": Position2(250, 155.2),
-    "MultiplyFloats": Position2(250, 155.2),
-    "Not": Position2(250, 116.97),
-    "Normalize": Position2(250, 116.97),
-    "Operation": Position2(250, 120.4),
-    "RelativePosition": Position2(399.85, 120.4),
-    "RandomFloat": Position2(250, 161.96),
-    "ScaleVector3": Position2(250, 155.2),
-    "Vector3Split": Position2(250, 202.9),
-    "Stat": Position2(300, 42.406),
-    "String": Position2(250, 113),
-    "SubtractFloats": Position2(250, 155.2),
-    "SubtractVector3": Position2(250, 155.2),
+# modifiers that mean the same thing with the two inputs swapped
+# (a > b is b < a, a >= b is b <= a)
+mirrored = {
+    "CompareFloats": {2: 1, 4: 3},
 }
 
-ports = {
-    "AddVector3": [
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Vector32",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Vector31",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-    ],
-    "AddFloats": [
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Float2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "Bool": [
-        {
-            "position": Position3(185, 41.6),
-            "id": "Bool1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.59, 0, 0.87),
-            "iconColorHover": Color(0.71, 0.29, 0.91),
-            "iconColorSelected": Color(0.59, 0, 0.87),
-            "controlPointPosition": Position3(50.6, 0),
-        }
-    ],
-    "ClampFloat": [
-        {
-            "position": Position3(-266.1, -175.8),
-            "id": "Float3",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Float2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "Color": [
-        {
-            "position": Position3(17.6, -19.47),
-            "id": "Color1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.92, 0, 1),
-            "iconColorHover": Color(0.95, 0.33, 1),
-            "iconColorSelected": Color(0.92, 0, 1),
-            "controlPointPosition": Position3(50.6, 0),
-        }
-    ],
-    "ConstructVector3": [
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Vector31",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-266.1, -176.1),
-            "id": "Float3",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -130.5),
-            "id": "Float2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "CompareBool": [
-        {
-            "position": Position3(185, 13.4),
-            "id": "Bool1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.59, 0, 0.87),
-            "iconColorHover": Color(0.71, 0.29, 0.91),
-            "iconColorSelected": Color(0.59, 0, 0.87),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-105, -63.77),
-            "id": "Bool2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.59, 0, 0.87),
-            "iconColorHover": Color(0.71, 0.29, 0.91),
-            "iconColorSelected": Color(0.59, 0, 0.87),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-105, 13.4),
-            "id": "Bool1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.59, 0, 0.87),
-            "iconColorHover": Color(0.71, 0.29, 0.91),
-            "iconColorSelected": Color(0.59, 0, 0.87),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "CompareFloats": [
-        {
-            "position": Position3(185, 13.4),
-            "id": "Bool1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.59, 0, 0.87),
-            "iconColorHover": Color(0.71, 0.29, 0.91),
-            "iconColorSelected": Color(0.59, 0, 0.87),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-105, 13.4),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-105, -65),
-            "id": "Float2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "ConditionalSetFloatV2": [
-        {
-            "position": Position3(-105, -108),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-105, -164.7),
-            "id": "Float2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(185, 6.1),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-105, 6.1),
-            "id": "Bool1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.59, 0, 0.87),
-            "iconColorHover": Color(0.71, 0.29, 0.91),
-            "iconColorSelected": Color(0.59, 0, 0.87),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "ConditionalSetVector3": [
-        {
-            "position": Position3(-105, 6.1),
-            "id": "Bool1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.59, 0, 0.87),
-            "iconColorHover": Color(0.71, 0.29, 0.91),
-            "iconColorSelected": Color(0.59, 0, 0.87),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-105, -108),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-105, -164.7),
-            "id": "Vector32",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(185, 6.1),
-            "id": "Vector31",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-    ],
-    "ConstructSlimeProperties": [
-        {
-            "position": Position3(-230, -20),
-            "id": "String1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.89, 0, 0.4),
-            "iconColorHover": Color(0.88, 0.23, 0.52),
-            "iconColorSelected": Color(0.87, 0, 0.39),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-230, -114),
-            "id": "Color1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.92, 0, 1),
-            "iconColorHover": Color(0.95, 0.33, 1),
-            "iconColorSelected": Color(0.92, 0, 1),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-230, -67),
-            "id": "Country1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.24, 0.79, 0.94),
-            "iconColorHover": Color(0.47, 0.88, 0.99),
-            "iconColorSelected": Color(0.24, 0.8, 0.95),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-230, -161),
-            "id": "Stat1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.6, 0.6, 0.6),
-            "iconColorHover": Color(0.8, 0.8, 0.8),
-            "iconColorSelected": Color(0.58, 0.58, 0.58),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-230, -208),
-            "id": "Stat2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.6, 0.6, 0.6),
-            "iconColorHover": Color(0.8, 0.8, 0.8),
-            "iconColorSelected": Color(0.58, 0.58, 0.58),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-230, -255),
-            "id": "Stat3",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.6, 0.6, 0.6),
-            "iconColorHover": Color(0.8, 0.8, 0.8),
-            "iconColorSelected": Color(0.58, 0.58, 0.58),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "SlimeController": [
-        {
-            "position": Position3(-105, -66.2),
-            "id": "Bool1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.59, 0, 0.87),
-            "iconColorHover": Color(0.71, 0.29, 0.91),
-            "iconColorSelected": Color(0.59, 0, 0.87),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-105, -21.42),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "Country": [
-        {
-            "position": Position3(20.2, -20.72),
-            "id": "Country1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.24, 0.8, 0.95),
-            "iconColorHover": Color(0.47, 0.88, 0.99),
-            "iconColorSelected": Color(0.24, 0.8, 0.95),
-            "controlPointPosition": Position3(50.6, 0),
-        }
-    ],
-    "CrossProduct": [
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Vector32",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Vector3",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-    ],
-    "Debug": [
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Any1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.82, 0.82, 0.82),
-            "iconColorHover": Color(1, 1, 1),
-            "iconColorSelected": Color(0.82, 0.82, 0.82),
-            "controlPointPosition": Position3(-55.8, 0),
-        }
-    ],
-    "DebugDrawLine": [
-        {
-            "position": Position3(-266.1, -85),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Vector32",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -175),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -220),
-            "id": "Color1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.92, 0, 1),
-            "iconColorHover": Color(0.95, 0.33, 1),
-            "iconColorSelected": Color(0.92, 0, 1),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "DebugDrawDisc": [
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -220),
-            "id": "Color1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.92, 0, 1),
-            "iconColorHover": Color(0.95, 0.33, 1),
-            "iconColorSelected": Color(0.92, 0, 1),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -85),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -175),
-            "id": "Float2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "Distance": [
-        {
-            "position": Position3(-105, -25.9),
-            "id": "Vector32",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(185, 35.73),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-105, 35.73),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "DivideFloats": [
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Float2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "DotProduct": [
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Vector32",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-    ],
-    "Float": [
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        }
-    ],
-    "VolleyballGetBool": [
-        {
-            "position": Position3(20.2, -20.72),
-            "id": "Bool1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.59, 0, 0.87),
-            "iconColorHover": Color(0.71, 0.29, 0.91),
-            "iconColorSelected": Color(0.59, 0, 0.87),
-            "controlPointPosition": Position3(50.6, 0),
-        }
-    ],
-    "VolleyballGetFloat": [
-        {
-            "position": Position3(20.2, -20.72),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        }
-    ],
-    "VolleyballGetTransform": [
-        {
-            "position": Position3(20.2, -20.72),
-            "id": "Transform1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.7, 0),
-            "iconColorHover": Color(0.94, 0.8, 0.2),
-            "iconColorSelected": Color(0.87, 0.7, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        }
-    ],
-    "SlimeGetVector3": [
-        {
-            "position": Position3(20.2, -20.72),
-            "id": "Vector31",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        }
-    ],
-    "Magnitude": [
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-    ],
-    "Modulo": [
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Float2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-    ],
-    "MultiplyFloats": [
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Float2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "Not": [
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Bool1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.59, 0, 0.87),
-            "iconColorHover": Color(0.71, 0.29, 0.91),
-            "iconColorSelected": Color(0.59, 0, 0.87),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Bool1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.59, 0, 0.87),
-            "iconColorHover": Color(0.71, 0.29, 0.91),
-            "iconColorSelected": Color(0.59, 0, 0.87),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "Normalize": [
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Vector31",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-    ],
-    "Operation": [
-        {
-            "position": Position3(185, 31.4),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-105, 31.4),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "RelativePosition": [
-        {
-            "position": Position3(-105, 31.4),
-            "id": "Transform1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.7, 0),
-            "iconColorHover": Color(0.95, 0.8, 0.2),
-            "iconColorSelected": Color(0.87, 0.7, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(332.7, 31.4),
-            "id": "Vector31",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-    ],
-    "RandomFloat": [
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Float2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "ScaleVector3": [
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Vector31",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-    "Vector3Split": [
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(19.8, -130.18),
-            "id": "Float2",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(19.8, -175.4),
-            "id": "Float3",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-    ],
-    "Stat": [
-        {
-            "position": Position3(20.2, 25),
-            "id": "Stat1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.59, 0.59, 0.59),
-            "iconColorHover": Color(0.8, 0.8, 0.8),
-            "iconColorSelected": Color(0.6, 0.6, 0.6),
-            "controlPointPosition": Position3(50.6, 0),
-        }
-    ],
-    "String": [
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "String1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0, 0.39),
-            "iconColorHover": Color(0.88, 0.23, 0.52),
-            "iconColorSelected": Color(0.87, 0, 0.39),
-            "controlPointPosition": Position3(50.6, 0),
+# node types whose modifier is a number written as a string
+numericModifiers = {"Float", "Stat"}
+
+
+# The node specs below are stored as tuples, which Python loads as constants
+# without running any code. The dicts serialization uses are only built for
+# the node types a script actually uses.
+class NodeSpecTable(Mapping):
+    """Node type -> spec, built by `build` from `source` on first lookup."""
+
+    __slots__ = ("build", "source", "built")
+
+    def __init__(self, build, source):
+        self.build = build
+        self.source = source
+        self.built = {}
+
+    def __getitem__(self, nodeName):
+        spec = self.built.get(nodeName)
+        if spec is None:
+            spec = self.built[nodeName] = self.build(self.source[nodeName])
+        return spec
+
+    def __contains__(self, nodeName):
+        return nodeName in self.source
+
+    def __iter__(self):
+        return iter(self.source)
+
+    def __len__(self):
+        return len(self.source)
+
+
+def buildPorts(nodePorts):
+    return [
+        {
+            "position": Position3(*position),
+            "id": portId,
+            "polarity": polarity,
+            "maxConnections": maxConnections,
+            "iconColorDefault": Color(*default),
+            "iconColorHover": Color(*hover),
+            "iconColorSelected": Color(*selected),
+            "controlPointPosition": Position3(controlPointX, 0),
         }
-    ],
-    "SubtractFloats": [
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Float2",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Float1",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Float1",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.81, 0),
-            "iconColorHover": Color(0.89, 0.85, 0.37),
-            "iconColorSelected": Color(0.87, 0.81, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-    ],
-    "SubtractVector3": [
-        {
-            "position": Position3(-266.1, -84.2),
-            "id": "Vector31",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-        {
-            "position": Position3(19.8, -84.2),
-            "id": "Vector31",
-            "polarity": 1,
-            "maxConnections": 0,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(50.6, 0),
-        },
-        {
-            "position": Position3(-266.1, -130),
-            "id": "Vector32",
-            "polarity": 0,
-            "maxConnections": 1,
-            "iconColorDefault": Color(0.87, 0.43, 0),
-            "iconColorHover": Color(0.91, 0.55, 0.2),
-            "iconColorSelected": Color(0.87, 0.43, 0),
-            "controlPointPosition": Position3(-55.8, 0),
-        },
-    ],
-}
+        for (
+            portId,
+            polarity,
+            maxConnections,
+            position,
+            controlPointX,
+            default,
+            hover,
+            selected,
+        ) in nodePorts
+    ]
+
+
+# (r, g, b)
+colors = NodeSpecTable(
+    lambda color: Color(*color),
+    {
+        "AddVector3": (0.22, 0.22, 0.22),
+        "AddFloats": (0.22, 0.22, 0.22),
+        "Bool": (0.22, 0.22, 0.22),
+        "ClampFloat": (0.22, 0.22, 0.22),
+        "Color": (0.21, 0.21, 0.21),
+        "ConstructVector3": (0.22, 0.22, 0.22),
+        "CompareBool": (0.22, 0.22, 0.22),
+        "CompareFloats": (0.22, 0.22, 0.22),
+        "ConditionalSetFloatV2": (0.22, 0.22, 0.22),
+        "ConditionalSetVector3": (0.22, 0.22, 0.22),
+        "ConstructSlimeProperties": (0.22, 0.22, 0.22),
+        "SlimeController": (0.22, 0.22, 0.22),
+        "Country": (0.21, 0.21, 0.21),
+        "CrossProduct": (0.22, 0.22, 0.22),
+        "Debug": (0.22, 0.22, 0.22),
+        "DebugDrawLine": (0.22, 0.22, 0.22),
+        "DebugDrawDisc": (0.22, 0.22, 0.22),
+        "Distance": (0.22, 0.22, 0.22),
+        "DivideFloats": (0.22, 0.22, 0.22),
+        "DotProduct": (0.22, 0.22, 0.22),
+        "Float": (0.22, 0.22, 0.22),
+        "VolleyballGetBool": (0.21, 0.21, 0.21),
+        "VolleyballGetFloat": (0.21, 0.21, 0.21),
+        "VolleyballGetTransform": (0.21, 0.21, 0.21),
+        "SlimeGetVector3": (0.21, 0.21, 0.21),
+        "Magnitude": (0.22, 0.22, 0.22),
+        "Modulo": (0.22, 0.22, 0.22),
+        "MultiplyFloats": (0.22, 0.22, 0.22),
+        "Not": (0.22, 0.22, 0.22),
+        "Normalize": (0.22, 0.22, 0.22),
+        "Operation": (0.22, 0.22, 0.22),
+        "RelativePosition": (0.22, 0.22, 0.22),
+        "RandomFloat": (0.22, 0.22, 0.22),
+        "ScaleVector3": (0.22, 0.22, 0.22),
+        "Vector3Split": (0.22, 0.22, 0.22),
+        "Stat": (0.21, 0.21, 0.21),
+        "String": (0.22, 0.22, 0.22),
+        "SubtractFloats": (0.22, 0.22, 0.22),
+        "SubtractVector3": (0.22, 0.22, 0.22),
+    },
+)
+
+# (width, height)
+sizes = NodeSpecTable(
+    lambda size: Position2(*size),
+    {
+        "AddVector3": (250, 155.2),
+        "AddFloats": (250, 155.2),
+        "Bool": (250, 104.7),
+        "ClampFloat": (250, 202.9),
+        "Color": (250, 93.1),
+        "ConstructVector3": (250, 202.9),
+        "CompareBool": (250, 206.9),
+        "CompareFloats": (250, 205.6),
+        "ConditionalSetFloatV2": (250, 310.1),
+        "ConditionalSetVector3": (250, 310.1),
+        "ConstructSlimeProperties": (250, 345),
+        "SlimeController": (250, 152.6),
+        "Country": (250, 93.1),
+        "CrossProduct": (250, 155.2),
+        "Debug": (250, 118.71),
+        "DebugDrawLine": (250, 250),
+        "DebugDrawDisc": (250, 250),
+        "Distance": (250, 180.9),
+        "DivideFloats": (250, 155.2),
+        "DotProduct": (250, 155.2),
+        "Float": (250, 113),
+        "VolleyballGetBool": (300, 93.1),
+        "VolleyballGetFloat": (300, 93.1),
+        "VolleyballGetTransform": (300, 93.1),
+        "SlimeGetVector3": (300, 93.1),
+        "Magnitude": (250, 116.97),
+        "Modulo": (250, 155.2),
+        "MultiplyFloats": (250, 155.2),
+        "Not": (250, 116.97),
+        "Normalize": (250, 116.97),
+        "Operation": (250, 120.4),
+        "RelativePosition": (399.85, 120.4),
+        "RandomFloat": (250, 161.96),
+        "ScaleVector3": (250, 155.2),
+        "Vector3Split": (250, 202.9),
+        "Stat": (300, 42.406),
+        "String": (250, 113),
+        "SubtractFloats": (250, 155.2),
+        "SubtractVector3": (250, 155.2),
+    },
+)
+
+# (id, polarity, max connections, position, control point x,
+#  icon color, hover color, selected color)
+ports = NodeSpecTable(
+    buildPorts,
+    {
+        "AddVector3": (
+            (
+                "Vector31",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Vector32",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Vector31",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+        ),
+        "AddFloats": (
+            (
+                "Float1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float2",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float1",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "Bool": (
+            (
+                "Bool1",
+                1,
+                0,
+                (185, 41.6),
+                50.6,
+                (0.59, 0, 0.87),
+                (0.71, 0.29, 0.91),
+                (0.59, 0, 0.87),
+            ),
+        ),
+        "ClampFloat": (
+            (
+                "Float3",
+                0,
+                1,
+                (-266.1, -175.8),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float2",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float1",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "Color": (
+            (
+                "Color1",
+                1,
+                0,
+                (17.6, -19.47),
+                50.6,
+                (0.92, 0, 1),
+                (0.95, 0.33, 1),
+                (0.92, 0, 1),
+            ),
+        ),
+        "ConstructVector3": (
+            (
+                "Vector31",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Float3",
+                0,
+                1,
+                (-266.1, -176.1),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float1",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float2",
+                0,
+                1,
+                (-266.1, -130.5),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "CompareBool": (
+            (
+                "Bool1",
+                1,
+                0,
+                (185, 13.4),
+                50.6,
+                (0.59, 0, 0.87),
+                (0.71, 0.29, 0.91),
+                (0.59, 0, 0.87),
+            ),
+            (
+                "Bool2",
+                0,
+                1,
+                (-105, -63.77),
+                -55.8,
+                (0.59, 0, 0.87),
+                (0.71, 0.29, 0.91),
+                (0.59, 0, 0.87),
+            ),
+            (
+                "Bool1",
+                0,
+                1,
+                (-105, 13.4),
+                -55.8,
+                (0.59, 0, 0.87),
+                (0.71, 0.29, 0.91),
+                (0.59, 0, 0.87),
+            ),
+        ),
+        "CompareFloats": (
+            (
+                "Bool1",
+                1,
+                0,
+                (185, 13.4),
+                50.6,
+                (0.59, 0, 0.87),
+                (0.71, 0.29, 0.91),
+                (0.59, 0, 0.87),
+            ),
+            (
+                "Float1",
+                0,
+                1,
+                (-105, 13.4),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float2",
+                0,
+                1,
+                (-105, -65),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "ConditionalSetFloatV2": (
+            (
+                "Float1",
+                0,
+                1,
+                (-105, -108),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float2",
+                0,
+                1,
+                (-105, -164.7),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float1",
+                1,
+                0,
+                (185, 6.1),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Bool1",
+                0,
+                1,
+                (-105, 6.1),
+                -55.8,
+                (0.59, 0, 0.87),
+                (0.71, 0.29, 0.91),
+                (0.59, 0, 0.87),
+            ),
+        ),
+        "ConditionalSetVector3": (
+            (
+                "Bool1",
+                0,
+                1,
+                (-105, 6.1),
+                -55.8,
+                (0.59, 0, 0.87),
+                (0.71, 0.29, 0.91),
+                (0.59, 0, 0.87),
+            ),
+            (
+                "Vector31",
+                0,
+                1,
+                (-105, -108),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Vector32",
+                0,
+                1,
+                (-105, -164.7),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Vector31",
+                1,
+                0,
+                (185, 6.1),
+                50.6,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+        ),
+        "ConstructSlimeProperties": (
+            (
+                "String1",
+                0,
+                1,
+                (-230, -20),
+                -55.8,
+                (0.89, 0, 0.4),
+                (0.88, 0.23, 0.52),
+                (0.87, 0, 0.39),
+            ),
+            (
+                "Color1",
+                0,
+                1,
+                (-230, -114),
+                -55.8,
+                (0.92, 0, 1),
+                (0.95, 0.33, 1),
+                (0.92, 0, 1),
+            ),
+            (
+                "Country1",
+                0,
+                1,
+                (-230, -67),
+                -55.8,
+                (0.24, 0.79, 0.94),
+                (0.47, 0.88, 0.99),
+                (0.24, 0.8, 0.95),
+            ),
+            (
+                "Stat1",
+                0,
+                1,
+                (-230, -161),
+                -55.8,
+                (0.6, 0.6, 0.6),
+                (0.8, 0.8, 0.8),
+                (0.58, 0.58, 0.58),
+            ),
+            (
+                "Stat2",
+                0,
+                1,
+                (-230, -208),
+                -55.8,
+                (0.6, 0.6, 0.6),
+                (0.8, 0.8, 0.8),
+                (0.58, 0.58, 0.58),
+            ),
+            (
+                "Stat3",
+                0,
+                1,
+                (-230, -255),
+                -55.8,
+                (0.6, 0.6, 0.6),
+                (0.8, 0.8, 0.8),
+                (0.58, 0.58, 0.58),
+            ),
+        ),
+        "SlimeController": (
+            (
+                "Bool1",
+                0,
+                1,
+                (-105, -66.2),
+                -55.8,
+                (0.59, 0, 0.87),
+                (0.71, 0.29, 0.91),
+                (0.59, 0, 0.87),
+            ),
+            (
+                "Vector31",
+                0,
+                1,
+                (-105, -21.42),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+        ),
+        "Country": (
+            (
+                "Country1",
+                1,
+                0,
+                (20.2, -20.72),
+                50.6,
+                (0.24, 0.8, 0.95),
+                (0.47, 0.88, 0.99),
+                (0.24, 0.8, 0.95),
+            ),
+        ),
+        "CrossProduct": (
+            (
+                "Vector32",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Vector31",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Vector3",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+        ),
+        "Debug": (
+            (
+                "Any1",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.82, 0.82, 0.82),
+                (1, 1, 1),
+                (0.82, 0.82, 0.82),
+            ),
+        ),
+        "DebugDrawLine": (
+            (
+                "Vector31",
+                0,
+                1,
+                (-266.1, -85),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Vector32",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Float1",
+                0,
+                1,
+                (-266.1, -175),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Color1",
+                0,
+                1,
+                (-266.1, -220),
+                -55.8,
+                (0.92, 0, 1),
+                (0.95, 0.33, 1),
+                (0.92, 0, 1),
+            ),
+        ),
+        "DebugDrawDisc": (
+            (
+                "Float1",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Color1",
+                0,
+                1,
+                (-266.1, -220),
+                -55.8,
+                (0.92, 0, 1),
+                (0.95, 0.33, 1),
+                (0.92, 0, 1),
+            ),
+            (
+                "Vector31",
+                0,
+                1,
+                (-266.1, -85),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Float2",
+                0,
+                1,
+                (-266.1, -175),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "Distance": (
+            (
+                "Vector32",
+                0,
+                1,
+                (-105, -25.9),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Float1",
+                1,
+                0,
+                (185, 35.73),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Vector31",
+                0,
+                1,
+                (-105, 35.73),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+        ),
+        "DivideFloats": (
+            (
+                "Float1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float2",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float1",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "DotProduct": (
+            (
+                "Vector31",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Vector32",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Float1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "Float": (
+            (
+                "Float1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "VolleyballGetBool": (
+            (
+                "Bool1",
+                1,
+                0,
+                (20.2, -20.72),
+                50.6,
+                (0.59, 0, 0.87),
+                (0.71, 0.29, 0.91),
+                (0.59, 0, 0.87),
+            ),
+        ),
+        "VolleyballGetFloat": (
+            (
+                "Float1",
+                1,
+                0,
+                (20.2, -20.72),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "VolleyballGetTransform": (
+            (
+                "Transform1",
+                1,
+                0,
+                (20.2, -20.72),
+                50.6,
+                (0.87, 0.7, 0),
+                (0.94, 0.8, 0.2),
+                (0.87, 0.7, 0),
+            ),
+        ),
+        "SlimeGetVector3": (
+            (
+                "Vector31",
+                1,
+                0,
+                (20.2, -20.72),
+                50.6,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+        ),
+        "Magnitude": (
+            (
+                "Vector31",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Float1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "Modulo": (
+            (
+                "Float1",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float2",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "MultiplyFloats": (
+            (
+                "Float1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float2",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float1",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "Not": (
+            (
+                "Bool1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.59, 0, 0.87),
+                (0.71, 0.29, 0.91),
+                (0.59, 0, 0.87),
+            ),
+            (
+                "Bool1",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.59, 0, 0.87),
+                (0.71, 0.29, 0.91),
+                (0.59, 0, 0.87),
+            ),
+        ),
+        "Normalize": (
+            (
+                "Vector31",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Vector31",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+        ),
+        "Operation": (
+            (
+                "Float1",
+                1,
+                0,
+                (185, 31.4),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float1",
+                0,
+                1,
+                (-105, 31.4),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "RelativePosition": (
+            (
+                "Transform1",
+                0,
+                1,
+                (-105, 31.4),
+                -55.8,
+                (0.87, 0.7, 0),
+                (0.95, 0.8, 0.2),
+                (0.87, 0.7, 0),
+            ),
+            (
+                "Vector31",
+                1,
+                0,
+                (332.7, 31.4),
+                50.6,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+        ),
+        "RandomFloat": (
+            (
+                "Float1",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float2",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "ScaleVector3": (
+            (
+                "Float1",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Vector31",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Vector31",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+        ),
+        "Vector3Split": (
+            (
+                "Vector31",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Float1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float2",
+                1,
+                0,
+                (19.8, -130.18),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float3",
+                1,
+                0,
+                (19.8, -175.4),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "Stat": (
+            (
+                "Stat1",
+                1,
+                0,
+                (20.2, 25),
+                50.6,
+                (0.59, 0.59, 0.59),
+                (0.8, 0.8, 0.8),
+                (0.6, 0.6, 0.6),
+            ),
+        ),
+        "String": (
+            (
+                "String1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0, 0.39),
+                (0.88, 0.23, 0.52),
+                (0.87, 0, 0.39),
+            ),
+        ),
+        "SubtractFloats": (
+            (
+                "Float2",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float1",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+            (
+                "Float1",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.81, 0),
+                (0.89, 0.85, 0.37),
+                (0.87, 0.81, 0),
+            ),
+        ),
+        "SubtractVector3": (
+            (
+                "Vector31",
+                0,
+                1,
+                (-266.1, -84.2),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Vector31",
+                1,
+                0,
+                (19.8, -84.2),
+                50.6,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+            (
+                "Vector32",
+                0,
+                1,
+                (-266.1, -130),
+                -55.8,
+                (0.87, 0.43, 0),
+                (0.91, 0.55, 0.2),
+                (0.87, 0.43, 0),
+            ),
+        ),
+    },
+)
 
 colorNames = Literal[
     "Black",
@@ -1287,3 +1377,86 @@ countryNames = Literal[
     "Vietnam",
     "Yemen",
 ]
+
+compareBoolModes = Literal["and", "or", "equal to", "xor", "nor", "nand", "xnor"]
+compareFloatsModes = Literal["==", "<", ">", "<=", ">="]
+operationModes = Literal[
+    "abs",
+    "round",
+    "floor",
+    "ceil",
+    "sin",
+    "cos",
+    "tan",
+    "asin",
+    "acos",
+    "atan",
+    "sqrt",
+    "sign",
+    "ln",
+    "log10",
+    "e^",
+    "10^",
+]
+relativePositions = Literal[
+    "Self",
+    "Self + Forward",
+    "Self + Backward",
+    "Self + Left",
+    "Self + Right",
+    "Self + Up",
+    "Self + Down",
+    "Forward",
+    "Backward",
+    "Left",
+    "Right",
+    "Up",
+    "Down",
+]
+boolProperties = Literal["Self Can Jump", "Opponent Can Jump", "Ball Is Self Side"]
+floatProperties = Literal[
+    "Delta time",
+    "Fixed delta time",
+    "Gravity",
+    "Pi",
+    "Simulation duration",
+    "Team score",
+    "Opponent score",
+    "Ball touches remaining",
+]
+transformNames = Literal[
+    "Self", "Opponent", "Ball", "Self Team Spawn", "Opponent Team Spawn"
+]
+vector3Properties = Literal[
+    "Self Position",
+    "Self Velocity",
+    "Ball Position",
+    "Ball Velocity",
+    "Opponent Position",
+    "Opponent Velocity",
+]
+
+# node types whose modifier is the index of one of these names
+modifierNames = {
+    "CompareBool": compareBoolModes,
+    "CompareFloats": compareFloatsModes,
+    "Operation": operationModes,
+    "RelativePosition": relativePositions,
+    "VolleyballGetBool": boolProperties,
+    "VolleyballGetFloat": floatProperties,
+    "VolleyballGetTransform": transformNames,
+    "SlimeGetVector3": vector3Properties,
+}
+
+# builders take their inputs in the order the input ports appear on the node,
+# top to bottom, except for the node types listed here
+argumentOrder = {
+    "ConstructSlimeProperties": (
+        "String1",
+        "Color1",
+        "Country1",
+        "Stat1",
+        "Stat2",
+        "Stat3",
+    ),
+}
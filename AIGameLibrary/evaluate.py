@@ -0,0 +1,422 @@
+import math
+import random
+from collections import deque
+
+from .data import (
+    boolProperties,
+    floatProperties,
+    operationModes,
+    transformNames,
+    vector3Properties,
+)
+from .graph import ORIGIN, Graph, currentGraph
+from .optimize import compareBool, compareFloats, operations
+from .specs import nodeSpecs
+
+# value of an input port nothing is connected to, by port type
+DEFAULTS = {"Float": 0.0, "Bool": False, "Vector3": (0.0, 0.0, 0.0)}
+
+# GameState attribute read by each getter modifier, in modifier order
+floatAttributes = [
+    "deltaTime",
+    "fixedDeltaTime",
+    "gravity",
+    "pi",
+    "simulationDuration",
+    "teamScore",
+    "opponentScore",
+    "ballTouchesRemaining",
+]
+boolAttributes = ["selfCanJump", "opponentCanJump", "ballIsSelfSide"]
+vector3Attributes = [
+    "selfPosition",
+    "selfVelocity",
+    "ballPosition",
+    "ballVelocity",
+    "opponentPosition",
+    "opponentVelocity",
+]
+transformAttributes = [
+    "selfTransform",
+    "opponentTransform",
+    "ballTransform",
+    "selfTeamSpawn",
+    "opponentTeamSpawn",
+]
+assert len(floatAttributes) == len(floatProperties.__args__)
+assert len(boolAttributes) == len(boolProperties.__args__)
+assert len(vector3Attributes) == len(vector3Properties.__args__)
+assert len(transformAttributes) == len(transformNames.__args__)
+
+SIGN = operationModes.__args__.index("sign")
+LOGARITHMS = (
+    operationModes.__args__.index("ln"),
+    operationModes.__args__.index("log10"),
+)
+
+
+class TransformState:
+    """A position and the directions RelativePosition offsets it by."""
+
+    def __init__(
+        self, position=ORIGIN, forward=(0, 0, 1), right=(1, 0, 0), up=(0, 1, 0)
+    ):
+        self.position = position
+        self.forward = forward
+        self.right = right
+        self.up = up
+
+    def __repr__(self):
+        return f"TransformState(position={self.position}, forward={self.forward})"
+
+
+class GameState:
+    """
+    Everything the getter nodes read in one tick. Vectors are (x, y, z)
+    tuples. The Self, Opponent and Ball transforms default to the entity's
+    position with the world axes; team spawns default to the origin.
+    """
+
+    def __init__(
+        self,
+        *,
+        selfPosition=ORIGIN,
+        selfVelocity=ORIGIN,
+        opponentPosition=ORIGIN,
+        opponentVelocity=ORIGIN,
+        ballPosition=ORIGIN,
+        ballVelocity=ORIGIN,
+        selfCanJump=False,
+        opponentCanJump=False,
+        ballIsSelfSide=False,
+        teamScore=0,
+        opponentScore=0,
+        ballTouchesRemaining=3,
+        deltaTime=0.02,
+        fixedDeltaTime=0.02,
+        gravity=-9.81,
+        simulationDuration=0.0,
+        selfTransform=None,
+        opponentTransform=None,
+        ballTransform=None,
+        selfTeamSpawn=None,
+        opponentTeamSpawn=None,
+    ):
+        self.selfPosition = selfPosition
+        self.selfVelocity = selfVelocity
+        self.opponentPosition = opponentPosition
+        self.opponentVelocity = opponentVelocity
+        self.ballPosition = ballPosition
+        self.ballVelocity = ballVelocity
+        self.selfCanJump = selfCanJump
+        self.opponentCanJump = opponentCanJump
+        self.ballIsSelfSide = ballIsSelfSide
+        self.teamScore = teamScore
+        self.opponentScore = opponentScore
+        self.ballTouchesRemaining = ballTouchesRemaining
+        self.deltaTime = deltaTime
+        self.fixedDeltaTime = fixedDeltaTime
+        self.gravity = gravity
+        self.pi = math.pi
+        self.simulationDuration = simulationDuration
+        self.selfTransform = selfTransform or TransformState(selfPosition)
+        self.opponentTransform = opponentTransform or TransformState(opponentPosition)
+        self.ballTransform = ballTransform or TransformState(ballPosition)
+        self.selfTeamSpawn = selfTeamSpawn or TransformState()
+        self.opponentTeamSpawn = opponentTeamSpawn or TransformState()
+
+
+class Evaluation:
+    """
+    The result of one tick: a (target, jump) pair per SlimeController and
+    the input of each Debug node, both in graph order.
+    """
+
+    def __init__(self):
+        self.controllers = []
+        self.debug = []
+        # node record -> its output values, in output index order; sinks
+        # hold what they received instead
+        self.values = {}
+
+    @property
+    def controller(self):
+        """The (target, jump) of the first SlimeController, or None."""
+        return self.controllers[0] if self.controllers else None
+
+    def value(self, node):
+        """The value of a Node handle built in the evaluated graph."""
+        return self.values[node.record][node.outputIndex - 1]
+
+    def __repr__(self):
+        return f"Evaluation(controller={self.controller}, debug={self.debug})"
+
+
+# floats behave like the game's: no exceptions, but infinities and NaN
+
+
+def divide(a, b):
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a == 0 or math.isnan(a):
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+def modulo(a, b):
+    # C#'s % keeps the sign of the dividend, like fmod
+    try:
+        return math.fmod(a, b)
+    except ValueError:
+        return math.nan
+
+
+def operation(mode, x):
+    if mode == SIGN:
+        # Mathf.Sign
+        return 1.0 if x >= 0 else -1.0
+    if x == 0 and mode in LOGARITHMS:
+        return -math.inf
+    try:
+        return float(operations[mode](x))
+    except OverflowError:
+        return x if math.isinf(x) else math.inf
+    except ValueError:
+        return math.nan
+
+
+def add(a, b):
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+
+def subtract(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def scale(a, factor):
+    return (a[0] * factor, a[1] * factor, a[2] * factor)
+
+
+def dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def magnitude(a):
+    return math.sqrt(dot(a, a))
+
+
+class Evaluator:
+    """
+    Evaluates every node of a graph once, in topological order. Each node
+    type has an `evaluate<nodeName>` method taking the node record and its
+    input values in argument order, and returning its output value, or a
+    tuple of them for nodes with several outputs.
+    """
+
+    def __init__(self, graph: Graph, state: GameState, seed=0):
+        self.graph = graph
+        self.state = state
+        self.random = random.Random(seed)
+        self.result = Evaluation()
+
+    def run(self):
+        inputs = {record: [] for record in self.graph.nodes}
+        consumers = {record: [] for record in self.graph.nodes}
+        for connection in self.graph.connections:
+            inputs[connection.target].append(connection)
+            consumers[connection.source].append(connection.target)
+
+        inDegree = {record: len(inputs[record]) for record in self.graph.nodes}
+        queue = deque(record for record, degree in inDegree.items() if degree == 0)
+        values = self.result.values
+        while queue:
+            record = queue.popleft()
+            values[record] = self.evaluate(record, inputs[record])
+            for target in consumers[record]:
+                inDegree[target] -= 1
+                if inDegree[target] == 0:
+                    queue.append(target)
+
+        if len(values) != len(self.graph.nodes):
+            raise ValueError("the graph has a cycle")
+
+        for record in self.graph.nodes:
+            if record.nodeName == "SlimeController":
+                self.result.controllers.append(values[record][0])
+            elif record.nodeName == "Debug":
+                self.result.debug.append(values[record][0])
+        return self.result
+
+    def evaluate(self, record, connections):
+        spec = nodeSpecs[record.nodeName]
+        arguments = [DEFAULTS.get(portType) for portType in spec.inputTypes]
+        for connection in connections:
+            source = self.result.values[connection.source]
+            sourceSpec = nodeSpecs[connection.source.nodeName]
+            arguments[spec.inputPorts.index(connection.targetPort)] = source[
+                sourceSpec.outputPorts.index(connection.sourcePort)
+            ]
+
+        value = getattr(self, f"evaluate{record.nodeName}")(record, *arguments)
+        return value if len(spec.outputPorts) > 1 else (value,)
+
+    # constants and game state
+
+    def evaluateFloat(self, record):
+        return float(record.modifier)
+
+    def evaluateBool(self, record):
+        # the game stores True as "0"
+        return str(record.modifier) == "0"
+
+    def evaluateString(self, record):
+        return record.modifier
+
+    evaluateColor = evaluateCountry = evaluateStat = evaluateString
+
+    def evaluateVolleyballGetFloat(self, record):
+        return float(getattr(self.state, floatAttributes[int(record.modifier)]))
+
+    def evaluateVolleyballGetBool(self, record):
+        return bool(getattr(self.state, boolAttributes[int(record.modifier)]))
+
+    def evaluateSlimeGetVector3(self, record):
+        vector = getattr(self.state, vector3Attributes[int(record.modifier)])
+        return tuple(map(float, vector))
+
+    def evaluateVolleyballGetTransform(self, record):
+        return getattr(self.state, transformAttributes[int(record.modifier)])
+
+    def evaluateRelativePosition(self, record, transform):
+        mode = int(record.modifier)
+        position = scale(transform.position, 1.0)
+        if mode == 0:
+            return position
+        # "Self + <direction>", then "<direction>", for each of Forward,
+        # Backward, Left, Right, Up and Down
+        forward, right, up = transform.forward, transform.right, transform.up
+        directions = [
+            scale(forward, 1.0),
+            scale(forward, -1.0),
+            scale(right, -1.0),
+            scale(right, 1.0),
+            scale(up, 1.0),
+            scale(up, -1.0),
+        ]
+        if mode <= len(directions):
+            return add(position, directions[mode - 1])
+        return directions[mode - 1 - len(directions)]
+
+    def evaluateRandomFloat(self, record, low, high):
+        return self.random.uniform(low, high)
+
+    # floats
+
+    def evaluateAddFloats(self, record, a, b):
+        return a + b
+
+    def evaluateSubtractFloats(self, record, a, b):
+        return a - b
+
+    def evaluateMultiplyFloats(self, record, a, b):
+        return a * b
+
+    def evaluateDivideFloats(self, record, a, b):
+        return divide(a, b)
+
+    def evaluateModulo(self, record, a, b):
+        return modulo(a, b)
+
+    def evaluateClampFloat(self, record, value, low, high):
+        # Mathf.Clamp
+        return low if value < low else high if value > high else value
+
+    def evaluateOperation(self, record, x):
+        return operation(int(record.modifier), x)
+
+    def evaluateConditionalSetFloatV2(self, record, condition, first, second):
+        # modifier "0" selects the first value when the condition is true,
+        # "1" when it is false
+        return first if condition == (str(record.modifier) == "0") else second
+
+    # bools
+
+    def evaluateCompareFloats(self, record, a, b):
+        return compareFloats[int(record.modifier)](a, b)
+
+    def evaluateCompareBool(self, record, a, b):
+        return bool(compareBool[int(record.modifier)](a, b))
+
+    def evaluateNot(self, record, value):
+        return not value
+
+    # vectors
+
+    def evaluateConstructVector3(self, record, x, y, z):
+        return (x, y, z)
+
+    def evaluateVector3Split(self, record, vector):
+        return tuple(vector)
+
+    def evaluateAddVector3(self, record, a, b):
+        return add(a, b)
+
+    def evaluateSubtractVector3(self, record, a, b):
+        return subtract(a, b)
+
+    def evaluateScaleVector3(self, record, vector, factor):
+        return scale(vector, factor)
+
+    def evaluateCrossProduct(self, record, a, b):
+        return (
+            a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0],
+        )
+
+    def evaluateDotProduct(self, record, a, b):
+        return dot(a, b)
+
+    def evaluateMagnitude(self, record, vector):
+        return magnitude(vector)
+
+    def evaluateDistance(self, record, a, b):
+        return magnitude(subtract(a, b))
+
+    def evaluateNormalize(self, record, vector):
+        # Vector3.normalized is zero for vectors too short to normalize
+        length = magnitude(vector)
+        return scale(vector, 1 / length) if length > 1e-5 else (0.0, 0.0, 0.0)
+
+    evaluateConditionalSetVector3 = evaluateConditionalSetFloatV2
+
+    # sinks, which keep what they receive
+
+    def evaluateSlimeController(self, record, target, jump):
+        return target, jump
+
+    def evaluateDebug(self, record, value):
+        return value
+
+    def evaluateDebugDrawLine(self, record, start, end, width, color):
+        return start, end, width, color
+
+    def evaluateDebugDrawDisc(self, record, center, radius, width, color):
+        return center, radius, width, color
+
+    def evaluateConstructSlimeProperties(self, record, *properties):
+        return properties
+
+
+def evaluateGraph(graph: Graph = None, state: GameState = None, seed=0) -> Evaluation:
+    """
+    Run the graph for one tick in `state` (a default GameState when None)
+    and return the SlimeController outputs and Debug values. RandomFloat
+    draws from a random.Random(seed). Floats are evaluated in double
+    precision, where the game uses single precision, so results can differ
+    in the last bits.
+    """
+    if graph is None:
+        graph = currentGraph()
+    return Evaluator(graph, state or GameState(), seed).run()
@@ -0,0 +1,274 @@
+import os
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from .data import commutative, mirrored, numericModifiers
+from .ids import RandomIds
+from .profiling import TRACE_VARIABLE, Trace
+
+ORIGIN = (0, 0, 0)
+UNIT_SCALE = (1, 1, 1)
+MISSING = object()
+
+
+class NodeRecord:
+    """
+    Compact storage for one game node. The Unity-serializable dict is only
+    built by SaveData; sIDs and instance IDs are assigned at that point too.
+    """
+
+    __slots__ = (
+        "nodeName",
+        "modifier",
+        "graph",
+        "includePorts",
+        "position",
+        "placed",
+        "scale",
+        "hiddenPorts",
+        "sID",
+        "instanceId",
+        "portSIDs",
+    )
+
+    def __init__(self, nodeName, modifier, graph, includePorts=True, position=ORIGIN):
+        self.nodeName = nodeName
+        self.modifier = modifier
+        self.graph = graph
+        self.includePorts = includePorts
+        self.position = position
+        # set for nodes placed with AddNode(position=...), which the
+        # optimizer leaves alone; laid out and loaded nodes aren't placed
+        self.placed = False
+        self.scale = UNIT_SCALE
+        self.hiddenPorts = ()
+        self.sID = None
+        self.instanceId = None
+        self.portSIDs = None
+
+    def __repr__(self):
+        return f"NodeRecord({self.nodeName!r}, modifier={self.modifier!r})"
+
+
+class ConnectionRecord:
+    """An edge from an output port of `source` to an input port of `target`."""
+
+    __slots__ = ("source", "sourcePort", "target", "targetPort", "startWidth", "sID")
+
+    def __init__(self, source, sourcePort, target, targetPort):
+        self.source = source
+        self.sourcePort = sourcePort
+        self.target = target
+        self.targetPort = targetPort
+        self.startWidth = 3.0
+        self.sID = None
+
+    def __repr__(self):
+        return f"ConnectionRecord({self.source!r} -> {self.target!r})"
+
+
+class BuilderCache:
+    """
+    The results of one cached builder in one graph, with hit and miss
+    counters. With `maxSize` set, the least recently used entry is evicted
+    once the cache is full.
+    """
+
+    __slots__ = ("entries", "maxSize", "hits", "misses")
+
+    def __init__(self, maxSize=None):
+        self.entries = OrderedDict() if maxSize is not None else {}
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return (
+            f"BuilderCache(size={len(self.entries)}, maxSize={self.maxSize}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+    def lookup(self, key):
+        value = self.entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            if self.maxSize is not None:
+                self.entries.move_to_end(key)
+        return value
+
+    def store(self, key, value):
+        self.entries[key] = value
+        if self.maxSize is not None and len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+
+    def forget(self, records):
+        """Drop entries whose arguments or result are removed nodes."""
+        for key in [
+            key
+            for key, value in self.entries.items()
+            if getattr(value, "record", None) in records or keyMentions(key, records)
+        ]:
+            del self.entries[key]
+
+
+def keyMentions(key, records):
+    """Whether a builder cache key holds one of `records`, at any depth."""
+    return any(
+        part in records
+        if isinstance(part, NodeRecord)
+        else isinstance(part, tuple) and keyMentions(part, records)
+        for part in key
+    )
+
+
+class Graph:
+    """
+    A single bot graph: its node and connection records, the builder caches,
+    the debug counter and the strategy used to assign sIDs when saving.
+
+    Builders always add to the current graph. Use a Graph as a context
+    manager to build into it instead of the default one:
+
+        with Graph() as graph:
+            SlimeController(Ball.Position, Self.CanJump)
+            SaveData("bot.txt")
+
+    Pass `ids=CounterIds(seed)` or `ids=ContentIds()` for reproducible
+    output; the default RandomIds matches the game's own uuid4 sIDs.
+
+    Nodes added through internNode are value numbered: a node with the same
+    type, modifier and inputs as an existing one (up to input order for
+    commutative nodes) is reused instead of added again. Pass
+    `hashConsing=False` to always add new nodes.
+
+    `cacheSize` bounds every builder cache, evicting the least recently
+    used results first; by default the caches grow with the graph.
+
+    With `trace=True`, or by default while AIGAME_TRACE is set, the graph
+    keeps a Trace of the script line and builder behind each node in
+    `graph.trace`; SaveData then writes it next to the saved file.
+    """
+
+    def __init__(self, ids=None, hashConsing=True, cacheSize=None, trace=None):
+        self.ids = ids if ids is not None else RandomIds()
+        self.hashConsing = hashConsing
+        self.cacheSize = cacheSize
+        self.valueNumbers = {}
+        self.nodes = []
+        self.connections = []
+        self.caches = {}
+        self.debugCounter = 0
+        if trace is None:
+            trace = bool(os.environ.get(TRACE_VARIABLE))
+        self.trace = Trace(self) if trace else None
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_activeGraph.set(self))
+        return self
+
+    def __exit__(self, *exc):
+        _activeGraph.reset(self._tokens.pop())
+        return False
+
+    def __repr__(self):
+        return f"Graph(nodes={len(self.nodes)}, connections={len(self.connections)})"
+
+    def cacheStore(self, builderName):
+        if builderName not in self.caches:
+            self.caches[builderName] = BuilderCache(self.cacheSize)
+        return self.caches[builderName]
+
+    def cacheStats(self):
+        """(hits, misses) per builder, for the builders used in this graph."""
+        return {
+            builderName: (store.hits, store.misses)
+            for builderName, store in self.caches.items()
+        }
+
+    def addNode(self, nodeName, modifier="", includePorts=True, position=ORIGIN):
+        record = NodeRecord(nodeName, modifier, self, includePorts, position)
+        self.nodes.append(record)
+        if self.trace is not None:
+            self.trace.addedNode(record)
+        return record
+
+    def addConnection(self, source, sourcePort, target, targetPort):
+        connection = ConnectionRecord(source, sourcePort, target, targetPort)
+        self.connections.append(connection)
+        if self.trace is not None:
+            self.trace.addedConnection()
+        return connection
+
+    def internNode(self, nodeName, modifier, edges):
+        """
+        Return the node computing `nodeName(modifier, edges)`, adding it and
+        its input connections only if no identical node exists yet. `edges`
+        holds a (source record, source port, target port) per input.
+        """
+        key = valueKey(nodeName, modifier, edges) if self.hashConsing else None
+        record = self.valueNumbers.get(key)
+        if record is None:
+            record = self.addNode(nodeName, modifier)
+            for source, sourcePort, targetPort in edges:
+                self.addConnection(source, sourcePort, record, targetPort)
+            if key is not None:
+                self.valueNumbers[key] = record
+        return record
+
+    def forgetNodes(self, records):
+        """Drop removed nodes from the value numbers and builder caches."""
+        self.valueNumbers = {
+            key: record
+            for key, record in self.valueNumbers.items()
+            if record not in records
+        }
+        for store in self.caches.values():
+            store.forget(records)
+
+
+def valueKey(nodeName, modifier, edges):
+    if nodeName in numericModifiers:
+        try:
+            modifier = float(modifier)
+        except ValueError:
+            pass
+
+    if nodeName in mirrored and modifier in mirrored[nodeName]:
+        modifier = mirrored[nodeName][modifier]
+        edges = sorted(edges, key=lambda edge: edge[2])
+        edges = [
+            (source, sourcePort, targetPort)
+            for (source, sourcePort, _), (_, _, targetPort) in zip(
+                reversed(edges), edges
+            )
+        ]
+
+    inputs = tuple(
+        (targetPort, source, sourcePort) for source, sourcePort, targetPort in edges
+    )
+    if nodeName in commutative and (
+        commutative[nodeName] is None or modifier in commutative[nodeName]
+    ):
+        # only equality of keys matters, so any consistent order will do
+        inputs = tuple(
+            sorted(
+                ((source, sourcePort) for _, source, sourcePort in inputs),
+                key=lambda item: (id(item[0]), item[1]),
+            )
+        )
+
+    return nodeName, modifier, inputs
+
+
+defaultGraph = Graph()
+_activeGraph = ContextVar("activeGraph", default=defaultGraph)
+
+
+def currentGraph() -> Graph:
+    return _activeGraph.get()
@@ -0,0 +1,137 @@
+import random
+from hashlib import blake2b
+
+from .data import ports
+from .utils import generateId
+
+
+def formatGuid(h: str):
+    """Format 32 hex digits as a version 4 GUID string."""
+    variant = "89ab"[int(h[16], 16) & 3]
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{variant}{h[17:20]}-{h[20:32]}"
+
+
+class RandomIds:
+    """uuid4 sIDs and random instance IDs. Output differs on every save."""
+
+    def generateId(self, key: bytes):
+        return generateId()
+
+    def generateInstanceId(self, key: bytes):
+        return random.randint(0, 999999)
+
+
+class CounterIds:
+    """Sequential sIDs and instance IDs, the cheapest deterministic strategy."""
+
+    def __init__(self, seed=0):
+        self.prefix = f"{seed & 0xFFFFFFFF:08x}-0000-4000-8000-"
+        self.idCount = 0
+        self.instanceCount = 0
+
+    def generateId(self, key: bytes):
+        self.idCount += 1
+        return f"{self.prefix}{self.idCount:012x}"
+
+    def generateInstanceId(self, key: bytes):
+        self.instanceCount += 1
+        return self.instanceCount % 1000000
+
+
+class ContentIds:
+    """
+    sIDs derived from what a node computes (type, modifier and inputs), so
+    they only change where the graph changes.
+    """
+
+    def __init__(self, salt=b""):
+        self.salt = salt.encode() if isinstance(salt, str) else salt
+
+    def generateId(self, key: bytes):
+        return formatGuid(blake2b(self.salt + key, digest_size=16).hexdigest())
+
+    def generateInstanceId(self, key: bytes):
+        digest = blake2b(self.salt + key, digest_size=4, person=b"instance").digest()
+        return int.from_bytes(digest) % 1000000
+
+
+def contentKeys(graph):
+    """
+    Structural key per node: type, modifier and the keys of its inputs, with
+    an occurrence count to tell identical nodes apart.
+    """
+    inputs = {record: [] for record in graph.nodes}
+    for connection in graph.connections:
+        inputs[connection.target].append(connection)
+
+    keys = {}
+    occurrences = {}
+    for root in graph.nodes:
+        if root in keys:
+            continue
+        # iterative post-order, so deep expression chains don't hit the
+        # recursion limit
+        stack = [(root, False)]
+        inProgress = set()
+        while stack:
+            record, expanded = stack.pop()
+            if record in keys:
+                continue
+            if not expanded:
+                inProgress.add(record)
+                stack.append((record, True))
+                for connection in inputs[record]:
+                    if (
+                        connection.source not in keys
+                        and connection.source not in inProgress
+                    ):
+                        stack.append((connection.source, False))
+                continue
+
+            parts = [record.nodeName, str(record.modifier)]
+            for connection in sorted(inputs[record], key=lambda c: c.targetPort):
+                # a cycle leaves its back edge unkeyed; the occurrence count
+                # still keeps the result unique
+                sourceKey = keys.get(connection.source, connection.source.nodeName)
+                parts.append(
+                    f"{connection.targetPort}:{sourceKey}:{connection.sourcePort}"
+                )
+            content = "|".join(parts)
+            occurrence = occurrences.get(content, 0)
+            occurrences[content] = occurrence + 1
+            keys[record] = blake2b(
+                f"{content}#{occurrence}".encode(), digest_size=16
+            ).hexdigest()
+            inProgress.discard(record)
+
+    return keys
+
+
+def assignIds(graph):
+    ids = graph.ids
+    keys = contentKeys(graph) if isinstance(ids, ContentIds) else {}
+
+    for record in graph.nodes:
+        key = keys.get(record, "").encode()
+        if record.sID is None:
+            record.sID = ids.generateId(key)
+            record.instanceId = ids.generateInstanceId(key)
+        if record.portSIDs is None:
+            portCount = len(ports[record.nodeName]) if record.includePorts else 0
+            record.portSIDs = [
+                ids.generateId(key + b"port%d" % i) for i in range(portCount)
+            ]
+
+    occurrences = {}
+    for connection in graph.connections:
+        if connection.sID is None:
+            key = b""
+            if keys:
+                content = (
+                    f"{keys[connection.source]}:{connection.sourcePort}"
+                    f">{keys[connection.target]}:{connection.targetPort}"
+                )
+                occurrence = occurrences.get(content, 0)
+                occurrences[content] = occurrence + 1
+                key = f"{content}#{occurrence}".encode()
+            connection.sID = ids.generateId(key)
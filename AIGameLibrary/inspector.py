@@ -0,0 +1,181 @@
+import codecs
+import json
+import mmap
+from collections import Counter
+
+from .data import outputs
+
+# bytes of the mapped file decoded at a time
+WINDOW_SIZE = 1 << 20
+WHITESPACE = " \t\n\r"
+
+
+class SaveReader:
+    """
+    Reads a save file one node or connection at a time. The file is memory
+    mapped and decoded a window at a time, so memory use depends on the
+    largest single record rather than the size of the file.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+        self.textDecoder = codecs.getincrementaldecoder("utf-8")()
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+
+    def more(self):
+        """Decode the next window; False once the whole file is buffered."""
+        if self.offset >= len(self.data):
+            return False
+        window = self.data[self.offset : self.offset + WINDOW_SIZE]
+        self.offset += len(window)
+        final = self.offset >= len(self.data)
+        self.buffer = self.buffer[self.position :] + self.textDecoder.decode(
+            window, final
+        )
+        self.position = 0
+        return True
+
+    def peek(self):
+        while True:
+            while (
+                self.position < len(self.buffer)
+                and self.buffer[self.position] in WHITESPACE
+            ):
+                self.position += 1
+            if self.position < len(self.buffer) or not self.more():
+                break
+        if self.position >= len(self.buffer):
+            raise ValueError("unexpected end of save file")
+        return self.buffer[self.position]
+
+    def expect(self, character):
+        if self.peek() != character:
+            raise ValueError(
+                f"expected {character!r} in save file, "
+                f"found {self.buffer[self.position]!r}"
+            )
+        self.position += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            # the value may continue in the next window: either it doesn't
+            # parse yet, or it is a number running up to the end
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self.more():
+                    raise
+                continue
+            if end == len(self.buffer) and self.more():
+                continue
+            self.position = end
+            return value
+
+    def items(self):
+        """(key, record) for every element of every top level list."""
+        self.expect("{")
+        if self.peek() == "}":
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            if self.peek() == "[":
+                self.position += 1
+                if self.peek() == "]":
+                    self.position += 1
+                else:
+                    while True:
+                        yield key, self.value()
+                        if self.peek() == "]":
+                            self.position += 1
+                            break
+                        self.expect(",")
+            else:
+                self.value()
+
+            if self.peek() == "}":
+                return
+            self.expect(",")
+
+
+def iterSave(filePath):
+    """
+    Yield ("node", node) and ("connection", connection) for the serialized
+    dicts of a save file, in file order, without loading the whole file.
+    """
+    kinds = {"serializableNodes": "node", "serializableConnections": "connection"}
+    with open(filePath, "rb") as f:
+        if not f.seek(0, 2):
+            raise ValueError(f"{filePath} is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for key, item in SaveReader(data).items():
+                if key in kinds:
+                    yield kinds[key], item
+
+
+def iterNodes(filePath):
+    for kind, item in iterSave(filePath):
+        if kind == "node":
+            yield item
+
+
+def iterConnections(filePath):
+    for kind, item in iterSave(filePath):
+        if kind == "connection":
+            yield item
+
+
+class SaveSummary:
+    def __init__(self, filePath):
+        self.filePath = filePath
+        self.nodeTypes = Counter()
+        self.connectionCount = 0
+        # (node type, sID, connected input count) per node without outputs
+        self.sinks = []
+        self.unknownTypes = Counter()
+
+    @property
+    def nodeCount(self):
+        return self.nodeTypes.total()
+
+    def __repr__(self):
+        return (
+            f"SaveSummary({self.filePath!r}, nodes={self.nodeCount}, "
+            f"connections={self.connectionCount}, sinks={len(self.sinks)})"
+        )
+
+
+def summarize(filePath) -> SaveSummary:
+    """
+    Node type counts, the connection count and the sinks (SlimeController,
+    Debug, ...) with how many of their inputs are connected, read in one
+    streaming pass.
+    """
+    summary = SaveSummary(filePath)
+    sinkPorts = {}
+    connectedInputs = Counter()
+
+    for kind, item in iterSave(filePath):
+        if kind == "node":
+            nodeName = item["id"]
+            summary.nodeTypes[nodeName] += 1
+            if nodeName not in outputs:
+                summary.unknownTypes[nodeName] += 1
+            elif outputs[nodeName] is None:
+                for port in item["serializablePorts"]:
+                    sinkPorts[port["sID"]] = item["sID"]
+                summary.sinks.append((nodeName, item["sID"]))
+        else:
+            summary.connectionCount += 1
+            sID = sinkPorts.get(item["port1SID"])
+            if sID is not None:
+                connectedInputs[sID] += 1
+
+    summary.sinks = [
+        (nodeName, sID, connectedInputs[sID]) for nodeName, sID in summary.sinks
+    ]
+    return summary
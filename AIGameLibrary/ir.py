@@ -0,0 +1,270 @@
+import json
+import mmap
+import struct
+
+from .data import ports
+from .graph import UNIT_SCALE, Graph, currentGraph
+from .lib import Node, indexLoadedNodes
+from .serialization import getBackend, readDocument, writeDocument
+
+# Binary intermediate representation of a graph, for loading bots again
+# without parsing their JSON. All integers are little endian:
+#
+#   header       magic, version and the size of each section
+#   nodes        one NODE struct per node record, in graph order
+#   connections  one CONNECTION struct per connection, in graph order
+#   port sIDs    one u32 string index per port; nodes hold a slice of it
+#   strings      UTF-8 strings separated by NUL bytes
+#
+# Strings are node types, sIDs and JSON encoded modifiers, each stored once.
+# Sections are read in place with unpack_from, so a file can be memory mapped.
+MAGIC = b"AIGI"
+VERSION = 1
+HEADER = struct.Struct("<4sHIIII")
+# type, modifier, flags, int mask, hidden port mask, position, scale, sID,
+# instance ID, first port sID, port count
+NODE = struct.Struct("<IIBBB3d3dIqIB")
+# source, source port, target, target port, start width, width is int, sID
+CONNECTION = struct.Struct("<IBIBd?I")
+
+INCLUDE_PORTS = 1
+HAS_INSTANCE_ID = 2
+HAS_PORT_SIDS = 4
+PLACED = 8
+
+# string index of a missing string, e.g. an sID not assigned yet
+NONE = 0xFFFFFFFF
+# integers stored as doubles must convert back exactly
+MAX_EXACT_INTEGER = 2**53
+
+
+class StringTable:
+    def __init__(self):
+        self.indices = {}
+
+    def index(self, text):
+        if text is None:
+            return NONE
+        index = self.indices.get(text)
+        if index is None:
+            if "\0" in text:
+                raise ValueError(f"string {text!r} contains a NUL character")
+            index = self.indices[text] = len(self.indices)
+        return index
+
+    def encode(self):
+        return "\0".join(self.indices).encode()
+
+
+def intMask(numbers):
+    """Bit i is set when numbers[i] is an int, so it is written back as one."""
+    mask = 0
+    for i, number in enumerate(numbers):
+        if type(number) is int:
+            if abs(number) > MAX_EXACT_INTEGER:
+                raise ValueError(f"{number} can't be stored exactly")
+            mask |= 1 << i
+    return mask
+
+
+def dumpIR(graph: Graph) -> bytes:
+    strings = StringTable()
+    nodeIndices = {}
+    portSIDs = []
+    nodeData = bytearray()
+    for i, record in enumerate(graph.nodes):
+        nodeIndices[record] = i
+        numbers = (*record.position, *record.scale)
+        flags = INCLUDE_PORTS if record.includePorts else 0
+        if record.placed:
+            flags |= PLACED
+        if record.instanceId is not None:
+            flags |= HAS_INSTANCE_ID
+        portStart = len(portSIDs)
+        if record.portSIDs is not None:
+            flags |= HAS_PORT_SIDS
+            portSIDs.extend(strings.index(sID) for sID in record.portSIDs)
+        nodeData += NODE.pack(
+            strings.index(record.nodeName),
+            strings.index(json.dumps(record.modifier)),
+            flags,
+            intMask(numbers),
+            sum(1 << port for port in set(record.hiddenPorts)),
+            *numbers,
+            strings.index(record.sID),
+            record.instanceId or 0,
+            portStart,
+            len(portSIDs) - portStart,
+        )
+
+    connectionData = bytearray()
+    for connection in graph.connections:
+        startWidth = connection.startWidth
+        if type(startWidth) is int:
+            intMask((startWidth,))
+        connectionData += CONNECTION.pack(
+            nodeIndices[connection.source],
+            connection.sourcePort,
+            nodeIndices[connection.target],
+            connection.targetPort,
+            startWidth,
+            type(startWidth) is int,
+            strings.index(connection.sID),
+        )
+
+    stringData = strings.encode()
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(graph.nodes),
+        len(graph.connections),
+        len(portSIDs),
+        len(stringData),
+    )
+    return b"".join(
+        (
+            header,
+            nodeData,
+            connectionData,
+            struct.pack(f"<{len(portSIDs)}I", *portSIDs),
+            stringData,
+        )
+    )
+
+
+def loadIR(data, graph: Graph):
+    """
+    Add the nodes and connections of IR `data` (bytes, a memoryview or an
+    mmap) to `graph`. Returns the new node records in file order.
+    """
+    magic, version, nodeCount, connectionCount, portSIDCount, stringSize = (
+        HEADER.unpack_from(data)
+    )
+    if magic != MAGIC:
+        raise ValueError("not an IR file")
+    if version != VERSION:
+        raise ValueError(f"unsupported IR version {version}")
+
+    offset = HEADER.size
+    connectionOffset = offset + nodeCount * NODE.size
+    portOffset = connectionOffset + connectionCount * CONNECTION.size
+    stringOffset = portOffset + 4 * portSIDCount
+    if len(data) != stringOffset + stringSize:
+        raise ValueError("truncated IR file")
+
+    strings = bytes(data[stringOffset:]).decode().split("\0")
+    portSIDs = [
+        strings[i] for i in struct.unpack_from(f"<{portSIDCount}I", data, portOffset)
+    ]
+    strings.append(None)  # strings[NONE] is the last item
+    modifiers = {}
+
+    records = []
+    for (
+        nodeName,
+        modifier,
+        flags,
+        ints,
+        hidden,
+        x,
+        y,
+        z,
+        scaleX,
+        scaleY,
+        scaleZ,
+        sID,
+        instanceId,
+        portStart,
+        portCount,
+    ) in struct.iter_unpack(NODE.format, data[offset:connectionOffset]):
+        nodeName = strings[nodeName]
+        if nodeName not in ports:
+            raise ValueError(f"unknown node type {nodeName!r}")
+        if modifier not in modifiers:
+            modifiers[modifier] = json.loads(strings[modifier])
+        numbers = (x, y, z, scaleX, scaleY, scaleZ)
+        if ints:
+            numbers = tuple(
+                int(number) if ints & 1 << i else number
+                for i, number in enumerate(numbers)
+            )
+        record = graph.addNode(
+            nodeName,
+            modifiers[modifier],
+            includePorts=bool(flags & INCLUDE_PORTS),
+            position=numbers[:3],
+        )
+        record.placed = bool(flags & PLACED)
+        # UNIT_SCALE is all ints; a float (1.0, 1.0, 1.0) was set explicitly
+        if numbers[3:] != UNIT_SCALE or ints & 0b111000 != 0b111000:
+            record.scale = numbers[3:]
+        if hidden:
+            record.hiddenPorts = tuple(
+                i for i in range(hidden.bit_length()) if hidden & 1 << i
+            )
+        record.sID = strings[sID if sID != NONE else -1]
+        if flags & HAS_INSTANCE_ID:
+            record.instanceId = instanceId
+        if flags & HAS_PORT_SIDS:
+            record.portSIDs = portSIDs[portStart : portStart + portCount]
+        records.append(record)
+
+    for (
+        source,
+        sourcePort,
+        target,
+        targetPort,
+        startWidth,
+        isInt,
+        sID,
+    ) in struct.iter_unpack(CONNECTION.format, data[connectionOffset:portOffset]):
+        connection = graph.addConnection(
+            records[source], sourcePort, records[target], targetPort
+        )
+        connection.startWidth = int(startWidth) if isInt else startWidth
+        connection.sID = strings[sID if sID != NONE else -1]
+
+    return records
+
+
+def readIR(filePath, graph: Graph):
+    """loadIR from a memory mapped file."""
+    with open(filePath, "rb") as f:
+        if not f.seek(0, 2):
+            raise ValueError(f"{filePath} is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            with memoryview(data) as view:
+                return loadIR(view, graph)
+
+
+def SaveIR(filePath):
+    """
+    Save the current graph as a binary IR file. Unlike SaveData, the graph
+    is stored as it is: no pruning, layout or ID assignment.
+    """
+    data = dumpIR(currentGraph())
+    with open(filePath, "wb") as f:
+        f.write(data)
+
+
+def LoadIR(filePath) -> list[Node]:
+    """LoadData for a file saved by SaveIR or saveToIR."""
+    graph = currentGraph()
+    return indexLoadedNodes(graph, readIR(filePath, graph))
+
+
+def saveToIR(savePath, irPath):
+    """Convert a save file to a binary IR file."""
+    graph = Graph()
+    with open(savePath) as f:
+        readDocument(json.load(f), graph)
+    with open(irPath, "wb") as f:
+        f.write(dumpIR(graph))
+
+
+def irToSave(irPath, savePath, backend=None):
+    """Convert a binary IR file back to the exact save file it came from."""
+    graph = Graph()
+    readIR(irPath, graph)
+    with open(savePath, "w") as f:
+        writeDocument(f, graph, backend and getBackend(backend))
@@ -1,575 +1,243 @@
 import json
 import math
 import numbers
-import random
-from collections import deque
+import os
+from collections import Counter, deque
+from contextvars import ContextVar
 from typing import Literal
 
-from .data import colors, outputs, ports, sizes
-from .utils import Color, Position2, Position3, generateId
+from .data import outputs
+from .graph import ORIGIN, Graph, NodeRecord, currentGraph, defaultGraph, valueKey
+from .ids import assignIds
+from .optimize import optimizeGraph
+from .profiling import SaveStats, emitSaveStats
+from .serialization import getBackend, readDocument, toTuple, writeDocument
+from .specs import nodeSpecs
+from .utils import openForWriting
 
-data = {"serializableNodes": [], "serializableConnections": []}
+# the graph used outside of any `with Graph():` block
+data = defaultGraph
+
+# while a build is running, every SaveData call is recorded in this list
+saveLog = ContextVar("saveLog", default=None)
 
 
 def isNumber(value):
     return isinstance(value, numbers.Number) and not isinstance(value, bool)
 
 
+# operator -> operand type -> other operand type -> builder, filled from
+# operatorTable once the builders are defined
+operators = {}
+NO_BUILDERS = {}
+
+
+def operandType(value):
+    """The Node type an operand stands for: numbers are float, bools bool."""
+    valueType = type(value)
+    if valueType is Node:
+        return value.type
+    if valueType is int or valueType is float:
+        return float
+    if valueType is bool:
+        return bool
+    if isinstance(value, Node):
+        return value.type
+    if isNumber(value):
+        return float
+    return None
+
+
+def binaryOperator(name):
+    builders = operators.setdefault(name, {})
+
+    def operator(self, other) -> "Node":
+        otherType = other.type if type(other) is Node else operandType(other)
+        builder = builders.get(self.type, NO_BUILDERS).get(otherType)
+        if builder is None:
+            return NotImplemented
+        return builder(self, other)
+
+    operator.__name__ = f"__{name}__"
+    operator.__qualname__ = f"Node.__{name}__"
+    return operator
+
+
+def unaryOperator(name):
+    builders = operators.setdefault(name, {})
+
+    def operator(self) -> "Node":
+        builder = builders.get(self.type, NO_BUILDERS).get(None)
+        if builder is None:
+            return NotImplemented
+        return builder(self)
+
+    operator.__name__ = f"__{name}__"
+    operator.__qualname__ = f"Node.__{name}__"
+    return operator
+
+
 class Node:
-    def __init__(self, data: dict, outputIndex=1):
-        self.data = data
+    __slots__ = ("record", "outputIndex", "type")
+
+    def __init__(self, record: NodeRecord, outputIndex=1):
+        self.record = record
         self.outputIndex = outputIndex
-        self.type = outputs[data["id"]]
-        self.inputPorts = {}
-        self.outputPorts = {}
-        for port in data["serializablePorts"]:
-            if port["polarity"] == 0:
-                self.inputPorts[port["id"]] = port
-            else:
-                self.outputPorts[port["id"]] = port
+        self.type = outputs[record.nodeName]
 
     @property
     def x(self):
         if self.type == "Vector3":
-            from .nodes import Vector3Split
-
-            return Vector3Split(self).x
+            return nodes.Vector3Split(self).x
         raise AttributeError("'Node' object has no attribute 'x'")
 
     @property
     def y(self):
         if self.type == "Vector3":
-            from .nodes import Vector3Split
-
-            return Vector3Split(self).y
+            return nodes.Vector3Split(self).y
         raise AttributeError("'Node' object has no attribute 'y'")
 
     @property
     def z(self):
         if self.type == "Vector3":
-            from .nodes import Vector3Split
-
-            return Vector3Split(self).z
+            return nodes.Vector3Split(self).z
         raise AttributeError("'Node' object has no attribute 'z'")
 
     def __repr__(self):
-        return f"Node(type='{self.type}', id='{self.data['sID']}')"
+        return f"Node(type='{self.type}', node='{self.record.nodeName}')"
 
     def __hash__(self):
-        return int(self.data["sID"].replace("-", ""), 16) + self.outputIndex
-
-    def __add__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == float and other.type == float:
-                from .nodes import AddFloats
-
-                return AddFloats(self, other)
-            if self.type == "Vector3" and other.type == "Vector3":
-                from .nodes import AddVector3
-
-                return AddVector3(self, other)
-
-        elif isNumber(other) and self.type == float:
-            from .nodes import AddFloats
-
-            return AddFloats(self, other)
-
-        return NotImplemented
-
-    def __radd__(self, other) -> "Node":
-        return self.__add__(other)
-
-    def __sub__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == float and other.type == float:
-                from .nodes import SubtractFloats
-
-                return SubtractFloats(self, other)
-            if self.type == "Vector3" and other.type == "Vector3":
-                from .nodes import SubtractVector3
-
-                return SubtractVector3(self, other)
-
-        elif isNumber(other) and self.type == float:
-            from .nodes import SubtractFloats
-
-            return SubtractFloats(self, other)
-
-        return NotImplemented
-
-    def __rsub__(self, other) -> "Node":
-        if isNumber(other) and self.type == float:
-            from .nodes import SubtractFloats
-
-            return SubtractFloats(other, self)
-
-        return NotImplemented
-
-    def __mul__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == float and other.type == float:
-                from .nodes import MultiplyFloats
-
-                return MultiplyFloats(self, other)
-            if self.type == "Vector3" and other.type == float:
-                from .nodes import ScaleVector3
-
-                return ScaleVector3(self, other)
-            if self.type == float and other.type == "Vector3":
-                from .nodes import ScaleVector3
-
-                return ScaleVector3(other, self)
-
-        elif isNumber(other):
-            if self.type == float:
-                from .nodes import MultiplyFloats
-
-                return MultiplyFloats(self, other)
-            if self.type == "Vector3":
-                from .nodes import ScaleVector3
-
-                return ScaleVector3(self, other)
-
-        return NotImplemented
-
-    def __rmul__(self, other) -> "Node":
-        return self.__mul__(other)
-
-    def __truediv__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == float and other.type == float:
-                from .nodes import DivideFloats
-
-                return DivideFloats(self, other)
-
-        elif isNumber(other) and self.type == float:
-            from .nodes import DivideFloats
-
-            return DivideFloats(self, other)
-
-        return NotImplemented
-
-    def __rtruediv__(self, other) -> "Node":
-        if isNumber(other) and self.type == float:
-            from .nodes import DivideFloats
-
-            return DivideFloats(other, self)
-
-        return NotImplemented
-
-    def __floordiv__(self, other) -> "Node":
-        result = self.__truediv__(other)
-        if result is NotImplemented:
-            return result
-        from .nodes import Operation
-
-        return Operation(result, "floor")
-
-    def __rfloordiv__(self, other) -> "Node":
-        if isNumber(other) and self.type == float:
-            from .nodes import DivideFloats
-
-            div_result = DivideFloats(other, self)
-            from .nodes import Operation
-
-            return Operation(div_result, "floor")
-
-        return NotImplemented
-
-    def __mod__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == float and other.type == float:
-                from .nodes import Modulo
-
-                return Modulo(self, other)
-
-        elif isNumber(other) and self.type == float:
-            from .nodes import Modulo
-
-            return Modulo(self, other)
-
-        return NotImplemented
-
-    def __rmod__(self, other) -> "Node":
-        if isNumber(other) and self.type == float:
-            from .nodes import Modulo
-
-            return Modulo(other, self)
-
-        return NotImplemented
-
-    def __pow__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == float and other.type == float:
-                from .customNodes import Power
-
-                return Power(self, other)
-
-        elif isNumber(other) and self.type == float:
-            if other == 2:
-                from .nodes import MultiplyFloats
-
-                return MultiplyFloats(self, self)
-
-            from .customNodes import Power
-
-            return Power(self, other)
-
-        return NotImplemented
-
-    def __rpow__(self, other) -> "Node":
-        if isNumber(other) and self.type == float:
-            from .customNodes import Power
-
-            return Power(other, self)
-
-        return NotImplemented
-
-    def __neg__(self) -> "Node":
-        if self.type == float:
-            from .nodes import MultiplyFloats
-
-            return MultiplyFloats(self, -1)
-
-        return NotImplemented
+        return hash((id(self.record), self.outputIndex))
+
+    __add__ = binaryOperator("add")
+    __radd__ = binaryOperator("radd")
+    __sub__ = binaryOperator("sub")
+    __rsub__ = binaryOperator("rsub")
+    __mul__ = binaryOperator("mul")
+    __rmul__ = binaryOperator("rmul")
+    __truediv__ = binaryOperator("truediv")
+    __rtruediv__ = binaryOperator("rtruediv")
+    __floordiv__ = binaryOperator("floordiv")
+    __rfloordiv__ = binaryOperator("rfloordiv")
+    __mod__ = binaryOperator("mod")
+    __rmod__ = binaryOperator("rmod")
+    __pow__ = binaryOperator("pow")
+    __rpow__ = binaryOperator("rpow")
+    __eq__ = binaryOperator("eq")
+    __ne__ = binaryOperator("ne")
+    __lt__ = binaryOperator("lt")
+    __le__ = binaryOperator("le")
+    __gt__ = binaryOperator("gt")
+    __ge__ = binaryOperator("ge")
+    __and__ = binaryOperator("and")
+    __rand__ = binaryOperator("rand")
+    __or__ = binaryOperator("or")
+    __ror__ = binaryOperator("ror")
+    __xor__ = binaryOperator("xor")
+    __rxor__ = binaryOperator("rxor")
+    __matmul__ = binaryOperator("matmul")
+    __rmatmul__ = binaryOperator("rmatmul")
+    __neg__ = unaryOperator("neg")
+    __abs__ = unaryOperator("abs")
+    __invert__ = unaryOperator("invert")
 
     def __pos__(self) -> "Node":
         return self
 
-    def __abs__(self) -> "Node":
-        if self.type == float:
-            from .nodes import Operation
-
-            return Operation(self, "abs")
-
-        return NotImplemented
-
-    def __invert__(self) -> "Node":
-        if self.type == bool:
-            from .nodes import Not
-
-            return Not(self)
-
-        return NotImplemented
-
-    def __eq__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == float and other.type == float:
-                from .nodes import CompareFloats
-
-                return CompareFloats(self, other)
-            if self.type == bool and other.type == bool:
-                from .nodes import CompareBool
-
-                return CompareBool(self, other)
-
-        elif isNumber(other) and self.type == float:
-            from .nodes import CompareFloats
-
-            return CompareFloats(self, other)
-
-        elif isinstance(other, bool) and self.type == bool:
-            from .nodes import CompareBool
 
-            return CompareBool(self, other)
-
-        return NotImplemented
-
-    def __ne__(self, other) -> "Node":
-        result = self.__eq__(other)
-        if result is NotImplemented:
-            return result
-        from .nodes import Not
-
-        return Not(result)
-
-    def __lt__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == float and other.type == float:
-                from .nodes import CompareFloats
-
-                return CompareFloats(self, other, "<")
-
-        elif isNumber(other) and self.type == float:
-            from .nodes import CompareFloats
-
-            return CompareFloats(self, other, "<")
-
-        return NotImplemented
-
-    def __le__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == float and other.type == float:
-                from .nodes import CompareFloats
-
-                return CompareFloats(self, other, "<=")
-
-        elif isNumber(other) and self.type == float:
-            from .nodes import CompareFloats
-
-            return CompareFloats(self, other, "<=")
-
-        return NotImplemented
-
-    def __gt__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == float and other.type == float:
-                from .nodes import CompareFloats
-
-                return CompareFloats(self, other, ">")
-
-        elif isNumber(other) and self.type == float:
-            from .nodes import CompareFloats
-
-            return CompareFloats(self, other, ">")
-
-        return NotImplemented
-
-    def __ge__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == float and other.type == float:
-                from .nodes import CompareFloats
-
-                return CompareFloats(self, other, ">=")
-
-        elif isNumber(other) and self.type == float:
-            from .nodes import CompareFloats
-
-            return CompareFloats(self, other, ">=")
-
-        return NotImplemented
-
-    def __and__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == bool and other.type == bool:
-                from .nodes import CompareBool
-
-                return CompareBool(self, other, "and")
-
-        elif isinstance(other, bool) and self.type == bool:
-            from .nodes import CompareBool
-
-            return CompareBool(self, other, "and")
-
-        return NotImplemented
-
-    def __rand__(self, other) -> "Node":
-        if isinstance(other, bool) and self.type == bool:
-            from .nodes import CompareBool
-
-            return CompareBool(other, self, "and")
-
-        return NotImplemented
-
-    def __or__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == bool and other.type == bool:
-                from .nodes import CompareBool
-
-                return CompareBool(self, other, "or")
-
-        elif isinstance(other, bool) and self.type == bool:
-            from .nodes import CompareBool
-
-            return CompareBool(self, other, "or")
-
-        return NotImplemented
-
-    def __ror__(self, other) -> "Node":
-        if isinstance(other, bool) and self.type == bool:
-            from .nodes import CompareBool
-
-            return CompareBool(other, self, "or")
-
-        return NotImplemented
-
-    def __xor__(self, other) -> "Node":
-        if isinstance(other, Node):
-            from .nodes import CompareBool
-
-            if self.type == bool and other.type == bool:
-                return CompareBool(self, other, "xor")
-
-        elif isinstance(other, bool) and self.type == bool:
-            from .nodes import CompareBool
-
-            return CompareBool(self, other, "xor")
-
-        return NotImplemented
-
-    def __rxor__(self, other) -> "Node":
-        if isinstance(other, bool) and self.type == bool:
-            from .nodes import CompareBool
-
-            return CompareBool(other, self, "xor")
+def AddNode(
+    nodeName, nodeValue="", includePorts=True, position=None, inputs=None, intern=True
+):
+    """
+    Add a node to the current graph. With `inputs`, a list of
+    (input node, output port name, input port name), the node is connected
+    to its inputs and value numbered, so an identical existing node is
+    returned instead (`intern=False` always adds a new one).
+    """
+    graph = currentGraph()
+
+    if inputs is None:
+        record = graph.addNode(nodeName, nodeValue, includePorts, toTuple(position))
+        record.placed = position is not None
+        return Node(record)
+
+    edges = []
+    for inputNode, portName0, portName1 in inputs:
+        checkGraph(graph, inputNode)
+        port0 = findPort(inputNode.record, portName0, polarity=1)
+        port1 = findPort(nodeName, portName1, polarity=0)
+        edges.append((inputNode.record, port0, port1))
+
+    return addNodeWithInputs(
+        graph, nodeName, nodeValue, edges, includePorts, position, intern
+    )
+
+
+def addNodeWithInputs(
+    graph, nodeName, nodeValue, edges, includePorts=True, position=None, intern=True
+):
+    """AddNode for inputs already resolved to (source record, port, port) edges."""
+    # placed nodes are never shared, their position belongs to one call
+    if intern and position is None:
+        return Node(graph.internNode(nodeName, nodeValue, edges))
 
-        return NotImplemented
+    record = graph.addNode(nodeName, nodeValue, includePorts, toTuple(position))
+    record.placed = position is not None
+    for source, sourcePort, targetPort in edges:
+        graph.addConnection(source, sourcePort, record, targetPort)
+    return Node(record)
 
-    def __matmul__(self, other) -> "Node":
-        if isinstance(other, Node):
-            if self.type == "Vector3" and other.type == "Vector3":
-                from .nodes import DotProduct
 
-                return DotProduct(self, other)
+def ConnectPorts(portType: tuple | str, node0: Node, node1: Node):
+    graph = currentGraph()
+    checkGraph(graph, node0)
+    checkGraph(graph, node1)
 
-        return NotImplemented
+    if isinstance(portType, tuple):
+        portName0, portName1 = portType
+    else:
+        portName0 = portName1 = portType
 
-    def __rmatmul__(self, other) -> "Node":
-        return self.__matmul__(other)
+    port0 = findPort(node0.record, portName0, polarity=1)
+    port1 = findPort(node1.record, portName1, polarity=0)
 
+    return graph.addConnection(node0.record, port0, node1.record, port1)
 
-def AddNode(nodeName, nodeValue="", includePorts=True, position=None):
-    node = {}
 
-    if position is None:
-        position = Position3(0, 0)
+def checkGraph(graph, node: Node):
+    if node.record.graph is not graph:
+        raise ValueError(f"{node} does not belong to the current graph")
 
-    nodeId = generateId()
-    instanceId = random.randint(0, 999999)
 
-    node["serializableRectTransform"] = {}
-    node["serializableRectTransform"]["position"] = Position3(0, 0)
-    node["serializableRectTransform"]["localPosition"] = position
-    node["serializableRectTransform"]["anchorMin"] = Position2(0, 1)
-    node["serializableRectTransform"]["anchorMax"] = Position2(0, 1)
-    node["serializableRectTransform"]["sizeDelta"] = sizes[nodeName]
-    node["serializableRectTransform"]["scale"] = Position3(1, 1, 1)
-    node["id"] = nodeName
-    node["sID"] = nodeId
-    node["enableSelfConnection"] = False
-    node["enableDrag"] = True
-    node["enableHover"] = False
-    node["enableSelect"] = True
-    node["disableClick"] = False
-    node["modifier"] = nodeValue
-    node["defaultColor"] = colors[nodeName]
-    node["outlineSelectedColor"] = Color(1, 0.58, 0.04)
-    node["outlineHoverColor"] = Color(1, 0.81, 0.3)
-    node["serializablePorts"] = []
-    if includePorts:
-        for portData in ports[nodeName]:
-            node["serializablePorts"].append(
-                {
-                    "serializableRectTransform": {
-                        "position": Position3(0, 0),
-                        "localPosition": portData["position"],
-                        "anchorMin": Position2(0, 1),
-                        "anchorMax": Position2(0, 1),
-                        "sizeDelta": Position2(40, 40),
-                        "scale": Position3(1, 1, 1),
-                    },
-                    "id": portData["id"],
-                    "sID": generateId(),
-                    "polarity": portData["polarity"],
-                    "maxConnections": portData["maxConnections"],
-                    "iconColorDefault": portData["iconColorDefault"],
-                    "iconColorHover": portData["iconColorHover"],
-                    "iconColorSelected": portData["iconColorSelected"],
-                    "iconColorConnected": Color(1, 1, 1),
-                    "enableDrag": True,
-                    "enableHover": True,
-                    "disableClick": False,
-                    "controlPointSerializableRectTransform": {
-                        "position": Position3(0, 0),
-                        "localPosition": portData["controlPointPosition"],
-                        "anchorMin": Position2(0.5, 0.5),
-                        "anchorMax": Position2(0.5, 0.5),
-                        "sizeDelta": Position2(0, 0),
-                        "scale": Position3(2.21, 2.21, 2.21),
-                    },
-                    "nodeInstanceID": instanceId,
-                    "nodeSID": nodeId,
-                }
-            )
-
-    data["serializableNodes"].append(node)
-
-    return Node(node)
+def findPort(node: NodeRecord | str, portName, polarity):
+    """Port index on a node record, or on a fresh node of the named type."""
+    if isinstance(node, str):
+        index = nodeSpecs[node].portIndices[polarity].get(portName)
+    elif node.includePorts:
+        index = nodeSpecs[node.nodeName].portIndices[polarity].get(portName)
+    else:
+        index = None
+    if index is None:
+        raise KeyError(portName)
+    return index
 
 
-def ConnectPorts(portType: tuple | str, node0: Node, node1: Node):
-    if isinstance(portType, tuple):
-        port0 = node0.outputPorts[portType[0]]
-        port1 = node1.inputPorts[portType[1]]
-    else:
-        port0 = node0.outputPorts[portType]
-        port1 = node1.inputPorts[portType]
-    connection = {}
-    connection["id"] = f"Connection ({port0["id"]} - {port1["id"]})"
-    connection["sID"] = generateId()
-    connection["port0InstanceID"] = port0["nodeInstanceID"]
-    connection["port1InstanceID"] = port1["nodeInstanceID"]
-    connection["port0SID"] = port0["sID"]
-    connection["port1SID"] = port1["sID"]
-    connection["selectedColor"] = Color(1.0, 0.58, 0.04)
-    connection["hoverColor"] = Color(1.0, 0.81, 0.3)
-    connection["defaultColor"] = Color(0.98, 0.94, 0.84)
-    connection["curveStyle"] = 2
-    connection["label"] = ""
-    connection["line"] = {
-        "capStart": {
-            "active": False,
-            "shape": 3,
-            "size": 5.0,
-            "color": Color(1.0, 0.81, 0.3),
-            "angleOffset": 0.0,
-        },
-        "capEnd": {
-            "active": False,
-            "shape": 3,
-            "size": 5.0,
-            "color": Color(1.0, 0.81, 0.3),
-            "angleOffset": 0.0,
-        },
-        "ID": "",
-        "startWidth": 3.0,
-        "endWidth": 3.0,
-        "dashDistance": 5.0,
-        "color": Color(0.98, 0.94, 0.84),
-        "points": [
-            port0["serializableRectTransform"]["localPosition"],
-            port0["controlPointSerializableRectTransform"]["localPosition"],
-            port1["serializableRectTransform"]["localPosition"],
-            port1["controlPointSerializableRectTransform"]["localPosition"],
-        ],
-        "lineStyle": 0,
-        "length": 0,
-        "animation": {
-            "isActive": False,
-            "pointsDistance": 90.0,
-            "size": 10.0,
-            "color": port0["iconColorDefault"],
-            "shape": 1,
-            "speed": 0.0,
-        },
-    }
-    connection["enableDrag"] = True
-    connection["enableHover"] = True
-    connection["enableSelect"] = True
-    connection["disableClick"] = False
-
-    data["serializableConnections"].append(connection)
-    return connection
-
-
-def findNodeByPortSID(portSID):
-    for node in data["serializableNodes"]:
-        for port in node["serializablePorts"]:
-            if port["sID"] == portSID:
-                return node
-    return None
+def outputPortNames(record: NodeRecord):
+    if not record.includePorts:
+        return []
+    return list(nodeSpecs[record.nodeName].outputIds)
 
 
 def gridLayout(offsetX=350, offsetY=-215):
+    graph = currentGraph()
     x = 1263
     y = -278
-    nodesPerRow = max(1, int(math.sqrt(len(data["serializableNodes"]))))
+    nodesPerRow = max(1, int(math.sqrt(len(graph.nodes))))
 
-    for i, node in enumerate(data["serializableNodes"]):
-        transform = node["serializableRectTransform"]
-        if transform["localPosition"] != Position3(0, 0):
+    for i, record in enumerate(graph.nodes):
+        if record.position != ORIGIN:
             continue
-        transform["localPosition"] = Position3(x, y)
+        record.position = (x, y, 0)
         x += offsetX
         if (i + 1) % nodesPerRow == 0:
             x = 1263
@@ -577,29 +245,25 @@ def gridLayout(offsetX=350, offsetY=-215):
 
 
 def autoLayout(offsetX=350, offsetY=-215):
+    graph = currentGraph()
     adj = {}
     inDegree = {}
 
-    for node in data["serializableNodes"]:
-        adj[node["sID"]] = []
-        inDegree[node["sID"]] = 0
-
-    for conn in data["serializableConnections"]:
-        sourceNode = findNodeByPortSID(conn["port0SID"])
-        destNode = findNodeByPortSID(conn["port1SID"])
+    for record in graph.nodes:
+        adj[record] = []
+        inDegree[record] = 0
 
-        if sourceNode and destNode and sourceNode["sID"] != destNode["sID"]:
-            adj[sourceNode["sID"]].append(destNode["sID"])
-            inDegree[destNode["sID"]] += 1
+    for conn in graph.connections:
+        if conn.source is not conn.target:
+            adj[conn.source].append(conn.target)
+            inDegree[conn.target] += 1
 
     queue = deque()
-    for nodeSID, degree in inDegree.items():
+    for record, degree in inDegree.items():
         if degree == 0:
-            queue.append(nodeSID)
+            queue.append(record)
 
-    nodeRegistry = {node["sID"]: node for node in data["serializableNodes"]}
-
-    nodeLevels = {nodeSID: 0 for nodeSID in nodeRegistry.keys()}
+    nodeLevels = {record: 0 for record in graph.nodes}
     visitedCount = 0
 
     while queue:
@@ -612,15 +276,15 @@ def autoLayout(offsetX=350, offsetY=-215):
             if inDegree[v] == 0:
                 queue.append(v)
 
-    if visitedCount < len(data["serializableNodes"]):
+    if visitedCount < len(graph.nodes):
         gridLayout(offsetX, offsetY)
         return
 
     columns = {}
-    for nodeSID, level in nodeLevels.items():
+    for record, level in nodeLevels.items():
         if level not in columns:
             columns[level] = []
-        columns[level].append(nodeRegistry[nodeSID])
+        columns[level].append(record)
 
     sortedColumns = sorted(columns.items())
 
@@ -629,141 +293,91 @@ def autoLayout(offsetX=350, offsetY=-215):
         totalHeight = (len(nodesInColumn) - 1) * offsetY
         currentY = -totalHeight / 2.0 - 278
 
-        for node in nodesInColumn:
-            transform = node["serializableRectTransform"]
-            if transform["localPosition"] != Position3(0, 0):
+        for record in nodesInColumn:
+            if record.position != ORIGIN:
                 continue
-            transform["localPosition"] = Position3(currentX, currentY)
+            record.position = (currentX, currentY, 0)
             currentY += offsetY
 
         currentX += offsetX
 
 
-def updateConnectionLinePoints():
-    for connection in data["serializableConnections"]:
-        port0 = None
-        port1 = None
-
-        for node in data["serializableNodes"]:
-            for port in node["serializablePorts"]:
-                if port["sID"] == connection["port0SID"]:
-                    port0 = port
-                elif port["sID"] == connection["port1SID"]:
-                    port1 = port
-
-        if port0 and port1:
-            connection["line"]["points"] = [
-                port0["serializableRectTransform"]["localPosition"],
-                port0["controlPointSerializableRectTransform"]["localPosition"],
-                port1["serializableRectTransform"]["localPosition"],
-                port1["controlPointSerializableRectTransform"]["localPosition"],
-            ]
-
-
-def removeUnusedNodes():
-    portToNode = {}
-    nodeToPorts = {}
-    nodeIsString = {}
-
-    for node in data["serializableNodes"]:
-        node_sid = node["sID"]
-        nodeIsString[node_sid] = node["id"] == "String"
-        nodeToPorts[node_sid] = {"input": [], "output": []}
-
-        for port in node["serializablePorts"]:
-            portToNode[port["sID"]] = node_sid
-            if port["polarity"] == 0:
-                nodeToPorts[node_sid]["input"].append(port["sID"])
-            else:
-                nodeToPorts[node_sid]["output"].append(port["sID"])
-
-    connectionGraph = {}
-    portConnections = {}
-
-    for node in data["serializableNodes"]:
-        connectionGraph[node["sID"]] = {"inputs": set(), "outputs": set()}
-
-    for connection in data["serializableConnections"]:
-        sourceNode = portToNode.get(connection["port0SID"])
-        destinationNode = portToNode.get(connection["port1SID"])
-
-        if sourceNode and destinationNode and sourceNode != destinationNode:
-            connectionGraph[sourceNode]["outputs"].add(destinationNode)
-            connectionGraph[destinationNode]["inputs"].add(sourceNode)
-
-            portConnections[connection["port0SID"]] = (
-                portConnections.get(connection["port0SID"], 0) + 1
-            )
-            portConnections[connection["port1SID"]] = (
-                portConnections.get(connection["port1SID"], 0) + 1
-            )
-
-    # nodesToRemove are the BFS starting points
-    nodesToRemove = set()
-    queue = deque()
-
-    for node in data["serializableNodes"]:
-        node_sid = node["sID"]
-
-        if nodeIsString[node_sid]:
-            continue
-
-        hasInputPorts = len(nodeToPorts[node_sid]["input"]) > 0
-        hasOutputPorts = len(nodeToPorts[node_sid]["output"]) > 0
-
-        inputConnected = any(
-            portConnections.get(pid, 0) > 0 for pid in nodeToPorts[node_sid]["input"]
-        )
-
-        outputConnected = any(
-            portConnections.get(pid, 0) > 0 for pid in nodeToPorts[node_sid]["output"]
-        )
-
-        if (hasInputPorts and not inputConnected) or (
-            hasOutputPorts and not outputConnected
-        ):
-            nodesToRemove.add(node_sid)
-            queue.append(node_sid)
-
-    # BFS to find all nodes that become disconnected
-    while queue:
-        currentNode = queue.popleft()
-
-        for dependentNode in connectionGraph[currentNode]["outputs"]:
-            if dependentNode in nodesToRemove or nodeIsString[dependentNode]:
+def removeUnusedNodes(graph: Graph = None) -> Counter:
+    """
+    Remove every node that doesn't feed a sink (SlimeController, Debug, ...)
+    by marking backwards from the sinks, in O(nodes + connections). String
+    nodes and nodes without ports are never connected, so they are kept.
+    Returns the number of removed nodes per node type.
+    """
+    if graph is None:
+        graph = currentGraph()
+
+    inputs = {record: [] for record in graph.nodes}
+    for connection in graph.connections:
+        inputs[connection.target].append(connection.source)
+
+    live = set()
+    stack = [
+        record
+        for record in graph.nodes
+        if outputs[record.nodeName] is None
+        or record.nodeName == "String"
+        or not record.includePorts
+    ]
+    while stack:
+        record = stack.pop()
+        if record not in live:
+            live.add(record)
+            stack.extend(inputs[record])
+
+    removed = [record for record in graph.nodes if record not in live]
+    if removed:
+        graph.forgetNodes(set(removed))
+        # a live target keeps its sources alive, so checking it is enough
+        graph.connections = [
+            connection for connection in graph.connections if connection.target in live
+        ]
+        graph.nodes = [record for record in graph.nodes if record in live]
+
+    return Counter(record.nodeName for record in removed)
+
+
+def LoadData(filePath) -> list[Node]:
+    """
+    Add the nodes and connections of a saved bot to the current graph and
+    return a handle for each loaded node, in file order. Loaded nodes keep
+    their sIDs and positions; builders reuse them like nodes built in this
+    script, so a script can extend or edit an existing bot before saving it
+    again with SaveData.
+    """
+    graph = currentGraph()
+    with open(filePath) as f:
+        document = json.load(f)
+
+    return indexLoadedNodes(graph, readDocument(document, graph))
+
+
+def indexLoadedNodes(graph: Graph, records) -> list[Node]:
+    """
+    Make loaded nodes reusable by builders: value number them and continue
+    the debug counter after them. Returns a handle per record.
+    """
+    graph.debugCounter += sum(record.nodeName == "Debug" for record in records)
+
+    if graph.hashConsing:
+        inputs = {record: [] for record in records}
+        for connection in graph.connections:
+            if connection.target in inputs:
+                inputs[connection.target].append(
+                    (connection.source, connection.sourcePort, connection.targetPort)
+                )
+        for record in records:
+            if outputs[record.nodeName] is None or record.nodeName == "RandomFloat":
                 continue
+            key = valueKey(record.nodeName, record.modifier, inputs[record])
+            graph.valueNumbers.setdefault(key, record)
 
-            if all(
-                src in nodesToRemove for src in connectionGraph[dependentNode]["inputs"]
-            ):
-                nodesToRemove.add(dependentNode)
-                queue.append(dependentNode)
-
-        for sourceNode in connectionGraph[currentNode]["inputs"]:
-            if sourceNode in nodesToRemove or nodeIsString[sourceNode]:
-                continue
-
-            if all(
-                dst in nodesToRemove for dst in connectionGraph[sourceNode]["outputs"]
-            ):
-                nodesToRemove.add(sourceNode)
-                queue.append(sourceNode)
-
-    activeConnections = []
-    for connection in data["serializableConnections"]:
-        sourceNode = portToNode.get(connection["port0SID"])
-        destinationNode = portToNode.get(connection["port1SID"])
-
-        if sourceNode not in nodesToRemove and destinationNode not in nodesToRemove:
-            activeConnections.append(connection)
-    data["serializableConnections"] = activeConnections
-
-    activeNodes = []
-    for node in data["serializableNodes"]:
-        node_sid = node["sID"]
-        if node_sid not in nodesToRemove or nodeIsString[node_sid]:
-            activeNodes.append(node)
-    data["serializableNodes"] = activeNodes
+    return [Node(record) for record in records]
 
 
 def SaveData(
@@ -771,30 +385,174 @@ def SaveData(
     layout: Literal["auto", "grid", "single", "hidden", None] = "auto",
     pruneUnusedNodes=True,
     keepPosition=True,
+    optimize=False,
+    backend: Literal["json", "orjson", None] = None,
+    stats=None,
 ):
+    """
+    `stats` is a SaveStats to fill with the time spent in each phase, or a
+    callable called with one once the file is written.
+    """
+    graph = currentGraph()
+    saveStats = stats if isinstance(stats, SaveStats) else SaveStats()
+    saveStats.filePath = os.path.abspath(filePath)
+    saveStats.layout = layout
+
+    report = None
+    if optimize:
+        with saveStats.phase("optimize"):
+            report = optimizeGraph(graph)
+
+    saveStats.nodesBefore = len(graph.nodes)
+    saveStats.connectionsBefore = len(graph.connections)
     if pruneUnusedNodes:
-        removeUnusedNodes()
-
-    match layout:
-        case "auto":
-            autoLayout()
-        case "grid":
-            gridLayout()
-        case "single":
-            for node in data["serializableNodes"]:
-                transform = node["serializableRectTransform"]
-                if transform["localPosition"] != Position3(0, 0) and keepPosition:
-                    continue
-                transform["localPosition"] = Position3(0, 0)
-        case "hidden":
-            for node in data["serializableNodes"]:
-                transform = node["serializableRectTransform"]
-                if transform["localPosition"] != Position3(0, 0) and keepPosition:
-                    continue
-                transform["localPosition"] = Position3(9999, 9999)
-                transform["scale"] = Position3(0, 0)
-
-    updateConnectionLinePoints()
-
-    with open(filePath, "w") as f:
-        json.dump(data, f, separators=(",", ":"))
+        with saveStats.phase("prune"):
+            removeUnusedNodes()
+    saveStats.nodesAfter = len(graph.nodes)
+    saveStats.connectionsAfter = len(graph.connections)
+
+    with saveStats.phase("layout"):
+        match layout:
+            case "auto":
+                autoLayout()
+            case "grid":
+                gridLayout()
+            case "single":
+                for record in graph.nodes:
+                    if record.position != ORIGIN and keepPosition:
+                        continue
+                    record.position = ORIGIN
+            case "hidden":
+                for record in graph.nodes:
+                    if record.position != ORIGIN and keepPosition:
+                        continue
+                    record.position = (9999, 9999, 0)
+                    record.scale = (0, 0, 0)
+
+    with saveStats.phase("assignIds"):
+        assignIds(graph)
+    with saveStats.phase("write"):
+        with openForWriting(filePath) as f:
+            writeDocument(f, graph, backend and getBackend(backend))
+    traceFilePath = None
+    if graph.trace is not None:
+        traceFilePath = os.path.abspath(f"{filePath}.trace.json")
+        with saveStats.phase("trace"):
+            graph.trace.write(traceFilePath)
+
+    if callable(stats):
+        stats(saveStats)
+    emitSaveStats(saveStats)
+
+    log = saveLog.get()
+    if log is not None:
+        log.append(
+            {
+                "filePath": os.path.abspath(filePath),
+                "traceFilePath": traceFilePath,
+                "layout": layout,
+                "pruneUnusedNodes": pruneUnusedNodes,
+                "keepPosition": keepPosition,
+                "optimize": optimize,
+                "nodes": len(graph.nodes),
+                "connections": len(graph.connections),
+            }
+        )
+
+    return report
+
+
+def operatorTable():
+    """
+    Every operand combination the Node operators support, mapped to the
+    builder it lowers to. Builders are called with (self, other), so the
+    reflected operators swap the arguments back where order matters.
+    Operand types are read from the input ports of each node type.
+    """
+    portTypes = {"Float": float, "Bool": bool, "Vector3": "Vector3"}
+
+    def signature(nodeName):
+        return tuple(portTypes[t] for t in nodeSpecs[nodeName].inputTypes)
+
+    def floor(node):
+        return nodes.Operation(node, "floor")
+
+    def swapped(builder):
+        return lambda node, other: builder(other, node)
+
+    def comparison(builder, value):
+        return lambda node, other: builder(node, other, value)
+
+    table = {}
+    for operator, reflected, nodeName, builder in [
+        ("add", "radd", "AddFloats", nodes.AddFloats),
+        ("add", "radd", "AddVector3", nodes.AddVector3),
+        ("mul", "rmul", "MultiplyFloats", nodes.MultiplyFloats),
+        ("matmul", "rmatmul", "DotProduct", nodes.DotProduct),
+    ]:
+        # commutative: a + b and b + a both build builder(node, other)
+        table[operator, *signature(nodeName)] = builder
+        table[reflected, *signature(nodeName)] = builder
+
+    vector, scale = signature("ScaleVector3")
+    for operator in ["mul", "rmul"]:
+        table[operator, vector, scale] = nodes.ScaleVector3
+        table[operator, scale, vector] = swapped(nodes.ScaleVector3)
+
+    for operator, reflected, operands, builder in [
+        ("sub", "rsub", signature("SubtractFloats"), nodes.SubtractFloats),
+        ("sub", None, signature("SubtractVector3"), nodes.SubtractVector3),
+        ("truediv", "rtruediv", signature("DivideFloats"), nodes.DivideFloats),
+        (
+            "floordiv",
+            "rfloordiv",
+            signature("DivideFloats"),
+            lambda node, other: floor(nodes.DivideFloats(node, other)),
+        ),
+        ("mod", "rmod", signature("Modulo"), nodes.Modulo),
+        # Power is a custom node, built from nodes of other types
+        ("pow", "rpow", (float, float), customNodes.Power),
+    ]:
+        table[operator, *operands] = builder
+        if reflected is not None:
+            table[reflected, *operands] = swapped(builder)
+
+    for operator, value in [("lt", "<"), ("le", "<="), ("gt", ">"), ("ge", ">=")]:
+        table[operator, *signature("CompareFloats")] = comparison(
+            nodes.CompareFloats, value
+        )
+    table["eq", *signature("CompareFloats")] = nodes.CompareFloats
+    table["eq", *signature("CompareBool")] = nodes.CompareBool
+    table["ne", *signature("CompareFloats")] = lambda node, other: nodes.Not(
+        nodes.CompareFloats(node, other)
+    )
+    table["ne", *signature("CompareBool")] = lambda node, other: nodes.Not(
+        nodes.CompareBool(node, other)
+    )
+
+    for operator, reflected, value in [
+        ("and", "rand", "and"),
+        ("or", "ror", "or"),
+        ("xor", "rxor", "xor"),
+    ]:
+        table[operator, *signature("CompareBool")] = comparison(
+            nodes.CompareBool, value
+        )
+        table[reflected, *signature("CompareBool")] = swapped(
+            comparison(nodes.CompareBool, value)
+        )
+
+    (number,) = signature("Operation")
+    table["neg", number, None] = lambda node: nodes.MultiplyFloats(node, -1)
+    table["abs", number, None] = lambda node: nodes.Operation(node, "abs")
+    (boolean,) = signature("Not")
+    table["invert", boolean, None] = nodes.Not
+    return table
+
+
+# Imported last: these modules import this one. The package imports lib
+# first, so both are fully loaded by the time the table is built.
+from . import customNodes, nodes  # noqa: E402
+
+for (name, left, right), builder in operatorTable().items():
+    operators[name].setdefault(left, {})[right] = builder
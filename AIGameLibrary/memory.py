@@ -0,0 +1,201 @@
+import sys
+import tracemalloc
+
+from .graph import BuilderCache, ConnectionRecord, Graph, NodeRecord, currentGraph
+from .lib import Node
+from .profiling import saveStatsLog, startPeak, tracedPeak
+
+# node and connection records are counted under their own category, so other
+# objects referencing them don't count them again
+RECORDS = (NodeRecord, ConnectionRecord)
+
+
+def sizeOf(value, seen):
+    """
+    Bytes used by `value` and the containers and values it holds. Each object
+    is counted once per `seen` set, so shared strings and tuples only count
+    where they are first found. Node handles are counted without the record
+    they point to, and classes (cache keys hold argument types) not at all.
+    """
+    if id(value) in seen or isinstance(value, RECORDS) or isinstance(value, type):
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list, set, frozenset)):
+        size += sum(sizeOf(item, seen) for item in value)
+    elif isinstance(value, dict):
+        size += sum(
+            sizeOf(key, seen) + sizeOf(item, seen) for key, item in value.items()
+        )
+    elif isinstance(value, BuilderCache):
+        size += sizeOf(value.entries, seen)
+    elif isinstance(value, Node):
+        size += sizeOf(value.outputIndex, seen)
+    return size
+
+
+def recordSize(record, fields, seen):
+    seen.add(id(record))
+    return sys.getsizeof(record) + sum(
+        sizeOf(getattr(record, field), seen) for field in fields
+    )
+
+
+def graphMemory(graph: Graph = None):
+    """
+    Bytes used by the graph, measured with sys.getsizeof: per node type (as
+    in `data.outputs`) the number of nodes and their bytes, the same for
+    connections, and per builder cache (`graph.cacheStore`) its entries and
+    bytes. The value numbers used for hash consing are listed apart.
+    """
+    if graph is None:
+        graph = currentGraph()
+    seen = set()
+
+    nodeFields = [field for field in NodeRecord.__slots__ if field != "graph"]
+    nodeTypes = {}
+    for record in graph.nodes:
+        count, size = nodeTypes.get(record.nodeName, (0, 0))
+        nodeTypes[record.nodeName] = (
+            count + 1,
+            size + recordSize(record, nodeFields, seen),
+        )
+
+    connectionFields = ["sourcePort", "targetPort", "startWidth", "sID"]
+    connectionSize = sum(
+        recordSize(connection, connectionFields, seen)
+        for connection in graph.connections
+    )
+
+    return {
+        "nodeTypes": dict(
+            sorted(nodeTypes.items(), key=lambda item: item[1][1], reverse=True)
+        ),
+        "connections": (len(graph.connections), connectionSize),
+        "caches": dict(
+            sorted(
+                (
+                    (builderName, (len(store), sizeOf(store, seen)))
+                    for builderName, store in graph.caches.items()
+                ),
+                key=lambda item: item[1][1],
+                reverse=True,
+            )
+        ),
+        "valueNumbers": (len(graph.valueNumbers), sizeOf(graph.valueNumbers, seen)),
+    }
+
+
+class MemoryProfile:
+    """
+    tracemalloc snapshots around building a graph and saving it:
+
+        with MemoryProfile() as profile:
+            SlimeController(Ball.Position, Self.CanJump)
+            SaveData("bot.txt")
+        print(profile)
+
+    Building is measured up to the first SaveData call; the memory each
+    SaveData phase needs is in the SaveStats of `profile.saves`. On exit the
+    graph is measured with graphMemory, and the lines that allocated the most
+    memory are kept in `profile.topLines`.
+    """
+
+    def __init__(self, graph: Graph = None, frames=1):
+        self.graph = graph
+        self.frames = frames
+        self.saves = []
+        self.memoryBefore = 0
+        self.built = 0
+        self.allocated = 0
+        self.peak = 0
+        self.topLines = []
+        self.sizes = None
+
+    def __enter__(self):
+        if self.graph is None:
+            self.graph = currentGraph()
+        self.startedTracing = not tracemalloc.is_tracing()
+        if self.startedTracing:
+            tracemalloc.start(self.frames)
+        self.token = saveStatsLog.set(self.saves)
+        self.before = tracemalloc.take_snapshot()
+        self.memoryBefore = tracemalloc.get_traced_memory()[0]
+        startPeak()
+        return self
+
+    def __exit__(self, *exc):
+        memoryAfter = tracemalloc.get_traced_memory()[0]
+        self.peak = tracedPeak() - self.memoryBefore
+        after = tracemalloc.take_snapshot()
+        saveStatsLog.reset(self.token)
+        if self.startedTracing:
+            tracemalloc.stop()
+
+        self.allocated = memoryAfter - self.memoryBefore
+        if self.saves:
+            self.built = self.saves[0].memoryBefore - self.memoryBefore
+        else:
+            self.built = self.allocated
+
+        ignored = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        self.topLines = after.filter_traces(ignored).compare_to(
+            self.before.filter_traces(ignored), "lineno"
+        )
+        self.before = None
+        self.sizes = graphMemory(self.graph)
+        return False
+
+    def toDict(self, limit=20):
+        return {
+            "built": self.built,
+            "allocated": self.allocated,
+            "peak": self.peak,
+            "saves": [
+                {"filePath": stats.filePath, "memory": dict(stats.memory)}
+                for stats in self.saves
+            ],
+            "topLines": [
+                {
+                    "line": str(stat.traceback[0]),
+                    "sizeDiff": stat.size_diff,
+                    "countDiff": stat.count_diff,
+                }
+                for stat in self.topLines[:limit]
+            ],
+            **self.sizes,
+        }
+
+    def report(self, limit=10):
+        lines = [
+            f"built {self.built / 1024:.1f} KiB, {self.allocated / 1024:.1f} KiB "
+            f"allocated overall, peak {self.peak / 1024:.1f} KiB"
+        ]
+        for stats in self.saves:
+            phases = ", ".join(
+                f"{name} {size / 1024:.1f} KiB" for name, size in stats.memory.items()
+            )
+            lines.append(f"SaveData {stats.filePath}: {phases}")
+
+        lines.append("nodes:")
+        for nodeName, (count, size) in list(self.sizes["nodeTypes"].items())[:limit]:
+            lines.append(f"  {size / 1024:>10.1f} KiB {count:>8}  {nodeName}")
+        count, size = self.sizes["connections"]
+        lines.append(
+            f"connections: {size / 1024:.1f} KiB for {count}"
+            f" ({size / max(count, 1):.0f} bytes each)"
+        )
+        lines.append("caches:")
+        for builderName, (count, size) in self.sizes["caches"].items():
+            lines.append(f"  {size / 1024:>10.1f} KiB {count:>8}  {builderName}")
+        count, size = self.sizes["valueNumbers"]
+        lines.append(f"value numbers: {size / 1024:.1f} KiB for {count}")
+
+        lines.append("top allocations:")
+        for stat in self.topLines[:limit]:
+            lines.append(f"  {stat.size_diff / 1024:>10.1f} KiB  {stat.traceback[0]}")
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.report()
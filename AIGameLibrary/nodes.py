@@ -1,8 +1,35 @@
 import numbers
-from typing import Literal
 
-from .data import colorNames, countryNames
-from .lib import AddNode, ConnectPorts, Node, SaveData, data
+from .data import (
+    boolProperties,
+    colorNames,
+    compareBoolModes,
+    compareFloatsModes,
+    countryNames,
+    floatProperties,
+    operationModes,
+    relativePositions,
+    transformNames,
+    vector3Properties,
+)
+from .evaluate import Evaluation, GameState, TransformState, evaluateGraph
+from .graph import MISSING, Graph, currentGraph
+from .ids import ContentIds, CounterIds, RandomIds
+from .ir import LoadIR, SaveIR
+from .lib import (
+    AddNode,
+    ConnectPorts,
+    LoadData,
+    Node,
+    SaveData,
+    addNodeWithInputs,
+    checkGraph,
+    outputPortNames,
+)
+from .memory import MemoryProfile, graphMemory
+from .optimize import OptimizationReport, optimizeGraph
+from .profiling import SaveStats, Trace
+from .specs import NodeSpec, nodeSpecs
 from .utils import Color, Position3
 
 
@@ -27,22 +54,51 @@ def parseLiteral(value):
     return value
 
 
+def cacheKey(value):
+    """
+    The identity of one builder argument. Nodes are keyed on the record they
+    point to rather than a hash, so different arguments never share a key;
+    other values are keyed on their type too, so 1 and True stay apart.
+    Tuples and lists are keyed item by item, so Nodes inside them are keyed
+    on their records as well and never compared with Node.__eq__.
+    """
+    if isinstance(value, Node):
+        return value.record, value.outputIndex
+    if isinstance(value, (tuple, list)):
+        return type(value), tuple(map(cacheKey, value))
+    return type(value), value
+
+
 def cache(function):
-    cachedNodes = {}
+    builderName = function.__name__
 
     def wrapper(*args, **kwargs):
         disableCache = kwargs.pop("disableCache", False)
-        cacheArgs = tuple(hash(arg) for arg in args)
-
         if disableCache:
-            return function(*args)
-
-        if cacheArgs not in cachedNodes:
-            cachedNodes[cacheArgs] = function(*args)
-
-        return cachedNodes[cacheArgs]
-
-    wrapper.cacheStore = cachedNodes
+            return function(*args, **kwargs)
+
+        key = tuple(map(cacheKey, args))
+        if kwargs:
+            key += tuple((name, cacheKey(kwargs[name])) for name in sorted(kwargs))
+
+        # each graph keeps its own cache, so nodes never leak between bots
+        graph = currentGraph()
+        cachedNodes = graph.cacheStore(builderName)
+        try:
+            result = cachedNodes.lookup(key)
+        except TypeError:
+            # unhashable arguments can't be cached
+            return function(*args, **kwargs)
+        if graph.trace is not None:
+            graph.trace.cacheLookup(builderName, result is not MISSING)
+
+        if result is MISSING:
+            result = function(*args, **kwargs)
+            cachedNodes.store(key, result)
+
+        return result
+
+    wrapper.builderName = builderName
     return wrapper
 
 
@@ -219,84 +275,56 @@ def InitializeSlime(
 
 @cache
 def AddVector3(node0: Node, node1: Node):
-    baseNode = AddNode("AddVector3")
-    inputTypes = ["Vector3", "Vector3"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+    return buildNode("AddVector3", node0, node1)
 
 
 @cache
 def AddFloats(node0: Node, node1: Node):
-    baseNode = AddNode("AddFloats")
-    inputTypes = ["Float", "Float"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+    return buildNode("AddFloats", node0, node1)
 
 
 @cache
 def Bool(value: bool):
-    return AddNode("Bool", "0" if value else "1")
+    return AddNode("Bool", "0" if value else "1", inputs=[])
 
 
 @cache
 def ClampFloat(node0: Node, node1: Node, node2: Node):
-    baseNode = AddNode("ClampFloat")
-    inputTypes = ["Float", "Float", "Float"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1, node2])
-    return baseNode
+    return buildNode("ClampFloat", node0, node1, node2)
 
 
 @cache
 def Color(value: colorNames):
-    return AddNode("Color", value)
+    return AddNode("Color", value, inputs=[])
 
 
 @cache
 def Vector3(node0: Node, node1: Node, node2: Node):
-    baseNode = AddNode("ConstructVector3")
-    inputTypes = ["Float", "Float", "Float"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1, node2])
-    return baseNode
+    return buildNode("ConstructVector3", node0, node1, node2)
 
 
 @cache
-def CompareBool(
-    node0: Node,
-    node1: Node,
-    value: Literal["and", "or", "equal to", "xor", "nor", "nand", "xnor"] = "and",
-):
-    value = ["and", "or", "equal to", "xor", "nor", "nand", "xnor"].index(value)
-    baseNode = AddNode("CompareBool", value)
-    inputTypes = ["Bool", "Bool"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+def CompareBool(node0: Node, node1: Node, value: compareBoolModes = "and"):
+    return buildNode("CompareBool", node0, node1, value=value)
 
 
 @cache
-def CompareFloats(
-    node0: Node, node1: Node, value: Literal["==", "<", ">", "<=", ">="] = "=="
-):
-    value = ["==", "<", ">", "<=", ">="].index(value)
-    baseNode = AddNode("CompareFloats", value)
-    inputTypes = ["Float", "Float"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+def CompareFloats(node0: Node, node1: Node, value: compareFloatsModes = "=="):
+    return buildNode("CompareFloats", node0, node1, value=value)
 
 
 @cache
 def ConditionalSetFloat(node0: Node, node1: Node, node2: Node, value: bool = True):
-    baseNode = AddNode("ConditionalSetFloatV2", "0" if value else "1")
-    inputTypes = ["Bool", "Float", "Float"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1, node2])
-    return baseNode
+    return buildNode(
+        "ConditionalSetFloatV2", node0, node1, node2, value="0" if value else "1"
+    )
 
 
 @cache
 def ConditionalSetVector3(node0: Node, node1: Node, node2: Node, value: bool = True):
-    baseNode = AddNode("ConditionalSetVector3", "0" if value else "1")
-    inputTypes = ["Bool", "Vector3", "Vector3"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1, node2])
-    return baseNode
+    return buildNode(
+        "ConditionalSetVector3", node0, node1, node2, value="0" if value else "1"
+    )
 
 
 @cache
@@ -308,49 +336,37 @@ def ConstructSlimeProperties(
     node4: Node,
     node5: Node,
 ):
-    baseNode = AddNode("ConstructSlimeProperties")
-    inputTypes = ["String", "Color", "Country", "Stat", "Stat", "Stat"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1, node2, node3, node4, node5])
-    return baseNode
+    return buildNode(
+        "ConstructSlimeProperties", node0, node1, node2, node3, node4, node5
+    )
 
 
 @cache
 def SlimeController(node0: Node, node1: Node):
-    baseNode = AddNode("SlimeController")
-    inputTypes = ["Vector3", "Bool"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+    return buildNode("SlimeController", node0, node1)
 
 
 @cache
 def Country(value: countryNames):
-    return AddNode("Country", value)
+    return AddNode("Country", value, inputs=[])
 
 
 @cache
 def CrossProduct(node0: Node, node1: Node):
-    baseNode = AddNode("CrossProduct")
-    inputTypes = ["Vector3", "Vector3"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
-
-
-debugCounter = 0
+    return buildNode("CrossProduct", node0, node1)
 
 
 def Debug(inputData, string: str = None, changePosition=True):
-    global debugCounter
+    graph = currentGraph()
 
     if changePosition:
         # magic numbers for position gotten via
         # snappedX = (20 + x) * 64 - 17
         # snappedY = -(4 + y) * 64 - 22
         xPos = 1263 - 64 * 6
-        yPos = -278 - 64 * 4 * debugCounter
+        yPos = -278 - 64 * 4 * graph.debugCounter
         baseNode = AddNode("Debug", position=Position3(xPos, yPos - 55))
-        data["serializableNodes"][-1]["serializablePorts"][0][
-            "serializableRectTransform"
-        ]["scale"] = Position3(0, 0)
+        baseNode.record.hiddenPorts = (0,)
         if string is not None:
             AddNode(
                 "String", string, includePorts=False, position=Position3(xPos, yPos)
@@ -361,7 +377,7 @@ def Debug(inputData, string: str = None, changePosition=True):
         if string is not None:
             AddNode("String", string, includePorts=False)
 
-    debugCounter += 1
+    graph.debugCounter += 1
 
     if isinstance(inputData, tuple):
         inputNode = parseLiteral(inputData[0])
@@ -370,270 +386,116 @@ def Debug(inputData, string: str = None, changePosition=True):
         inputNode = parseLiteral(inputData)
         num = inputNode.outputIndex
 
-    ports = [
-        port["id"]
-        for port in inputNode.data["serializablePorts"]
-        if port["polarity"] != 0
-    ]
-    portName = ports[num - 1]
-    ConnectPorts((portName, "Any1"), inputNode, baseNode)
-    data["serializableConnections"][-1]["line"]["startWidth"] = 0  # invisible line
+    portName = outputPortNames(inputNode.record)[num - 1]
+    connection = ConnectPorts((portName, "Any1"), inputNode, baseNode)
+    connection.startWidth = 0  # invisible line
 
     return baseNode
 
 
 def DebugDrawLine(node0: Node, node1: Node, node2: Node, node3: colorNames):
-    baseNode = AddNode("DebugDrawLine")
-    inputTypes = ["Vector3", "Vector3", "Float", "Color"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1, node2, node3])
-    return baseNode
+    return buildNode("DebugDrawLine", node0, node1, node2, node3)
 
 
 def DebugDrawDisc(node0: Node, node1: Node, node2: Node, node3: colorNames):
-    baseNode = AddNode("DebugDrawDisc")
-    inputTypes = ["Vector3", "Float", "Float", "Color"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1, node2, node3])
-    return baseNode
+    return buildNode("DebugDrawDisc", node0, node1, node2, node3)
 
 
 @cache
 def Distance(node0: Node, node1: Node):
-    baseNode = AddNode("Distance")
-    inputTypes = ["Vector3", "Vector3"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+    return buildNode("Distance", node0, node1)
 
 
 @cache
 def DivideFloats(node0: Node, node1: Node):
-    baseNode = AddNode("DivideFloats")
-    inputTypes = ["Float", "Float"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+    return buildNode("DivideFloats", node0, node1)
 
 
 @cache
 def DotProduct(node0: Node, node1: Node):
-    baseNode = AddNode("DotProduct")
-    inputTypes = ["Vector3", "Vector3"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+    return buildNode("DotProduct", node0, node1)
 
 
 @cache
 def Float(value: int | float | str):
-    return AddNode("Float", str(value))
+    return AddNode("Float", str(value), inputs=[])
 
 
 @cache
-def GetBool(value: Literal["Self Can Jump", "Opponent Can Jump", "Ball Is Self Side"]):
-    value = ["Self Can Jump", "Opponent Can Jump", "Ball Is Self Side"].index(value)
-    return AddNode("VolleyballGetBool", value)
+def GetBool(value: boolProperties):
+    return buildNode("VolleyballGetBool", value=value)
 
 
 @cache
 def GetFloat(
-    value: Literal[
-        "Delta time",
-        "Fixed delta time",
-        "Gravity",
-        "Pi",
-        "Simulation duration",
-        "Team score",
-        "Opponent score",
-        "Ball touches remaining",
-    ],
+    value: floatProperties,
 ):
-    value = [
-        "Delta time",
-        "Fixed delta time",
-        "Gravity",
-        "Pi",
-        "Simulation duration",
-        "Team score",
-        "Opponent score",
-        "Ball touches remaining",
-    ].index(value)
-    return AddNode("VolleyballGetFloat", value)
+    return buildNode("VolleyballGetFloat", value=value)
 
 
 @cache
 def GetTransform(
-    value: Literal[
-        "Self", "Opponent", "Ball", "Self Team Spawn", "Opponent Team Spawn"
-    ],
+    value: transformNames,
 ):
-    value = [
-        "Self",
-        "Opponent",
-        "Ball",
-        "Self Team Spawn",
-        "Opponent Team Spawn",
-    ].index(value)
-    return AddNode("VolleyballGetTransform", value)
+    return buildNode("VolleyballGetTransform", value=value)
 
 
 @cache
 def GetVector3(
-    value: Literal[
-        "Self Position",
-        "Self Velocity",
-        "Ball Position",
-        "Ball Velocity",
-        "Opponent Position",
-        "Opponent Velocity",
-    ],
+    value: vector3Properties,
 ):
-    value = [
-        "Self Position",
-        "Self Velocity",
-        "Ball Position",
-        "Ball Velocity",
-        "Opponent Position",
-        "Opponent Velocity",
-    ].index(value)
-    return AddNode("SlimeGetVector3", value)
+    return buildNode("SlimeGetVector3", value=value)
 
 
 @cache
 def Magnitude(node0: Node):
-    baseNode = AddNode("Magnitude")
-    inputTypes = ["Vector3"]
-    connectInputNodes(baseNode, inputTypes, [node0])
-    return baseNode
+    return buildNode("Magnitude", node0)
 
 
 @cache
 def Modulo(node0: Node, node1: Node):
-    baseNode = AddNode("Modulo")
-    inputTypes = ["Float", "Float"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+    return buildNode("Modulo", node0, node1)
 
 
 @cache
 def MultiplyFloats(node0: Node, node1: Node):
-    baseNode = AddNode("MultiplyFloats")
-    inputTypes = ["Float", "Float"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+    return buildNode("MultiplyFloats", node0, node1)
 
 
 @cache
 def Not(node0: Node):
-    baseNode = AddNode("Not")
-    inputTypes = ["Bool"]
-    connectInputNodes(baseNode, inputTypes, [node0])
-    return baseNode
+    return buildNode("Not", node0)
 
 
 @cache
 def Normalize(node0: Node):
-    baseNode = AddNode("Normalize")
-    inputTypes = ["Vector3"]
-    connectInputNodes(baseNode, inputTypes, [node0])
-    return baseNode
+    return buildNode("Normalize", node0)
 
 
 @cache
 def Operation(
     node0: Node,
-    value: Literal[
-        "abs",
-        "round",
-        "floor",
-        "ceil",
-        "sin",
-        "cos",
-        "tan",
-        "asin",
-        "acos",
-        "atan",
-        "sqrt",
-        "sign",
-        "ln",
-        "log10",
-        "e^",
-        "10^",
-    ],
+    value: operationModes,
 ):
-    value = [
-        "abs",
-        "round",
-        "floor",
-        "ceil",
-        "sin",
-        "cos",
-        "tan",
-        "asin",
-        "acos",
-        "atan",
-        "sqrt",
-        "sign",
-        "ln",
-        "log10",
-        "e^",
-        "10^",
-    ].index(value)
-    baseNode = AddNode("Operation", value)
-    inputTypes = ["Float"]
-    connectInputNodes(baseNode, inputTypes, [node0])
-    return baseNode
+    return buildNode("Operation", node0, value=value)
 
 
 @cache
 def RelativePosition(
     node0: Node,
-    value: Literal[
-        "Self",
-        "Self + Forward",
-        "Self + Backward",
-        "Self + Left",
-        "Self + Right",
-        "Self + Up",
-        "Self + Down",
-        "Forward",
-        "Backward",
-        "Left",
-        "Right",
-        "Up",
-        "Down",
-    ],
+    value: relativePositions,
 ):
-    value = [
-        "Self",
-        "Self + Forward",
-        "Self + Backward",
-        "Self + Left",
-        "Self + Right",
-        "Self + Up",
-        "Self + Down",
-        "Forward",
-        "Backward",
-        "Left",
-        "Right",
-        "Up",
-        "Down",
-    ].index(value)
-    baseNode = AddNode("RelativePosition", value)
-    inputTypes = ["Transform"]
-    connectInputNodes(baseNode, inputTypes, [node0])
-    return baseNode
+    return buildNode("RelativePosition", node0, value=value)
 
 
 def RandomFloat(node0: Node, node1: Node):
-    baseNode = AddNode("RandomFloat")
-    inputTypes = ["Float", "Float"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+    # every RandomFloat draws its own value, so it must never be shared
+    return buildNode("RandomFloat", node0, node1, intern=False)
 
 
 @cache
 def ScaleVector3(node0: Node, node1: Node):
-    baseNode = AddNode("ScaleVector3")
-    inputTypes = ["Vector3", "Float"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+    return buildNode("ScaleVector3", node0, node1)
 
 
 class Vector3Components:
@@ -645,68 +507,74 @@ class Vector3Components:
     def __getitem__(self, index):
         return [self.x, self.y, self.z][index]
 
+    @property
+    def record(self):
+        # the Vector3Split node all three components come from
+        return self.x.record
+
 
 @cache
 def Vector3Split(node0: Node):
-    baseNode = AddNode("Vector3Split")
-    inputTypes = ["Vector3"]
-    connectInputNodes(baseNode, inputTypes, [node0])
-    return Vector3Components(baseNode, Node(baseNode.data, 2), Node(baseNode.data, 3))
+    baseNode = buildNode("Vector3Split", node0)
+    return Vector3Components(
+        baseNode, Node(baseNode.record, 2), Node(baseNode.record, 3)
+    )
 
 
 @cache
 def Stat(value: int | str):
-    return AddNode("Stat", str(value))
+    return AddNode("Stat", str(value), inputs=[])
 
 
 @cache
 def String(value: str):
-    return AddNode("String", value)
+    return AddNode("String", value, inputs=[])
 
 
 @cache
 def SubtractFloats(node0: Node, node1: Node):
-    baseNode = AddNode("SubtractFloats")
-    inputTypes = ["Float", "Float"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
+    return buildNode("SubtractFloats", node0, node1)
 
 
 @cache
 def SubtractVector3(node0: Node, node1: Node):
-    baseNode = AddNode("SubtractVector3")
-    inputTypes = ["Vector3", "Vector3"]
-    connectInputNodes(baseNode, inputTypes, [node0, node1])
-    return baseNode
-
-
-def connectInputNodes(baseNode, inputTypes, inputs):
-    counters = {}
-
-    for inputType, inputData in zip(inputTypes, inputs):
-        num1 = 1
-
-        if isinstance(inputData, Node):
-            num1 = inputData.outputIndex
-
+    return buildNode("SubtractVector3", node0, node1)
+
+
+def buildNode(nodeName, *inputs, value="", intern=True):
+    """
+    Add a `nodeName` node fed by `inputs` in argument order, or return an
+    identical existing one. An input is a node, a (node, output index)
+    tuple, a literal for parseLiteral, or None to leave the port free.
+    Enum modifiers are given by name.
+    """
+    spec = nodeSpecs[nodeName]
+    if spec.modifiers is not None:
+        value = spec.modifier(value)
+
+    graph = currentGraph()
+    edges = []
+    for inputType, targetPort, inputData in zip(
+        spec.inputTypes, spec.inputPorts, inputs
+    ):
+        if inputData is None:
+            continue
         if isinstance(inputData, tuple):
-            inputNode = inputData[0]
-            num1 = inputData[1]
+            inputNode, outputIndex = inputData
+            inputNode = parseLiteral(inputNode)
         else:
-            inputNode = inputData
-
-        inputNode = parseLiteral(inputNode)
-
-        if inputType not in counters:
-            counters[inputType] = 1
-        num2 = counters[inputType]
-        counters[inputType] += 1
-
-        portName1 = f"{inputType}{num1}"
-        portName2 = f"{inputType}{num2}"
-        if isinstance(inputType, tuple):
-            portName1 = f"{inputType[0]}{num1}"
-            portName2 = f"{inputType[1]}{num2}"
-
-        if inputData is not None:
-            ConnectPorts((portName1, portName2), inputNode, baseNode)
+            inputNode = parseLiteral(inputData)
+            outputIndex = inputData.outputIndex if isinstance(inputData, Node) else 1
+        checkGraph(graph, inputNode)
+
+        record = inputNode.record
+        sourceSpec = nodeSpecs[record.nodeName]
+        if (
+            not record.includePorts
+            or not 0 < outputIndex <= len(sourceSpec.outputPorts)
+            or sourceSpec.outputTypes[outputIndex - 1] != inputType
+        ):
+            raise KeyError(f"{inputType}{outputIndex}")
+        edges.append((record, sourceSpec.outputPorts[outputIndex - 1], targetPort))
+
+    return addNodeWithInputs(graph, nodeName, value, edges, intern=intern)
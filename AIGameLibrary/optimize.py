@@ -0,0 +1,537 @@
+import math
+from collections import deque
+
+from .data import outputs, ports
+from .graph import Graph, currentGraph, valueKey
+
+
+class OptimizationReport:
+    def __init__(self, nodesBefore):
+        self.nodesBefore = nodesBefore
+        self.nodesAfter = nodesBefore
+        self.folded = 0
+        self.simplified = 0
+        self.coalesced = 0
+        self.merged = 0
+        self.removed = 0
+
+    @property
+    def nodesSaved(self):
+        return self.nodesBefore - self.nodesAfter
+
+    def __str__(self):
+        return (
+            f"{self.nodesBefore} -> {self.nodesAfter} nodes "
+            f"({self.nodesSaved} saved: {self.folded} folded, "
+            f"{self.simplified} simplified, {self.coalesced} coalesced, "
+            f"{self.merged} merged, {self.removed} left unused)"
+        )
+
+    def __repr__(self):
+        return f"OptimizationReport({self})"
+
+
+def sign(x):
+    # the game's Sign of 0 is ambiguous (Mathf.Sign gives 1), so leave it
+    return math.copysign(1.0, x) if x != 0 else None
+
+
+# Operation modifiers, in the order of nodes.Operation
+operations = [
+    abs,
+    round,
+    math.floor,
+    math.ceil,
+    math.sin,
+    math.cos,
+    math.tan,
+    math.asin,
+    math.acos,
+    math.atan,
+    math.sqrt,
+    sign,
+    math.log,
+    math.log10,
+    math.exp,
+    lambda x: 10.0**x,
+]
+
+compareFloats = [
+    lambda a, b: a == b,
+    lambda a, b: a < b,
+    lambda a, b: a > b,
+    lambda a, b: a <= b,
+    lambda a, b: a >= b,
+]
+
+compareBool = [
+    lambda a, b: a and b,
+    lambda a, b: a or b,
+    lambda a, b: a == b,
+    lambda a, b: a != b,
+    lambda a, b: not (a or b),
+    lambda a, b: not (a and b),
+    lambda a, b: a == b,
+]
+
+# CompareBool modes where one constant input leaves the other unchanged:
+# mode -> constant value
+compareBoolIdentities = {0: True, 1: False, 2: True, 3: False}
+
+
+def formatFloat(value):
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def isPure(record):
+    """Nodes that may be merged or dropped when nothing reads them."""
+    return (
+        outputs[record.nodeName] is not None
+        and record.nodeName != "RandomFloat"
+        and record.includePorts
+        and not record.placed
+    )
+
+
+class Optimizer:
+    """
+    One pass over the graph in topological order. Every node is first
+    rewritten onto the already optimized versions of its inputs, then
+    folded, simplified or merged with an identical node.
+    """
+
+    def __init__(self, graph: Graph):
+        self.graph = graph
+        self.report = OptimizationReport(len(graph.nodes))
+        self.inputs = {record: {} for record in graph.nodes}
+        self.consumers = {record: set() for record in graph.nodes}
+        self.removed = set()
+        self.deleted = set()
+        self.table = {}
+        self.keys = {}
+
+        for connection in graph.connections:
+            name = ports[connection.target.nodeName][connection.targetPort]["id"]
+            self.inputs[connection.target][name] = connection
+            self.consumers[connection.source].add(connection)
+
+    def run(self):
+        for record in self.topologicalOrder():
+            if record not in self.removed:
+                self.visit(record)
+
+        graph = self.graph
+        graph.nodes = [record for record in graph.nodes if record not in self.removed]
+        graph.connections = [
+            connection
+            for connection in graph.connections
+            if connection not in self.deleted
+        ]
+        graph.forgetNodes(self.removed)
+        if graph.hashConsing:
+            graph.valueNumbers = dict(self.table)
+
+        self.report.nodesAfter = len(graph.nodes)
+        return self.report
+
+    def topologicalOrder(self):
+        inDegree = {record: 0 for record in self.graph.nodes}
+        for connection in self.graph.connections:
+            if connection.source is not connection.target:
+                inDegree[connection.target] += 1
+
+        queue = deque(record for record, degree in inDegree.items() if degree == 0)
+        while queue:
+            record = queue.popleft()
+            # visiting may rewire the consumers away, so collect them first
+            targets = [
+                connection.target
+                for connection in self.consumers[record]
+                if connection.target is not record
+            ]
+            yield record
+            for target in targets:
+                inDegree[target] -= 1
+                if inDegree[target] == 0:
+                    queue.append(target)
+
+    # graph editing
+
+    def constant(self, name, record):
+        connection = self.inputs[record].get(name)
+        if connection is None:
+            return None
+        source = connection.source
+        if source.nodeName == "Float":
+            try:
+                value = float(source.modifier)
+            except ValueError:
+                return None
+            return value if math.isfinite(value) else None
+        if source.nodeName == "Bool":
+            return str(source.modifier) == "0"
+        return None
+
+    def literal(self, value):
+        if isinstance(value, bool):
+            nodeName, modifier = "Bool", "0" if value else "1"
+        else:
+            nodeName, modifier = "Float", formatFloat(value)
+
+        key = valueKey(nodeName, modifier, [])
+        if key not in self.table:
+            record = self.graph.addNode(nodeName, modifier)
+            self.inputs[record] = {}
+            self.consumers[record] = set()
+            self.register(record, key)
+        return self.table[key], 0
+
+    def register(self, record, key):
+        self.table[key] = record
+        self.keys[record] = key
+
+    def rewire(self, connection, source, sourcePort):
+        released = connection.source
+        self.consumers[released].discard(connection)
+        connection.source = source
+        connection.sourcePort = sourcePort
+        self.consumers[source].add(connection)
+        return released
+
+    def replace(self, record, portMap):
+        """Point every consumer of `record` at portMap[port], then drop it."""
+        for connection in list(self.consumers[record]):
+            self.rewire(connection, *portMap[connection.sourcePort])
+        self.remove(record)
+        return True
+
+    def remove(self, record):
+        stack = [record]
+        while stack:
+            record = stack.pop()
+            if record in self.removed:
+                continue
+            self.removed.add(record)
+            if self.table.get(self.keys.get(record)) is record:
+                del self.table[self.keys[record]]
+            for connection in self.inputs[record].values():
+                self.deleted.add(connection)
+                self.consumers[connection.source].discard(connection)
+                if self.isReleased(connection.source):
+                    self.report.removed += 1
+                    stack.append(connection.source)
+
+    def release(self, record):
+        if self.isReleased(record):
+            self.report.removed += 1
+            self.remove(record)
+
+    def isReleased(self, record):
+        return (
+            not self.consumers[record] and record not in self.removed and isPure(record)
+        )
+
+    def forward(self, record, connection):
+        """Replace a single-output node by the source of `connection`."""
+        output = (connection.source, connection.sourcePort)
+        return self.replace(record, dict.fromkeys(self.outputPorts(record), output))
+
+    def alias(self, record, name):
+        self.report.simplified += 1
+        return self.forward(record, self.inputs[record][name])
+
+    def fold(self, record, value):
+        # the save format has no infinities or NaN, leave such results to
+        # the game
+        if not math.isfinite(value):
+            return False
+        self.report.folded += 1
+        output = self.literal(value)
+        return self.replace(record, dict.fromkeys(self.outputPorts(record), output))
+
+    def outputPorts(self, record):
+        return [
+            i for i, port in enumerate(ports[record.nodeName]) if port["polarity"] != 0
+        ]
+
+    # rules
+
+    def visit(self, record):
+        if not isPure(record) or self.simplify(record):
+            return
+
+        edges = [
+            (connection.source, connection.sourcePort, connection.targetPort)
+            for connection in self.inputs[record].values()
+        ]
+        key = valueKey(record.nodeName, record.modifier, edges)
+        existing = self.table.get(key)
+        if existing is None:
+            self.register(record, key)
+        elif existing is not record:
+            self.replace(
+                record, {port: (existing, port) for port in self.outputPorts(record)}
+            )
+            self.report.merged += 1
+
+    def simplify(self, record):
+        rule = getattr(self, f"simplify{record.nodeName}", None)
+        if rule is None:
+            return False
+        try:
+            return rule(record)
+        except (ArithmeticError, ValueError):
+            return False
+
+    def simplifyAddFloats(self, record):
+        a = self.constant("Float1", record)
+        b = self.constant("Float2", record)
+        if a is not None and b is not None:
+            return self.fold(record, a + b)
+        if b == 0:
+            return self.alias(record, "Float1")
+        if a == 0:
+            return self.alias(record, "Float2")
+        if a is not None:
+            return self.coalesceAffine(record, "Float2", "Float1", a)
+        if b is not None:
+            return self.coalesceAffine(record, "Float1", "Float2", b)
+        return False
+
+    def simplifySubtractFloats(self, record):
+        a = self.constant("Float1", record)
+        b = self.constant("Float2", record)
+        if a is not None and b is not None:
+            return self.fold(record, a - b)
+        if b == 0:
+            return self.alias(record, "Float1")
+        if b is not None:
+            return self.coalesceAffine(record, "Float1", "Float2", -b)
+        return False
+
+    def simplifyMultiplyFloats(self, record):
+        a = self.constant("Float1", record)
+        b = self.constant("Float2", record)
+        if a is not None and b is not None:
+            return self.fold(record, a * b)
+        if b == 1:
+            return self.alias(record, "Float1")
+        if a == 1:
+            return self.alias(record, "Float2")
+        if a is not None:
+            return self.coalesceScale(record, "Float2", "Float1", a)
+        if b is not None:
+            return self.coalesceScale(record, "Float1", "Float2", b)
+        return False
+
+    def simplifyDivideFloats(self, record):
+        a = self.constant("Float1", record)
+        b = self.constant("Float2", record)
+        if b == 0:
+            return False
+        if a is not None and b is not None:
+            return self.fold(record, a / b)
+        if b == 1:
+            return self.alias(record, "Float1")
+        if b is not None:
+            inner = self.inputs[record]["Float1"].source
+            c = (
+                self.constant("Float2", inner)
+                if inner.nodeName == "DivideFloats"
+                else None
+            )
+            if c is not None and c != 0 and self.isSingleUse(inner):
+                # (y / c) / b = y / (c * b)
+                self.setInputs(record, inner, "Float1", c * b)
+                return self.coalesced(record, "Float1", c * b == 1)
+        return False
+
+    def simplifyClampFloat(self, record):
+        value = self.constant("Float1", record)
+        low = self.constant("Float2", record)
+        high = self.constant("Float3", record)
+        if value is None or low is None or high is None:
+            return False
+        return self.fold(
+            record, low if value < low else high if value > high else value
+        )
+
+    def simplifyOperation(self, record):
+        value = self.constant("Float1", record)
+        if value is None:
+            return False
+        result = operations[int(record.modifier)](value)
+        if result is None:
+            return False
+        return self.fold(record, float(result))
+
+    def simplifyCompareFloats(self, record):
+        a = self.constant("Float1", record)
+        b = self.constant("Float2", record)
+        if a is None or b is None:
+            return False
+        return self.fold(record, compareFloats[int(record.modifier)](a, b))
+
+    def simplifyCompareBool(self, record):
+        mode = int(record.modifier)
+        a = self.constant("Bool1", record)
+        b = self.constant("Bool2", record)
+        if a is not None and b is not None:
+            return self.fold(record, bool(compareBool[mode](a, b)))
+        identity = compareBoolIdentities.get(mode)
+        if identity is not None and b is identity:
+            return self.alias(record, "Bool1")
+        if identity is not None and a is identity:
+            return self.alias(record, "Bool2")
+        return False
+
+    def simplifyNot(self, record):
+        value = self.constant("Bool1", record)
+        if value is not None:
+            return self.fold(record, not value)
+        inner = self.inputs[record].get("Bool1")
+        if inner is not None and inner.source.nodeName == "Not":
+            innerInput = self.inputs[inner.source].get("Bool1")
+            if innerInput is not None:
+                self.report.simplified += 1
+                return self.forward(record, innerInput)
+        return False
+
+    def simplifyConditionalSetFloatV2(self, record):
+        return self.simplifyConditional(record, "Float")
+
+    def simplifyConditionalSetVector3(self, record):
+        return self.simplifyConditional(record, "Vector3")
+
+    def simplifyConditional(self, record, valueType):
+        inputs = self.inputs[record]
+        first = inputs.get(f"{valueType}1")
+        second = inputs.get(f"{valueType}2")
+        if first is None or second is None:
+            return False
+        condition = self.constant("Bool1", record)
+        if condition is not None:
+            # modifier "0" selects the first value when the condition is true
+            chosen = first if condition == (str(record.modifier) == "0") else second
+            self.report.simplified += 1
+            return self.forward(record, chosen)
+        if (first.source, first.sourcePort) == (second.source, second.sourcePort):
+            return self.alias(record, f"{valueType}1")
+        return False
+
+    def simplifyScaleVector3(self, record):
+        if self.constant("Float1", record) == 1:
+            return self.alias(record, "Vector31")
+        return False
+
+    def simplifyVector3Split(self, record):
+        vector = self.inputs[record].get("Vector31")
+        if vector is None or vector.source.nodeName != "ConstructVector3":
+            return False
+        components = self.inputs[vector.source]
+        portMap = {}
+        for port in self.outputPorts(record):
+            component = components.get(ports["Vector3Split"][port]["id"])
+            if component is None:
+                return False
+            portMap[port] = (component.source, component.sourcePort)
+        self.report.simplified += 1
+        return self.replace(record, portMap)
+
+    # constant chains
+
+    def isSingleUse(self, record):
+        return len(self.consumers[record]) == 1 and isPure(record)
+
+    def coalesceAffine(self, record, operandName, constantName, constant):
+        """(y + c) + k -> y + (c + k), also for subtractions on either level."""
+        inner = self.inputs[record][operandName].source
+        if not self.isSingleUse(inner):
+            return False
+        if inner.nodeName == "AddFloats":
+            c = self.constant("Float2", inner)
+            innerOperand = "Float1"
+            if c is None:
+                c = self.constant("Float1", inner)
+                innerOperand = "Float2"
+        elif inner.nodeName == "SubtractFloats":
+            c = self.constant("Float2", inner)
+            innerOperand = "Float1"
+            c = -c if c is not None else None
+        else:
+            return False
+        if c is None:
+            return False
+
+        total = c + constant
+        if not math.isfinite(total):
+            return False
+        if record.nodeName == "SubtractFloats":
+            # record is y + c - k, written as y - (k - c)
+            constant = -total
+        else:
+            constant = total
+        self.setInputs(record, inner, innerOperand, constant, operandName, constantName)
+        return self.coalesced(record, operandName, total == 0)
+
+    def coalesceScale(self, record, operandName, constantName, constant):
+        """(y * c) * k -> y * (c * k)"""
+        inner = self.inputs[record][operandName].source
+        if inner.nodeName != "MultiplyFloats" or not self.isSingleUse(inner):
+            return False
+        c = self.constant("Float2", inner)
+        innerOperand = "Float1"
+        if c is None:
+            c = self.constant("Float1", inner)
+            innerOperand = "Float2"
+        if c is None:
+            return False
+
+        total = c * constant
+        if not math.isfinite(total):
+            return False
+        self.setInputs(record, inner, innerOperand, total, operandName, constantName)
+        return self.coalesced(record, operandName, total == 1)
+
+    def setInputs(
+        self,
+        record,
+        inner,
+        innerOperand,
+        constant,
+        operandName="Float1",
+        constantName="Float2",
+    ):
+        """Feed `record` from the operand of `inner` and a new constant."""
+        operand = self.inputs[inner][innerOperand]
+        released = [
+            self.rewire(
+                self.inputs[record][operandName], operand.source, operand.sourcePort
+            ),
+            self.rewire(self.inputs[record][constantName], *self.literal(constant)),
+        ]
+        for source in released:
+            self.release(source)
+
+    def coalesced(self, record, operandName, isIdentity):
+        self.report.coalesced += 1
+        if isIdentity:
+            return self.forward(record, self.inputs[record][operandName])
+        return False
+
+
+def optimizeGraph(graph: Graph = None) -> OptimizationReport:
+    """
+    Fold constant subtrees into Float/Bool nodes, coalesce constant chains
+    like (x + 1) + 2 into x + 3, remove identity operations (x * 1, x + 0,
+    -(-x), not not x, ...) and merge nodes that became identical.
+
+    Constant chains are reassociated, which can change results in the last
+    bits compared to evaluating them one operation at a time. Node handles
+    to removed nodes must not be used afterwards.
+    """
+    if graph is None:
+        graph = currentGraph()
+    return Optimizer(graph).run()
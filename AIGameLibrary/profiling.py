@@ -0,0 +1,266 @@
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .utils import openForWriting
+
+# when set to a file path, every SaveData call appends its SaveStats to that
+# file as one JSON line
+SAVE_STATS_VARIABLE = "AIGAME_SAVE_STATS"
+
+# while a MemoryProfile is active, the SaveStats of every SaveData call are
+# recorded in this list
+saveStatsLog = ContextVar("saveStatsLog", default=None)
+
+# the highest traced memory dropped by resetPeak since the last startPeak
+droppedPeak = 0
+
+
+def startPeak():
+    """Start measuring tracemalloc's peak from the memory traced now."""
+    global droppedPeak
+    droppedPeak = 0
+    tracemalloc.reset_peak()
+
+
+def resetPeak():
+    """tracemalloc.reset_peak, keeping the dropped peak for tracedPeak."""
+    global droppedPeak
+    droppedPeak = max(droppedPeak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+
+
+def tracedPeak():
+    """The peak traced memory since startPeak, across resetPeak calls."""
+    return max(droppedPeak, tracemalloc.get_traced_memory()[1])
+
+
+class SaveStats:
+    """
+    Wall time of each SaveData phase (optimize, prune, layout, assignIds,
+    write) and the size of the graph before and after pruning. While
+    tracemalloc is tracing, the memory traced when saving started and the
+    peak each phase needed on top of its starting memory are recorded too.
+    """
+
+    def __init__(self):
+        self.filePath = None
+        self.layout = None
+        self.phases = {}
+        self.nodesBefore = 0
+        self.connectionsBefore = 0
+        self.nodesAfter = 0
+        self.connectionsAfter = 0
+        self.memoryBefore = None
+        self.memory = {}
+
+    @contextmanager
+    def phase(self, name):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            resetPeak()
+            startMemory = tracemalloc.get_traced_memory()[0]
+            if self.memoryBefore is None:
+                self.memoryBefore = startMemory
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+            if tracing:
+                self.memory[name] = max(
+                    self.memory.get(name, 0),
+                    tracemalloc.get_traced_memory()[1] - startMemory,
+                )
+
+    @property
+    def total(self):
+        return sum(self.phases.values())
+
+    def toDict(self):
+        return {
+            "filePath": self.filePath,
+            "layout": self.layout,
+            "phases": dict(self.phases),
+            "total": self.total,
+            "nodesBefore": self.nodesBefore,
+            "connectionsBefore": self.connectionsBefore,
+            "nodesAfter": self.nodesAfter,
+            "connectionsAfter": self.connectionsAfter,
+            "memoryBefore": self.memoryBefore,
+            "memory": dict(self.memory),
+        }
+
+    def __str__(self):
+        phases = ", ".join(
+            f"{name} {seconds * 1000:.1f}ms" for name, seconds in self.phases.items()
+        )
+        return (
+            f"{self.nodesBefore} -> {self.nodesAfter} nodes, "
+            f"{self.connectionsBefore} -> {self.connectionsAfter} connections "
+            f"in {self.total * 1000:.1f}ms ({phases})"
+        )
+
+    def __repr__(self):
+        return f"SaveStats({self})"
+
+
+def emitSaveStats(stats: SaveStats):
+    """
+    Record `stats` in the active MemoryProfile and append it to the file
+    named by AIGAME_SAVE_STATS, if there is one.
+    """
+    log = saveStatsLog.get()
+    if log is not None:
+        log.append(stats)
+
+    path = os.environ.get(SAVE_STATS_VARIABLE)
+    if not path:
+        return
+    line = json.dumps(dict(stats.toDict(), time=time.time(), pid=os.getpid()))
+    # one short write in append mode, so parallel builds don't interleave lines
+    with open(path, "a") as f:
+        f.write(line + "\n")
+
+
+# when set, new graphs record a Trace of where their nodes come from
+TRACE_VARIABLE = "AIGAME_TRACE"
+
+# frames in these files belong to the library, not to the script being traced
+PACKAGE_DIRECTORY = os.path.dirname(__file__) + os.sep
+
+
+class TraceSite:
+    """What one builder called from one line of a script added to the graph."""
+
+    __slots__ = (
+        "fileName",
+        "line",
+        "builder",
+        "nodes",
+        "connections",
+        "hits",
+        "misses",
+    )
+
+    def __init__(self, fileName, line, builder):
+        self.fileName = fileName
+        self.line = line
+        self.builder = builder
+        self.nodes = 0
+        self.connections = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"TraceSite({self.builder} at {self.fileName}:{self.line})"
+
+
+class Trace:
+    """
+    Where the nodes of a graph come from. Every node, connection and builder
+    cache lookup is attributed to the script line that caused it and to the
+    builder called there: the outermost library function with a capitalized
+    name (AddNode, Vector3Split, Power, ...). Tracing walks the stack for
+    every node, so it is only done for graphs created with `trace=True` or
+    while AIGAME_TRACE is set.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.sites = {}
+        self.origins = {}
+
+    def site(self, builder=None):
+        entry = None
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_code.co_filename.startswith(
+            PACKAGE_DIRECTORY
+        ):
+            entry = frame.f_code.co_qualname
+            if frame.f_code.co_name[:1].isupper():
+                builder = entry
+            frame = frame.f_back
+
+        if frame is None:
+            key = ("<library>", 0, builder or entry)
+        else:
+            key = (frame.f_code.co_filename, frame.f_lineno, builder or entry)
+        site = self.sites.get(key)
+        if site is None:
+            site = self.sites[key] = TraceSite(*key)
+        return site
+
+    def addedNode(self, record):
+        site = self.site()
+        site.nodes += 1
+        self.origins[record] = site
+
+    def addedConnection(self):
+        self.site().connections += 1
+
+    def cacheLookup(self, builderName, hit):
+        site = self.site(builderName)
+        if hit:
+            site.hits += 1
+        else:
+            site.misses += 1
+
+    def hotSpots(self):
+        """(site, nodes still in the graph) pairs, the biggest first."""
+        kept = Counter(self.origins.get(record) for record in self.graph.nodes)
+        return sorted(
+            ((site, kept[site]) for site in self.sites.values()),
+            key=lambda item: (item[1], item[0].nodes, item[0].connections),
+            reverse=True,
+        )
+
+    def report(self, limit=20):
+        lines = [
+            f"{'nodes':>8} {'kept':>8} {'connections':>11} {'hits':>8} "
+            f"{'misses':>8}  builder at line"
+        ]
+        for site, kept in self.hotSpots()[:limit]:
+            lines.append(
+                f"{site.nodes:>8} {kept:>8} {site.connections:>11} {site.hits:>8} "
+                f"{site.misses:>8}  {site.builder} at {site.fileName}:{site.line}"
+            )
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.report()
+
+    def write(self, filePath):
+        """Save the hot spots and the origin of each node by sID as JSON."""
+        hotSpots = self.hotSpots()
+        indices = {site: i for i, (site, _) in enumerate(hotSpots)}
+        document = {
+            "sites": [
+                {
+                    "file": site.fileName,
+                    "line": site.line,
+                    "builder": site.builder,
+                    "nodes": site.nodes,
+                    "kept": kept,
+                    "connections": site.connections,
+                    "hits": site.hits,
+                    "misses": site.misses,
+                }
+                for site, kept in hotSpots
+            ],
+            "nodes": [
+                {
+                    "sID": record.sID,
+                    "nodeName": record.nodeName,
+                    "site": indices.get(self.origins.get(record)),
+                }
+                for record in self.graph.nodes
+            ],
+        }
+        with openForWriting(filePath) as f:
+            json.dump(document, f)
@@ -0,0 +1,333 @@
+import json
+import re
+from itertools import batched
+
+from .data import colors, ports, sizes
+from .graph import ORIGIN, UNIT_SCALE, ConnectionRecord, NodeRecord
+from .utils import Color, Position2, Position3
+
+# Templates hold every static part of the serialized dicts once per node type
+# or port pair. Serialized nodes and connections share these sub-dicts, so
+# the documents built here must be treated as read-only.
+nodeTemplates = {}
+connectionTemplates = {}
+
+HIDDEN_SCALE = Position3(0, 0)
+
+# nodes and connections are encoded this many at a time when streaming
+CHUNK_SIZE = 1024
+
+
+def compileNodeTemplate(nodeName):
+    rectTransform = {
+        "position": Position3(0, 0),
+        "localPosition": None,
+        "anchorMin": Position2(0, 1),
+        "anchorMax": Position2(0, 1),
+        "sizeDelta": sizes[nodeName],
+        "scale": Position3(*UNIT_SCALE),
+    }
+    node = {
+        "serializableRectTransform": rectTransform,
+        "id": nodeName,
+        "sID": None,
+        "enableSelfConnection": False,
+        "enableDrag": True,
+        "enableHover": False,
+        "enableSelect": True,
+        "disableClick": False,
+        "modifier": None,
+        "defaultColor": colors[nodeName],
+        "outlineSelectedColor": Color(1, 0.58, 0.04),
+        "outlineHoverColor": Color(1, 0.81, 0.3),
+        "serializablePorts": None,
+    }
+
+    portTemplates = []
+    for portData in ports[nodeName]:
+        portRectTransform = {
+            "position": Position3(0, 0),
+            "localPosition": portData["position"],
+            "anchorMin": Position2(0, 1),
+            "anchorMax": Position2(0, 1),
+            "sizeDelta": Position2(40, 40),
+            "scale": Position3(1, 1, 1),
+        }
+        port = {
+            "serializableRectTransform": portRectTransform,
+            "id": portData["id"],
+            "sID": None,
+            "polarity": portData["polarity"],
+            "maxConnections": portData["maxConnections"],
+            "iconColorDefault": portData["iconColorDefault"],
+            "iconColorHover": portData["iconColorHover"],
+            "iconColorSelected": portData["iconColorSelected"],
+            "iconColorConnected": Color(1, 1, 1),
+            "enableDrag": True,
+            "enableHover": True,
+            "disableClick": False,
+            "controlPointSerializableRectTransform": {
+                "position": Position3(0, 0),
+                "localPosition": portData["controlPointPosition"],
+                "anchorMin": Position2(0.5, 0.5),
+                "anchorMax": Position2(0.5, 0.5),
+                "sizeDelta": Position2(0, 0),
+                "scale": Position3(2.21, 2.21, 2.21),
+            },
+            "nodeInstanceID": None,
+            "nodeSID": None,
+        }
+        hiddenRectTransform = dict(portRectTransform, scale=HIDDEN_SCALE)
+        portTemplates.append((port, hiddenRectTransform))
+
+    return node, portTemplates
+
+
+def compileConnectionTemplate(sourceName, sourcePort, targetName, targetPort):
+    port0 = ports[sourceName][sourcePort]
+    port1 = ports[targetName][targetPort]
+
+    line = {
+        "capStart": {
+            "active": False,
+            "shape": 3,
+            "size": 5.0,
+            "color": Color(1.0, 0.81, 0.3),
+            "angleOffset": 0.0,
+        },
+        "capEnd": {
+            "active": False,
+            "shape": 3,
+            "size": 5.0,
+            "color": Color(1.0, 0.81, 0.3),
+            "angleOffset": 0.0,
+        },
+        "ID": "",
+        "startWidth": 3.0,
+        "endWidth": 3.0,
+        "dashDistance": 5.0,
+        "color": Color(0.98, 0.94, 0.84),
+        "points": [
+            port0["position"],
+            port0["controlPointPosition"],
+            port1["position"],
+            port1["controlPointPosition"],
+        ],
+        "lineStyle": 0,
+        "length": 0,
+        "animation": {
+            "isActive": False,
+            "pointsDistance": 90.0,
+            "size": 10.0,
+            "color": port0["iconColorDefault"],
+            "shape": 1,
+            "speed": 0.0,
+        },
+    }
+
+    return {
+        "id": f"Connection ({port0['id']} - {port1['id']})",
+        "sID": None,
+        "port0InstanceID": None,
+        "port1InstanceID": None,
+        "port0SID": None,
+        "port1SID": None,
+        "selectedColor": Color(1.0, 0.58, 0.04),
+        "hoverColor": Color(1.0, 0.81, 0.3),
+        "defaultColor": Color(0.98, 0.94, 0.84),
+        "curveStyle": 2,
+        "label": "",
+        "line": line,
+        "enableDrag": True,
+        "enableHover": True,
+        "enableSelect": True,
+        "disableClick": False,
+    }
+
+
+def toTuple(position):
+    if position is None:
+        return ORIGIN
+    return (position["x"], position["y"], position["z"])
+
+
+def serializeNode(record: NodeRecord):
+    if record.nodeName not in nodeTemplates:
+        nodeTemplates[record.nodeName] = compileNodeTemplate(record.nodeName)
+    template, portTemplates = nodeTemplates[record.nodeName]
+
+    rectTransform = template["serializableRectTransform"].copy()
+    rectTransform["localPosition"] = Position3(*record.position)
+    if record.scale != UNIT_SCALE:
+        rectTransform["scale"] = Position3(*record.scale)
+
+    node = template.copy()
+    node["serializableRectTransform"] = rectTransform
+    node["sID"] = record.sID
+    node["modifier"] = record.modifier
+    node["serializablePorts"] = serializedPorts = []
+
+    if record.includePorts:
+        for i, (portTemplate, hiddenRectTransform) in enumerate(portTemplates):
+            port = portTemplate.copy()
+            if i in record.hiddenPorts:
+                port["serializableRectTransform"] = hiddenRectTransform
+            port["sID"] = record.portSIDs[i]
+            port["nodeInstanceID"] = record.instanceId
+            port["nodeSID"] = record.sID
+            serializedPorts.append(port)
+
+    return node
+
+
+def serializeConnection(connection: ConnectionRecord):
+    source = connection.source
+    target = connection.target
+    key = (
+        source.nodeName,
+        connection.sourcePort,
+        target.nodeName,
+        connection.targetPort,
+    )
+    if key not in connectionTemplates:
+        connectionTemplates[key] = compileConnectionTemplate(*key)
+
+    serialized = connectionTemplates[key].copy()
+    serialized["sID"] = connection.sID
+    serialized["port0InstanceID"] = source.instanceId
+    serialized["port1InstanceID"] = target.instanceId
+    serialized["port0SID"] = source.portSIDs[connection.sourcePort]
+    serialized["port1SID"] = target.portSIDs[connection.targetPort]
+    if connection.startWidth != 3.0:
+        serialized["line"] = dict(serialized["line"], startWidth=connection.startWidth)
+
+    return serialized
+
+
+class JsonBackend:
+    """The standard library's C encoder in the compact format the game uses."""
+
+    name = "json"
+
+    def __init__(self):
+        self.encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class OrjsonBackend:
+    """
+    orjson, when installed. It formats a few values differently from the
+    standard library (non-ASCII text, NaN, floats below 1e-4 or from 1e16
+    up), so chunks containing anything like them are re-encoded with
+    JsonBackend to keep the output byte-identical.
+    """
+
+    name = "orjson"
+    # orjson writes 1e-5 as 0.00001 and 1e-6 to 1e-9 with a one digit
+    # exponent, floats from 1e16 up with an unsigned exponent (1e16 for
+    # 1e+16), NaN and infinity as null, and DEL unescaped
+    differences = (b"0.0000", b"null", b"\x7f")
+    exponents = re.compile(rb"e(?:-[1-9]|[1-9][0-9]*)[,}\]]")
+
+    def __init__(self):
+        import orjson
+
+        self.dumps = orjson.dumps
+        self.fallback = JsonBackend().encode
+
+    def encode(self, value):
+        try:
+            encoded = self.dumps(value)
+        except TypeError:
+            return self.fallback(value)
+        if (
+            not encoded.isascii()
+            or any(text in encoded for text in self.differences)
+            or self.exponents.search(encoded)
+        ):
+            return self.fallback(value)
+        return encoded.decode()
+
+
+backends = {"json": JsonBackend, "orjson": OrjsonBackend}
+
+
+def getBackend(name=None):
+    """The named backend, or the fastest one installed when name is None."""
+    if name is not None:
+        return backends[name]()
+    try:
+        return OrjsonBackend()
+    except ImportError:
+        return JsonBackend()
+
+
+def writeArray(file, items, serialize, encode):
+    file.write("[")
+    for i, chunk in enumerate(batched(items, CHUNK_SIZE)):
+        if i:
+            file.write(",")
+        # strip the brackets of the chunk's own list
+        file.write(encode([serialize(item) for item in chunk])[1:-1])
+    file.write("]")
+
+
+def writeDocument(file, graph, backend=None):
+    """
+    Stream the save document of `graph` to `file`, encoding CHUNK_SIZE nodes
+    or connections at a time. The output is byte-identical to
+    json.dump(document, file, separators=(",", ":")).
+    """
+    encode = (backend or getBackend()).encode
+    file.write('{"serializableNodes":')
+    writeArray(file, graph.nodes, serializeNode, encode)
+    file.write(',"serializableConnections":')
+    writeArray(file, graph.connections, serializeConnection, encode)
+    file.write("}")
+
+
+def readDocument(document, graph):
+    """
+    Add the nodes and connections of a loaded save document to `graph`,
+    keeping their sIDs, instance IDs, positions and hidden ports. Returns
+    the new node records in file order.
+    """
+    records = []
+    portOwners = {}
+    for node in document["serializableNodes"]:
+        nodeName = node["id"]
+        if nodeName not in ports:
+            raise ValueError(f"unknown node type {nodeName!r}")
+
+        rectTransform = node["serializableRectTransform"]
+        serializedPorts = node["serializablePorts"]
+        record = graph.addNode(
+            nodeName,
+            node["modifier"],
+            includePorts=bool(serializedPorts),
+            position=toTuple(rectTransform["localPosition"]),
+        )
+        scale = toTuple(rectTransform["scale"])
+        if scale != UNIT_SCALE:
+            record.scale = scale
+        record.sID = node["sID"]
+        record.portSIDs = [port["sID"] for port in serializedPorts]
+        record.hiddenPorts = tuple(
+            i
+            for i, port in enumerate(serializedPorts)
+            if port["serializableRectTransform"]["scale"] == HIDDEN_SCALE
+        )
+        if serializedPorts:
+            record.instanceId = serializedPorts[0]["nodeInstanceID"]
+
+        for i, sID in enumerate(record.portSIDs):
+            portOwners[sID] = record, i
+        records.append(record)
+
+    for serialized in document["serializableConnections"]:
+        source, sourcePort = portOwners[serialized["port0SID"]]
+        target, targetPort = portOwners[serialized["port1SID"]]
+        connection = graph.addConnection(source, sourcePort, target, targetPort)
+        connection.startWidth = serialized["line"]["startWidth"]
+        connection.sID = serialized["sID"]
+
+    return records
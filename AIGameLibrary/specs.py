@@ -0,0 +1,76 @@
+from .data import NodeSpecTable, argumentOrder, modifierNames, outputs, ports
+
+
+def portType(portId):
+    """
+    Port ids are a port type and a one digit number, except the output of
+    CrossProduct, which the game names plain "Vector3".
+    """
+    return portId if portId == "Vector3" else portId[:-1]
+
+
+class NodeSpec:
+    """
+    Everything builders need to know about a node type, derived once from
+    `data.ports` and `data.outputs`. Inputs are listed in argument order,
+    outputs in output index order; `inputPorts` and `outputPorts` hold
+    their indices in the node's port list.
+    """
+
+    __slots__ = (
+        "nodeName",
+        "output",
+        "inputIds",
+        "inputTypes",
+        "inputPorts",
+        "outputIds",
+        "outputTypes",
+        "outputPorts",
+        "portIndices",
+        "modifiers",
+    )
+
+    def __init__(self, nodeName):
+        nodePorts = list(enumerate(ports[nodeName]))
+        inputs = [(i, port) for i, port in nodePorts if port["polarity"] == 0]
+        if nodeName in argumentOrder:
+            order = argumentOrder[nodeName]
+            inputs.sort(key=lambda item: order.index(item[1]["id"]))
+        else:
+            inputs.sort(key=lambda item: -item[1]["position"]["y"])
+        outputPorts = [(i, port) for i, port in nodePorts if port["polarity"] != 0]
+
+        self.nodeName = nodeName
+        self.output = outputs[nodeName]
+        self.inputIds = tuple(port["id"] for _, port in inputs)
+        self.inputTypes = tuple(map(portType, self.inputIds))
+        self.inputPorts = tuple(i for i, _ in inputs)
+        self.outputIds = tuple(port["id"] for _, port in outputPorts)
+        self.outputTypes = tuple(map(portType, self.outputIds))
+        self.outputPorts = tuple(i for i, _ in outputPorts)
+        # port ids are only unique per polarity, so inputs and outputs are
+        # kept apart
+        self.portIndices = (
+            {port["id"]: i for i, port in inputs},
+            {port["id"]: i for i, port in outputPorts},
+        )
+
+        names = modifierNames.get(nodeName)
+        self.modifiers = (
+            None
+            if names is None
+            else {name: i for i, name in enumerate(names.__args__)}
+        )
+
+    def __repr__(self):
+        return f"NodeSpec({self.nodeName!r}, inputs={self.inputIds})"
+
+    def modifier(self, name):
+        """The modifier index of an enum name, e.g. "sqrt" for Operation."""
+        try:
+            return self.modifiers[name]
+        except KeyError:
+            raise ValueError(f"{name!r} is not a modifier of {self.nodeName}") from None
+
+
+nodeSpecs = NodeSpecTable(NodeSpec, {nodeName: nodeName for nodeName in ports})
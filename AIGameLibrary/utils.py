@@ -1,3 +1,4 @@
+import os
 from uuid import uuid4
 
 
@@ -5,6 +6,19 @@ def generateId():
     return str(uuid4())
 
 
+def openForWriting(filePath):
+    """
+    open(filePath, "w"), but a file with other hard links (as restored by
+    BuildCache(link=True)) is unlinked first, so they keep their content.
+    """
+    try:
+        if os.lstat(filePath).st_nlink > 1:
+            os.unlink(filePath)
+    except FileNotFoundError:
+        pass
+    return open(filePath, "w")
+
+
 def Color(r, g, b, a=1):
     return {"r": r, "g": g, "b": b, "a": a}
 
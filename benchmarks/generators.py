@@ -0,0 +1,84 @@
+"""
+Synthetic bots for benchmarking. Each generator builds into the current
+graph until it holds about `nodeCount` nodes, all of which feed a sink, so
+none are pruned by SaveData.
+"""
+
+from AIGameLibrary import (
+    AddNode,
+    Ball,
+    ConnectPorts,
+    Float,
+    Opponent,
+    SlimeController,
+    Vector3,
+    currentGraph,
+)
+
+from .programs import randomProgram
+
+
+def deepChain(nodeCount):
+    """One long dependency chain: acc * 1.0001 + i, three nodes per step."""
+    graph = currentGraph()
+    acc = Ball.Position.x
+    i = 0
+    while len(graph.nodes) < nodeCount - 3:
+        acc = acc * 1.0001 + Float(i)
+        i += 1
+    SlimeController(Vector3(acc, 0, 0), acc > 0)
+
+
+def wideFanOut(nodeCount):
+    """
+    One value read by a third of the nodes (x * i), summed back up by a
+    balanced tree of additions, so the layout has very wide columns.
+    """
+    x = Ball.Position.x
+    terms = [x * Float(i) for i in range(1, max(nodeCount // 3, 2))]
+    while len(terms) > 1:
+        pairs = [a + b for a, b in zip(terms[::2], terms[1::2])]
+        terms = pairs + terms[len(pairs) * 2 :]
+    SlimeController(Ball.Position, terms[0] > 0)
+
+
+def vector3Heavy(nodeCount):
+    """
+    A chain of Vector3 values, each split into its components and rebuilt:
+    Vector3Split, ConstructVector3 and AddVector3 make up most of the graph.
+    """
+    graph = currentGraph()
+    v = Ball.Position
+    i = 0
+    while len(graph.nodes) < nodeCount - 8:
+        v = Vector3(v.x + Float(i), v.y * 0.5, v.z) + Opponent.Position
+        i += 1
+    SlimeController(v, v.y > 0)
+
+
+def addNodeChain(nodeCount):
+    """
+    A chain of additions wired with AddNode and ConnectPorts directly, so no
+    builder cache or value numbering is involved.
+    """
+    graph = currentGraph()
+    acc = AddNode("Float", "0")
+    i = 1
+    while len(graph.nodes) < nodeCount - 1:
+        constant = AddNode("Float", str(i))
+        add = AddNode("AddFloats")
+        ConnectPorts("Float1", acc, add)
+        ConnectPorts(("Float1", "Float2"), constant, add)
+        acc = add
+        i += 1
+    debug = AddNode("Debug")
+    ConnectPorts(("Float1", "Any1"), acc, debug)
+
+
+generators = {
+    "deepChain": deepChain,
+    "wideFanOut": wideFanOut,
+    "vector3Heavy": vector3Heavy,
+    "addNodeChain": addNodeChain,
+    "randomProgram": randomProgram,
+}
@@ -0,0 +1,67 @@
+"""
+Import benchmark: runs `python -X importtime -c "import AIGameLibrary"` in
+fresh interpreters and reports the best cumulative time of each library
+module and of the biggest other imports.
+
+    python -m benchmarks.importtime --repeat 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def importTimes(module):
+    """Cumulative microseconds per imported module for one cold import."""
+    # measure imports from bytecode caches, as in an installed package
+    environment = dict(os.environ)
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="AIGameLibrary")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    # the first run writes any missing bytecode caches
+    importTimes(args.module)
+    best = {}
+    for _ in range(args.repeat):
+        for name, micros in importTimes(args.module).items():
+            best[name] = min(best.get(name, micros), micros)
+
+    package = args.module.split(".")[0]
+    library = {name: t for name, t in best.items() if name.split(".")[0] == package}
+    others = {name: t for name, t in best.items() if name not in library}
+    for title, times, count in [
+        ("library modules", library, len(library)),
+        ("other imports", others, args.top),
+    ]:
+        print(title)
+        for name, micros in sorted(times.items(), key=lambda item: -item[1])[:count]:
+            print(f"  {micros / 1000:8.2f} ms  {name}")
+    print(f"import {args.module}: {best[args.module] / 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
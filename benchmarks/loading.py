@@ -0,0 +1,65 @@
+"""
+Load benchmark: LoadIR against LoadData on the same bot, after checking
+that the IR converts back to the identical save file.
+
+    python -m benchmarks.loading --nodes 100000
+"""
+
+import argparse
+import io
+import os
+import tempfile
+
+from AIGameLibrary import Graph, LoadData
+from AIGameLibrary import serialization
+from AIGameLibrary.ir import LoadIR, dumpIR, loadIR
+
+from .serialization import buildChain, timeIt
+
+
+def load(function, filePath):
+    with Graph():
+        function(filePath)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    graph = buildChain(args.nodes)
+    print(f"{len(graph.nodes)} nodes, {len(graph.connections)} connections")
+
+    with tempfile.TemporaryDirectory() as directory:
+        savePath = os.path.join(directory, "bot.txt")
+        irPath = os.path.join(directory, "bot.ir")
+        with open(savePath, "w") as f:
+            serialization.writeDocument(f, graph)
+        data = dumpIR(graph)
+        with open(irPath, "wb") as f:
+            f.write(data)
+
+        loaded = Graph()
+        loadIR(data, loaded)
+        document = io.StringIO()
+        serialization.writeDocument(document, loaded)
+        with open(savePath) as f:
+            if document.getvalue() != f.read():
+                raise AssertionError("IR round trip differs from the save file")
+
+        baseline = None
+        for label, function, filePath in [
+            ("LoadData", LoadData, savePath),
+            ("LoadIR", LoadIR, irPath),
+        ]:
+            seconds = timeIt(load, function, filePath, repeat=args.repeat)
+            baseline = baseline or seconds
+            print(
+                f"{label:10} {seconds:7.3f}s {baseline / seconds:5.1f}x "
+                f"{os.path.getsize(filePath) / 2**20:8.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""
+Seeded random programs: type-correct expressions composed from the Node
+operators, the builders of AIGameLibrary.nodes and the custom nodes, wired
+into Debug nodes and a SlimeController. The same seed always builds the same
+graph, so a program can be rebuilt to compare an optimized graph against the
+original one.
+
+    python -m benchmarks.programs --seeds 200 --nodes 300
+
+checks that optimizeGraph keeps every program well formed, and that the
+optimized program computes the same outputs as the original one in a few
+random game states. With --loaded, the optimized copy is saved and loaded
+back first, so all its nodes have positions.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+
+from AIGameLibrary import (
+    AddFloats,
+    AddVector3,
+    And,
+    Ball,
+    Bool,
+    ClampFloat,
+    CompareBool,
+    CompareFloats,
+    ConditionalSetFloat,
+    ConditionalSetVector3,
+    CrossProduct,
+    Debug,
+    Distance,
+    DivideFloats,
+    DotProduct,
+    Equal,
+    Float,
+    Game,
+    GameState,
+    GetBool,
+    GetFloat,
+    GetTransform,
+    GetVector3,
+    Graph,
+    LoadData,
+    Magnitude,
+    Modulo,
+    MultiplyFloats,
+    Normalize,
+    Not,
+    Operation,
+    Opponent,
+    Or,
+    RelativePosition,
+    SaveData,
+    ScaleVector3,
+    Self,
+    SlimeController,
+    SubtractFloats,
+    SubtractVector3,
+    Vector3,
+    Vector3Split,
+    Xor,
+    currentGraph,
+    evaluateGraph,
+    optimizeGraph,
+)
+from AIGameLibrary.customNodes import IntegerPower, Power, QuadraticFormula
+from AIGameLibrary.data import (
+    boolProperties,
+    compareBoolModes,
+    compareFloatsModes,
+    floatProperties,
+    operationModes,
+    outputs,
+    relativePositions,
+    transformNames,
+    vector3Properties,
+)
+from AIGameLibrary.specs import nodeSpecs
+
+FLOAT = "Float"
+BOOL = "Bool"
+VECTOR3 = "Vector3"
+
+
+class ProgramGenerator:
+    """
+    Random expressions of a requested type. Every expression is at most
+    `maxDepth` operations deep; with probability `share` an operand is an
+    expression built before, so programs are DAGs like real bots rather
+    than trees. RandomFloat is left out so programs are deterministic.
+    """
+
+    def __init__(self, seed=0, maxDepth=6, share=0.2, leaf=0.15):
+        self.random = random.Random(seed)
+        self.maxDepth = maxDepth
+        self.share = share
+        self.leaf = leaf
+        self.built = {FLOAT: [], BOOL: [], VECTOR3: []}
+        self.productions = {
+            FLOAT: self.floatProductions(),
+            BOOL: self.boolProductions(),
+            VECTOR3: self.vector3Productions(),
+        }
+        self.leaves = {
+            FLOAT: self.floatLeaves(),
+            BOOL: self.boolLeaves(),
+            VECTOR3: self.vector3Leaves(),
+        }
+
+    def expression(self, valueType, depth=None):
+        """A Node of `valueType`: FLOAT, BOOL or VECTOR3."""
+        if depth is None:
+            depth = self.maxDepth
+        built = self.built[valueType]
+        if built and self.random.random() < self.share:
+            return self.random.choice(built[-100:])
+
+        if depth <= 0 or self.random.random() < self.leaf:
+            node = self.random.choice(self.leaves[valueType])()
+        else:
+            node = self.random.choice(self.productions[valueType])(depth - 1)
+        built.append(node)
+        return node
+
+    def floatValue(self, depth):
+        return self.expression(FLOAT, depth)
+
+    def boolValue(self, depth):
+        return self.expression(BOOL, depth)
+
+    def vector3Value(self, depth):
+        return self.expression(VECTOR3, depth)
+
+    def number(self):
+        """A literal operand: a small int or a float with two decimals."""
+        if self.random.random() < 0.5:
+            return self.random.randint(-5, 5)
+        return round(self.random.uniform(-10, 10), 2)
+
+    def choice(self, names):
+        return self.random.choice(names.__args__)
+
+    def floatLeaves(self):
+        return [
+            lambda: Float(self.number()),
+            lambda: GetFloat(self.choice(floatProperties)),
+            lambda: Game.Gravity,
+            lambda: Self.Score,
+            lambda: Ball.TouchesRemaining,
+            lambda: self.random.choice([Ball, Self, Opponent]).Position.y,
+        ]
+
+    def boolLeaves(self):
+        return [
+            lambda: Bool(self.random.random() < 0.5),
+            lambda: GetBool(self.choice(boolProperties)),
+            lambda: Self.CanJump,
+            lambda: Ball.IsSelfSide,
+        ]
+
+    def vector3Leaves(self):
+        return [
+            lambda: GetVector3(self.choice(vector3Properties)),
+            lambda: self.random.choice([Ball, Self, Opponent]).Velocity,
+            lambda: RelativePosition(
+                GetTransform(self.choice(transformNames)),
+                self.choice(relativePositions),
+            ),
+            lambda: Vector3(self.number(), self.number(), self.number()),
+        ]
+
+    def floatProductions(self):
+        f, b, v, n = self.floatValue, self.boolValue, self.vector3Value, self.number
+        return [
+            # operators, also with a literal on either side
+            lambda d: f(d) + f(d),
+            lambda d: f(d) - f(d),
+            lambda d: f(d) * f(d),
+            lambda d: f(d) / f(d),
+            lambda d: f(d) % f(d),
+            lambda d: f(d) // f(d),
+            lambda d: f(d) + n(),
+            lambda d: n() - f(d),
+            lambda d: n() * f(d),
+            lambda d: n() / f(d),
+            lambda d: f(d) ** self.random.choice([-2, -1, 0, 1, 2, 3, 0.5, 1.5]),
+            lambda d: -f(d),
+            lambda d: abs(f(d)),
+            lambda d: v(d) @ v(d),
+            lambda d: getattr(v(d), self.random.choice("xyz")),
+            # builders
+            lambda d: AddFloats(f(d), f(d)),
+            lambda d: SubtractFloats(f(d), n()),
+            lambda d: MultiplyFloats(f(d), f(d)),
+            lambda d: DivideFloats(n(), f(d)),
+            lambda d: Modulo(f(d), f(d)),
+            lambda d: ClampFloat(f(d), f(d), f(d)),
+            lambda d: ConditionalSetFloat(
+                b(d), f(d), f(d), value=self.random.random() < 0.5
+            ),
+            lambda d: Operation(f(d), self.choice(operationModes)),
+            lambda d: Distance(v(d), v(d)),
+            lambda d: DotProduct(v(d), v(d)),
+            lambda d: Magnitude(v(d)),
+            lambda d: Vector3Split(v(d))[self.random.randrange(3)],
+            # custom nodes
+            lambda d: Power(f(d), f(d)),
+            lambda d: Power(f(d), self.random.choice([-3, -0.5, 2, 2.5, 4])),
+            lambda d: IntegerPower(f(d), self.random.randint(-3, 5)),
+            lambda d: QuadraticFormula(f(d), f(d), f(d))[self.random.randint(1, 2)],
+        ]
+
+    def boolProductions(self):
+        f, b, v, n = self.floatValue, self.boolValue, self.vector3Value, self.number
+        return [
+            lambda d: f(d) < f(d),
+            lambda d: f(d) <= n(),
+            lambda d: f(d) > f(d),
+            lambda d: n() >= f(d),
+            lambda d: f(d) == f(d),
+            lambda d: f(d) != n(),
+            lambda d: b(d) == b(d),
+            lambda d: b(d) != b(d),
+            lambda d: b(d) & b(d),
+            lambda d: b(d) | b(d),
+            lambda d: b(d) ^ b(d),
+            lambda d: ~b(d),
+            lambda d: CompareBool(b(d), b(d), self.choice(compareBoolModes)),
+            lambda d: CompareFloats(f(d), f(d), self.choice(compareFloatsModes)),
+            lambda d: And(b(d), b(d)),
+            lambda d: Or(b(d), b(d)),
+            lambda d: Xor(b(d), b(d)),
+            lambda d: Equal(b(d), b(d)),
+            lambda d: Not(b(d)),
+            lambda d: QuadraticFormula(f(d), f(d), f(d))[0],
+            lambda d: Magnitude(v(d)) > n(),
+        ]
+
+    def vector3Productions(self):
+        f, b, v, n = self.floatValue, self.boolValue, self.vector3Value, self.number
+        return [
+            lambda d: v(d) + v(d),
+            lambda d: v(d) - v(d),
+            lambda d: v(d) * f(d),
+            lambda d: f(d) * v(d),
+            lambda d: v(d) * n(),
+            lambda d: Vector3(f(d), f(d), f(d)),
+            lambda d: Vector3(f(d), n(), f(d)),
+            lambda d: AddVector3(v(d), v(d)),
+            lambda d: SubtractVector3(v(d), v(d)),
+            lambda d: ScaleVector3(v(d), f(d)),
+            lambda d: CrossProduct(v(d), v(d)),
+            lambda d: Normalize(v(d)),
+            lambda d: ConditionalSetVector3(
+                b(d), v(d), v(d), value=self.random.random() < 0.5
+            ),
+        ]
+
+
+def randomProgram(nodeCount, seed=0, maxDepth=6):
+    """
+    Build a random program of about `nodeCount` nodes into the current
+    graph: Debug nodes of random floats and bools until it is big enough,
+    then a SlimeController.
+    """
+    generator = ProgramGenerator(seed, maxDepth)
+    graph = currentGraph()
+    while len(graph.nodes) < nodeCount:
+        valueType = generator.random.choice([FLOAT, FLOAT, BOOL, VECTOR3])
+        Debug(generator.expression(valueType))
+    SlimeController(generator.expression(VECTOR3), generator.expression(BOOL))
+
+
+def portTypes(nodeName):
+    """The type of each port of a node type, by port index."""
+    spec = nodeSpecs[nodeName]
+    types = dict(zip(spec.inputPorts, spec.inputTypes))
+    types.update(zip(spec.outputPorts, spec.outputTypes))
+    return types
+
+
+def validateGraph(graph):
+    """
+    Problems that would break a graph in the game: connections between
+    ports of different types and input ports with no or several
+    connections. Returns a list of messages, empty for a valid graph.
+    """
+    problems = []
+    connected = {}
+    for connection in graph.connections:
+        source, target = connection.source, connection.target
+        sourceType = portTypes(source.nodeName)[connection.sourcePort]
+        targetType = portTypes(target.nodeName)[connection.targetPort]
+        if targetType not in (sourceType, "Any"):
+            problems.append(
+                f"{source.nodeName} {sourceType} output connected to "
+                f"{target.nodeName} {targetType} input"
+            )
+        key = target, connection.targetPort
+        connected[key] = connected.get(key, 0) + 1
+
+    for record in graph.nodes:
+        if not record.includePorts:
+            continue
+        for port, inputId in zip(
+            nodeSpecs[record.nodeName].inputPorts,
+            nodeSpecs[record.nodeName].inputIds,
+        ):
+            count = connected.get((record, port), 0)
+            if count != 1:
+                problems.append(
+                    f"{record.nodeName} input {inputId} has {count} connections"
+                )
+    return problems
+
+
+def sinks(graph):
+    """The number of nodes of each sink type (SlimeController, Debug, ...)."""
+    counts = {}
+    for record in graph.nodes:
+        if outputs[record.nodeName] is None:
+            counts[record.nodeName] = counts.get(record.nodeName, 0) + 1
+    return counts
+
+
+def randomState(rng):
+    """A GameState with random positions, velocities, flags and scores."""
+
+    def vector():
+        return tuple(round(rng.uniform(-10, 10), 3) for _ in range(3))
+
+    return GameState(
+        selfPosition=vector(),
+        selfVelocity=vector(),
+        opponentPosition=vector(),
+        opponentVelocity=vector(),
+        ballPosition=vector(),
+        ballVelocity=vector(),
+        selfCanJump=rng.random() < 0.5,
+        opponentCanJump=rng.random() < 0.5,
+        ballIsSelfSide=rng.random() < 0.5,
+        teamScore=rng.randint(0, 10),
+        opponentScore=rng.randint(0, 10),
+        ballTouchesRemaining=rng.randint(0, 3),
+        simulationDuration=rng.uniform(0, 300),
+    )
+
+
+def sameValue(a, b):
+    """
+    Equal outputs, up to the rounding differences of reordered constant
+    chains; NaN equals NaN.
+    """
+    if isinstance(a, tuple) and isinstance(b, tuple):
+        return len(a) == len(b) and all(map(sameValue, a, b))
+    if isinstance(a, float) and isinstance(b, float):
+        if math.isnan(a) or math.isnan(b):
+            return math.isnan(a) and math.isnan(b)
+        return math.isclose(a, b, rel_tol=1e-6, abs_tol=1e-9)
+    return a == b
+
+
+def optimizeLoaded(seed, nodeCount):
+    """
+    Save a random program laid out and optimize a copy loaded from the file,
+    whose nodes all have positions. The program saved without a layout is
+    optimized too, for reference. Returns the loaded graph and any
+    difference between the two optimizations, as messages.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        filePath = os.path.join(directory, "bot.txt")
+        with Graph() as saved:
+            randomProgram(nodeCount, seed)
+            SaveData(filePath)
+        with Graph() as saved:
+            randomProgram(nodeCount, seed)
+            SaveData(os.path.join(directory, "unplaced.txt"), layout=None)
+            expected = optimizeGraph(saved)
+        with Graph() as graph:
+            LoadData(filePath)
+            report = optimizeGraph(graph)
+    if report.nodesAfter != expected.nodesAfter:
+        return graph, [f"loaded graph optimized to {report}, expected {expected}"]
+    return graph, []
+
+
+def checkOptimization(seed, nodeCount, states=3, loaded=False):
+    """
+    Build a random program twice and optimize one copy, or with `loaded` a
+    copy saved and loaded back. Returns the problems found in the optimized
+    graph, changes to its sinks and outputs that differ from the original
+    program's, as messages.
+    """
+    with Graph() as original:
+        randomProgram(nodeCount, seed)
+    problems = validateGraph(original)
+    if problems:
+        return [f"before optimizing: {problem}" for problem in problems]
+
+    if loaded:
+        graph, problems = optimizeLoaded(seed, nodeCount)
+    else:
+        with Graph() as graph:
+            randomProgram(nodeCount, seed)
+            optimizeGraph(graph)
+        problems = []
+    problems += validateGraph(graph)
+    if sinks(graph) != sinks(original):
+        problems.append(f"sinks changed from {sinks(original)} to {sinks(graph)}")
+        return problems
+
+    rng = random.Random(seed)
+    for _ in range(states):
+        state = randomState(rng)
+        expected = evaluateGraph(original, state)
+        actual = evaluateGraph(graph, state)
+        if not sameValue(expected.controller, actual.controller):
+            problems.append(
+                f"controller {actual.controller}, expected {expected.controller}"
+            )
+        for i, (a, b) in enumerate(zip(expected.debug, actual.debug)):
+            if not sameValue(a, b):
+                problems.append(f"Debug {i} is {b!r}, expected {a!r}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seeds", type=int, default=100)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--nodes", type=int, default=300)
+    parser.add_argument(
+        "--loaded", action="store_true", help="optimize programs saved and loaded back"
+    )
+    args = parser.parse_args()
+
+    failures = 0
+    for seed in range(args.first_seed, args.first_seed + args.seeds):
+        problems = checkOptimization(seed, args.nodes, loaded=args.loaded)
+        if problems:
+            failures += 1
+            print(f"seed {seed}:")
+            for problem in problems[:10]:
+                print(f"  {problem}")
+    print(f"{failures} of {args.seeds} programs failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
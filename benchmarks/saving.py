@@ -0,0 +1,125 @@
+"""
+Save benchmark: the streaming writer with each installed backend against
+building the whole document and calling json.dump, as SaveData did before.
+Checks that every backend writes the same bytes, also for floats orjson
+formats differently, and reports the best time and the peak traced memory
+of each.
+
+    python -m benchmarks.saving --nodes 100000
+"""
+
+import argparse
+import io
+import json
+import tracemalloc
+
+from AIGameLibrary import AddNode, Graph, Position3, serialization
+from AIGameLibrary.ids import assignIds
+
+from .serialization import buildChain, timeIt
+
+# floats orjson formats differently from json, which must be re-encoded
+EDGE_VALUES = [
+    1e-5,
+    1e-7,
+    0.0001,
+    1e15,
+    9999999999999998.0,
+    1e16,
+    1.0000000000000002e16,
+    -2.5e16,
+    1.2345678901234568e17,
+    1e300,
+]
+
+
+def buildEdgeValues():
+    """
+    Nodes placed at EDGE_VALUES, one per encoded chunk, so none of them is
+    only re-encoded because of another one.
+    """
+    graph = Graph()
+    with graph:
+        for value in EDGE_VALUES:
+            AddNode("Float", "0", position=Position3(value, -value, 0))
+            for _ in range(serialization.CHUNK_SIZE - 1):
+                AddNode("Float", "0")
+    assignIds(graph)
+    return graph
+
+
+def dumpDocument(graph, file):
+    document = {
+        "serializableNodes": [
+            serialization.serializeNode(record) for record in graph.nodes
+        ],
+        "serializableConnections": [
+            serialization.serializeConnection(connection)
+            for connection in graph.connections
+        ],
+    }
+    json.dump(document, file, separators=(",", ":"))
+
+
+class NullFile:
+    """Counts what is written instead of keeping it, like a file on disk."""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text):
+        self.size += len(text)
+
+
+def peakMemory(function, *args):
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    graph = buildChain(args.nodes)
+    print(f"{len(graph.nodes)} nodes, {len(graph.connections)} connections")
+
+    writers = {"json.dump": dumpDocument}
+    for name in serialization.backends:
+        try:
+            backend = serialization.getBackend(name)
+        except ImportError:
+            print(f"{name}: not installed")
+            continue
+        writers[f"stream {name}"] = lambda graph, file, backend=backend: (
+            serialization.writeDocument(file, graph, backend)
+        )
+
+    for checked in (graph, buildEdgeValues()):
+        reference = None
+        for label, write in writers.items():
+            file = io.StringIO()
+            write(checked, file)
+            if reference is None:
+                reference = file.getvalue()
+            elif file.getvalue() != reference:
+                raise AssertionError(f"{label} output differs from json.dump")
+
+    baseline = None
+    for label, write in writers.items():
+        seconds = timeIt(write, graph, NullFile(), repeat=args.repeat)
+        peak = peakMemory(write, graph, NullFile())
+        baseline = baseline or seconds
+        print(
+            f"{label:16} {seconds:7.3f}s {baseline / seconds:5.1f}x "
+            f"peak {peak / 2**20:8.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
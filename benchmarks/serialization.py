@@ -0,0 +1,66 @@
+"""
+Serialization benchmark: templated node and connection dicts against
+rebuilding every static dict per instance, as SaveData did before templates.
+
+    python -m benchmarks.serialization --nodes 100000
+"""
+
+import argparse
+import time
+
+from AIGameLibrary import Ball, Float, Graph, SlimeController, Vector3
+from AIGameLibrary import serialization
+from AIGameLibrary.ids import assignIds
+
+
+def buildChain(nodeCount):
+    graph = Graph()
+    with graph:
+        acc = Ball.Position.x
+        i = 0
+        while len(graph.nodes) < nodeCount:
+            acc = acc * 1.0001 + Float(i)
+            i += 1
+        SlimeController(Vector3(acc, 0, 0), acc > 0)
+    assignIds(graph)
+    return graph
+
+
+def serializeGraph(graph, templated=True):
+    for record in graph.nodes:
+        if not templated:
+            serialization.nodeTemplates.clear()
+        serialization.serializeNode(record)
+    for connection in graph.connections:
+        if not templated:
+            serialization.connectionTemplates.clear()
+        serialization.serializeConnection(connection)
+
+
+def timeIt(function, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    graph = buildChain(args.nodes)
+    print(f"{len(graph.nodes)} nodes, {len(graph.connections)} connections")
+
+    rebuilt = timeIt(serializeGraph, graph, False, repeat=args.repeat)
+    templated = timeIt(serializeGraph, graph, True, repeat=args.repeat)
+    print(f"rebuilt per instance: {rebuilt:.3f}s")
+    print(f"templated:            {templated:.3f}s")
+    print(f"speedup:              {rebuilt / templated:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Benchmark suite: builds and saves every synthetic bot of benchmarks.generators
+at each size, and records the best time of each phase (building, then the
+SaveData phases from SaveStats) and the peak traced memory of building and
+saving to JSON. With --compare, results are checked against a stored
+baseline and the command fails when a phase got slower or bigger.
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --compare baseline.json
+    python -m benchmarks.suite --compare baseline.json results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from AIGameLibrary import Graph, SaveData, SaveStats
+from AIGameLibrary.profiling import startPeak, tracedPeak
+
+from .generators import generators
+
+SIZES = (1_000, 10_000, 100_000)
+
+# changes smaller than this are noise, whatever their ratio
+MIN_SECONDS = 0.005
+MIN_BYTES = 64 * 1024
+
+
+def runOnce(generator, nodeCount, filePath):
+    """Build and save one bot. Returns the graph, its build time and SaveStats."""
+    stats = SaveStats()
+    with Graph() as graph:
+        start = time.perf_counter()
+        generator(nodeCount)
+        built = time.perf_counter() - start
+        SaveData(filePath, stats=stats)
+    return graph, built, stats
+
+
+def peakMemory(generator, nodeCount, filePath):
+    """Peak traced memory of building and of saving one bot."""
+    tracemalloc.start()
+    try:
+        with Graph():
+            generator(nodeCount)
+            build = tracemalloc.get_traced_memory()[1]
+            # SaveData resets the peak for each phase, tracedPeak keeps it
+            startPeak()
+            start = tracemalloc.get_traced_memory()[0]
+            SaveData(filePath)
+            save = tracedPeak() - start
+    finally:
+        tracemalloc.stop()
+    return {"build": build, "save": save}
+
+
+def runCase(generator, nodeCount, repeat, memory=True):
+    with tempfile.TemporaryDirectory() as directory:
+        filePath = os.path.join(directory, "bot.txt")
+        phases = {}
+        for _ in range(repeat):
+            graph, built, stats = runOnce(generator, nodeCount, filePath)
+            times = dict(build=built, **stats.phases)
+            times["total"] = sum(times.values())
+            for name, seconds in times.items():
+                phases[name] = min(phases.get(name, seconds), seconds)
+
+        result = {
+            "nodes": len(graph.nodes),
+            "connections": len(graph.connections),
+            "fileSize": os.path.getsize(filePath),
+            "phases": phases,
+        }
+        if memory:
+            result["peakMemory"] = peakMemory(generator, nodeCount, filePath)
+    return result
+
+
+def runSuite(names, sizes, repeat, memory=True, log=print):
+    results = {}
+    for name in names:
+        for nodeCount in sizes:
+            case = f"{name}/{nodeCount}"
+            result = results[case] = runCase(
+                generators[name], nodeCount, repeat, memory
+            )
+            phases = ", ".join(
+                f"{phase} {seconds:.3f}s" for phase, seconds in result["phases"].items()
+            )
+            log(f"{case}: {result['nodes']} nodes, {phases}")
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold):
+    """
+    (case, metric, baseline value, current value, is regression) for every
+    metric both runs measured. A metric regresses when it grew by more than
+    `threshold` and by more than the noise floor.
+    """
+    rows = []
+    for case, result in current["results"].items():
+        base = baseline["results"].get(case)
+        if base is None:
+            continue
+        metrics = [
+            (f"time.{phase}", base["phases"].get(phase), seconds, MIN_SECONDS)
+            for phase, seconds in result["phases"].items()
+        ]
+        metrics += [
+            (f"memory.{phase}", base.get("peakMemory", {}).get(phase), size, MIN_BYTES)
+            for phase, size in result.get("peakMemory", {}).items()
+        ]
+        for metric, old, new, floor in metrics:
+            if old is None:
+                continue
+            regressed = new > old * (1 + threshold) and new - old > floor
+            rows.append((case, metric, old, new, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--generators", nargs="+", choices=list(generators), default=list(generators)
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    parser.add_argument("--output", metavar="FILE", help="write the results as JSON")
+    parser.add_argument(
+        "--compare",
+        nargs="+",
+        metavar="FILE",
+        help="a baseline, and optionally results to check instead of running",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative growth counted as a regression (default: 0.1)",
+    )
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes a baseline and at most one results file")
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+    else:
+        current = runSuite(
+            args.generators, args.sizes, args.repeat, memory=not args.no_memory
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare[0]) as f:
+        baseline = json.load(f)
+    rows = compare(baseline, current, args.threshold)
+    regressions = [row for row in rows if row[4]]
+    for case, metric, old, new, regressed in rows:
+        if regressed:
+            ratio = f" ({new / old:.2f}x)" if old else ""
+            print(f"REGRESSION {case} {metric}: {old:.6g} -> {new:.6g}{ratio}")
+    print(f"{len(regressions)} regressions in {len(rows)} metrics")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())